@@ -0,0 +1,77 @@
+"""
+분류 캐시 적중률 벤치마크
+
+사용법 (apps/api에서):
+    python -m benchmarks.classification_cache --rows 200000
+"""
+
+import argparse
+import json
+import time
+
+from benchmarks.workload import generate_transactions
+from services.category_rules import (
+    classify_transaction,
+    get_classification_cache_stats,
+    resize_classification_cache,
+)
+
+DEFAULT_CACHE_SIZES = [0, 256, 1024, 4096, 16384]
+
+
+def run(rows: int, cache_sizes: list[int], seed: int = 0) -> list[dict]:
+    """
+    캐시 크기별로 같은 거래 스트림을 classify_transaction으로 분류
+
+    Returns:
+        캐시 크기별 결과 목록
+    """
+    merchants, memos = generate_transactions(rows, seed=seed)
+    results = []
+
+    for maxsize in cache_sizes:
+        resize_classification_cache(maxsize)
+
+        started = time.perf_counter()
+        for merchant, memo in zip(merchants, memos):
+            classify_transaction(merchant, memo)
+        elapsed = time.perf_counter() - started
+
+        stats = get_classification_cache_stats()
+        results.append(
+            {
+                "cache_size": maxsize,
+                "rows": rows,
+                "hit_rate": round(stats["hit_rate"], 4),
+                "evictions": stats["evictions"],
+                "rows_per_sec": round(rows / elapsed),
+            }
+        )
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_CACHE_SIZES)
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.sizes, seed=args.seed)
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+
+    print(f"{'cache_size':>10} {'hit_rate':>9} {'evictions':>10} {'rows/sec':>10}")
+    for result in results:
+        print(
+            f"{result['cache_size']:>10} {result['hit_rate']:>9.2%} "
+            f"{result['evictions']:>10} {result['rows_per_sec']:>10,}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+분류기 처리량 벤치마크
+
+- classify_transaction: 단건 분류 (캐시를 비운 뒤 한 번, 같은 스트림으로 한 번 더)
+- classify_batch: 컬럼 단위 일괄 분류
+- classify_all_unclassified: 임시 SQLite 파일 DB에 미분류 거래를 넣고 전체 분류
+
+결과는 JSON으로 저장해 커밋 간에 비교한다.
+
+사용법 (apps/api에서):
+    python -m benchmarks.classifier --out bench/HEAD.json
+    python -m benchmarks.classifier --db-rows 10000 100000 1000000 --out bench/HEAD.json
+    python -m benchmarks.classifier --compare bench/base.json bench/HEAD.json
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel, create_engine
+
+from benchmarks.workload import generate_transactions
+from models.transaction import Transaction
+from models.user import User
+from services.category_rules import (
+    classify_batch,
+    classify_transaction,
+    clear_classification_cache,
+)
+from services.classifier import CLASSIFY_CHUNK_SIZE, classify_all_unclassified
+
+DEFAULT_DB_ROWS = [10_000, 100_000]
+INSERT_CHUNK_SIZE = 50_000
+
+
+def _result(name: str, rows: int, elapsed: float, **extra) -> dict:
+    return {
+        "name": name,
+        "rows": rows,
+        "seconds": round(elapsed, 4),
+        "rows_per_sec": round(rows / elapsed) if elapsed > 0 else None,
+        **extra,
+    }
+
+
+def bench_classify_transaction(merchants: list[str], memos: list[str]) -> list[dict]:
+    """단건 분류 (캐시 비운 상태 / 캐시가 찬 상태)"""
+    results = []
+    clear_classification_cache()
+    for name in ("classify_transaction.cold", "classify_transaction.warm"):
+        started = time.perf_counter()
+        for merchant, memo in zip(merchants, memos):
+            classify_transaction(merchant, memo)
+        results.append(_result(name, len(merchants), time.perf_counter() - started))
+    return results
+
+
+def bench_classify_batch(merchants: list[str], memos: list[str]) -> list[dict]:
+    """일괄 분류 (캐시 비운 상태 / 캐시가 찬 상태)"""
+    results = []
+    clear_classification_cache()
+    for name in ("classify_batch.cold", "classify_batch.warm"):
+        started = time.perf_counter()
+        classify_batch(merchants, memos)
+        results.append(_result(name, len(merchants), time.perf_counter() - started))
+    return results
+
+
+def seed_database(engine, rows: int, seed: int = 0) -> int:
+    """
+    미분류 거래 rows건 삽입
+
+    Returns:
+        사용자 ID
+    """
+    with Session(engine) as session:
+        user = User(username="bench", email="bench@example.com", hashed_password="x")
+        session.add(user)
+        session.commit()
+        user_id = user.id
+
+    merchants, memos = generate_transactions(rows, seed=seed)
+    with engine.begin() as connection:
+        for start in range(0, rows, INSERT_CHUNK_SIZE):
+            connection.execute(
+                insert(Transaction),
+                [
+                    {
+                        "user_id": user_id,
+                        "date": "2025-01-15",
+                        "time": "12:00",
+                        "merchant": merchant,
+                        "memo": memo,
+                        "amount_krw": 1000.0,
+                        "payment_type": "credit_card",
+                        "city": "서울",
+                        "channel": "offline",
+                        "needs_review": False,
+                    }
+                    for merchant, memo in zip(
+                        merchants[start:start + INSERT_CHUNK_SIZE],
+                        memos[start:start + INSERT_CHUNK_SIZE],
+                    )
+                ],
+            )
+    return user_id
+
+
+def bench_classify_all_unclassified(rows: int, chunk_size: int, seed: int = 0) -> dict:
+    """임시 SQLite 파일 DB에서 미분류 거래 전체 분류"""
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{Path(directory) / 'bench.db'}")
+        SQLModel.metadata.create_all(engine)
+
+        started = time.perf_counter()
+        user_id = seed_database(engine, rows, seed=seed)
+        seed_seconds = time.perf_counter() - started
+
+        clear_classification_cache()
+        with Session(engine) as session:
+            started = time.perf_counter()
+            result = classify_all_unclassified(session, user_id=user_id, chunk_size=chunk_size)
+            elapsed = time.perf_counter() - started
+        engine.dispose()
+
+    if result["total_classified"] != rows:
+        raise RuntimeError(f"분류 건수 불일치: {result['total_classified']} != {rows}")
+
+    return _result(
+        f"classify_all_unclassified.sqlite.{rows}",
+        rows,
+        elapsed,
+        chunk_size=chunk_size,
+        seed_seconds=round(seed_seconds, 2),
+    )
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(rows: int, db_rows: list[int], chunk_size: int = CLASSIFY_CHUNK_SIZE, seed: int = 0) -> dict:
+    """
+    전체 벤치마크 실행
+
+    Args:
+        rows: 메모리 내 분류 벤치마크 거래 수
+        db_rows: classify_all_unclassified를 측정할 DB 거래 수 목록
+        chunk_size: classify_all_unclassified 청크 크기
+        seed: 난수 시드
+
+    Returns:
+        JSON으로 저장할 결과 (환경 정보 + 항목별 결과)
+    """
+    merchants, memos = generate_transactions(rows, seed=seed)
+
+    results = bench_classify_transaction(merchants, memos)
+    results += bench_classify_batch(merchants, memos)
+    for count in db_rows:
+        results.append(bench_classify_all_unclassified(count, chunk_size, seed=seed))
+
+    return {
+        "commit": _git_commit(),
+        "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "results": results,
+    }
+
+
+def compare(base: dict, head: dict) -> list[dict]:
+    """
+    두 결과 파일의 항목별 처리량 비교
+
+    Returns:
+        [{"name", "base", "head", "ratio"}] (ratio < 1이면 느려짐)
+    """
+    base_by_name = {result["name"]: result for result in base["results"]}
+    rows = []
+    for result in head["results"]:
+        previous = base_by_name.get(result["name"])
+        if previous is None or not previous["rows_per_sec"] or not result["rows_per_sec"]:
+            continue
+        rows.append(
+            {
+                "name": result["name"],
+                "base": previous["rows_per_sec"],
+                "head": result["rows_per_sec"],
+                "ratio": round(result["rows_per_sec"] / previous["rows_per_sec"], 3),
+            }
+        )
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000, help="메모리 내 분류 거래 수")
+    parser.add_argument(
+        "--db-rows", type=int, nargs="*", default=DEFAULT_DB_ROWS, help="DB 분류 거래 수 목록"
+    )
+    parser.add_argument("--chunk-size", type=int, default=CLASSIFY_CHUNK_SIZE)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, help="결과 JSON 파일")
+    parser.add_argument(
+        "--compare", type=Path, nargs=2, metavar=("BASE", "HEAD"), help="두 결과 파일 비교"
+    )
+    args = parser.parse_args()
+
+    if args.compare:
+        base, head = (json.loads(path.read_text(encoding="utf-8")) for path in args.compare)
+        print(f"{'name':<45} {'base':>12} {'head':>12} {'ratio':>7}")
+        for row in compare(base, head):
+            print(f"{row['name']:<45} {row['base']:>12,} {row['head']:>12,} {row['ratio']:>7.3f}")
+        return
+
+    report = run(args.rows, args.db_rows, chunk_size=args.chunk_size, seed=args.seed)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(text + "\n", encoding="utf-8")
+        print(f"결과 저장: {args.out}", file=sys.stderr)
+
+    print(f"{'name':<45} {'rows':>9} {'seconds':>9} {'rows/sec':>12}")
+    for result in report["results"]:
+        print(
+            f"{result['name']:<45} {result['rows']:>9,} {result['seconds']:>9.3f} "
+            f"{result['rows_per_sec'] or 0:>12,}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+거래 업로드 저장 경로 벤치마크
+
+- orm: 행마다 TransactionCreate → Transaction → session.add 후 flush (이전 업로드 방식)
+- bulk: validate_transactions + insert_transactions (현재 업로드 방식)
+
+두 방식 모두 임시 SQLite 파일 DB에 저장하고 일별 롤업/분포 스케치 갱신과 커밋까지 잰다.
+
+사용법 (apps/api에서):
+    python -m benchmarks.ingest --rows 50000
+    python -m benchmarks.ingest --rows 50000 --invalid-rate 0.01 --json
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from pydantic import ValidationError
+from sqlmodel import Session, SQLModel, create_engine
+
+from benchmarks.workload import generate_transactions
+from models.daily_spend import DailySpend  # noqa: F401 (테이블 등록)
+from models.spend_sketch import SpendSketch  # noqa: F401 (테이블 등록)
+from models.transaction import Transaction, TransactionCreate
+from models.user import User
+from services.daily_rollup import RollupDelta, apply_rollup_delta
+from services.transaction_ingest import insert_transactions, validate_transactions
+
+
+def generate_rows(count: int, invalid_rate: float = 0.0, seed: int = 0) -> list[dict]:
+    """업로드 요청 형태의 거래 dict 생성 (invalid_rate 비율은 잘못된 날짜)"""
+    rng = np.random.default_rng(seed)
+    merchants, memos = generate_transactions(count, seed=seed)
+    months = rng.integers(1, 13, size=count).tolist()
+    days = rng.integers(1, 29, size=count).tolist()
+    minutes = rng.integers(0, 24 * 60, size=count).tolist()
+    amounts = (rng.lognormal(9.5, 1.0, size=count) + 100).tolist()
+    invalid = (rng.random(count) < invalid_rate).tolist()
+    return [
+        {
+            "date": f"2025-{13 if bad else month:02d}-{day:02d}",
+            "time": f"{minute // 60:02d}:{minute % 60:02d}",
+            "merchant": merchant,
+            "memo": memo,
+            "amount_krw": amount,
+            "payment_type": "credit_card",
+            "city": "서울",
+            "channel": "offline",
+        }
+        for merchant, memo, month, day, minute, amount, bad in zip(
+            merchants, memos, months, days, minutes, amounts, invalid
+        )
+    ]
+
+
+def _save_orm(session: Session, user_id: int, rows: list[dict]) -> list[Transaction]:
+    transactions = []
+    for row in rows:
+        try:
+            txn_create = TransactionCreate(**row)
+        except ValidationError:
+            continue
+        transaction = Transaction(**txn_create.model_dump(), user_id=user_id)
+        session.add(transaction)
+        transactions.append(transaction)
+    session.flush()
+    return transactions
+
+
+def _save_bulk(session: Session, user_id: int, rows: list[dict]):
+    validated, _ = validate_transactions(rows)
+    return insert_transactions(session, user_id, validated)
+
+
+def bench(name: str, rows: list[dict]) -> dict:
+    """임시 SQLite 파일 DB에 rows 저장 (롤업 갱신, 커밋 포함)"""
+    save = _save_orm if name == "orm" else _save_bulk
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{Path(directory) / 'bench.db'}")
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            user = User(username="bench", email="bench@example.com", hashed_password="x")
+            session.add(user)
+            session.commit()
+
+            started = time.perf_counter()
+            transactions = save(session, user.id, rows)
+            rollup = RollupDelta()
+            rollup.add_transactions(transactions)
+            apply_rollup_delta(session, rollup)
+            session.commit()
+            elapsed = time.perf_counter() - started
+        engine.dispose()
+
+    return {
+        "name": name,
+        "rows": len(rows),
+        "saved": len(transactions),
+        "seconds": round(elapsed, 3),
+        "rows_per_sec": round(len(rows) / elapsed),
+    }
+
+
+def run(rows: int, invalid_rate: float = 0.0, seed: int = 0) -> list[dict]:
+    """
+    두 저장 방식을 같은 데이터로 측정
+
+    Returns:
+        방식별 결과 목록 (bulk에는 orm 대비 speedup)
+    """
+    data = generate_rows(rows, invalid_rate=invalid_rate, seed=seed)
+    orm = bench("orm", data)
+    bulk = bench("bulk", data)
+    if orm["saved"] != bulk["saved"]:
+        raise RuntimeError(f"저장 건수 불일치: orm {orm['saved']} != bulk {bulk['saved']}")
+    bulk["speedup"] = round(orm["seconds"] / bulk["seconds"], 1)
+    return [orm, bulk]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--invalid-rate", type=float, default=0.0, help="잘못된 행 비율")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args()
+
+    results = run(args.rows, invalid_rate=args.invalid_rate, seed=args.seed)
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+
+    print(f"{'name':>6} {'rows':>9} {'saved':>9} {'seconds':>9} {'rows/sec':>10} {'speedup':>8}")
+    for result in results:
+        print(
+            f"{result['name']:>6} {result['rows']:>9,} {result['saved']:>9,} "
+            f"{result['seconds']:>9.3f} {result['rows_per_sec']:>10,} {result.get('speedup', ''):>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
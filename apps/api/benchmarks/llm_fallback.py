@@ -0,0 +1,74 @@
+"""
+LLM 백업 분류 처리량 벤치마크 (오프라인, 지연 시뮬레이션)
+
+사용법 (apps/api에서):
+    python -m benchmarks.llm_fallback --items 2000 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from services.llm_backend import LLMClassifier, StubLLMBackend
+
+
+def run(items: int, latency: float, batch_sizes: list[int], concurrencies: list[int]) -> list[dict]:
+    """
+    배치 크기 × 동시 호출 수 조합별 처리량 측정
+
+    Returns:
+        조합별 결과 목록
+    """
+    payload = [{"merchant": f"가맹점 {index}", "memo": ""} for index in range(items)]
+    results = []
+
+    for batch_size in batch_sizes:
+        for concurrency in concurrencies:
+            backend = StubLLMBackend(latency=latency)
+            classifier = LLMClassifier(
+                backend, batch_size=batch_size, max_concurrency=concurrency, timeout=60
+            )
+
+            started = time.perf_counter()
+            asyncio.run(classifier.classify_many(payload))
+            elapsed = time.perf_counter() - started
+
+            results.append(
+                {
+                    "batch_size": batch_size,
+                    "max_concurrency": concurrency,
+                    "calls": backend.calls,
+                    "seconds": round(elapsed, 3),
+                    "items_per_sec": round(items / elapsed, 1),
+                }
+            )
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=2_000)
+    parser.add_argument("--latency", type=float, default=0.2, help="호출당 지연 (초)")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args()
+
+    results = run(args.items, args.latency, args.batch_sizes, args.concurrency)
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+
+    print(f"{'batch':>6} {'conc':>5} {'calls':>6} {'seconds':>8} {'items/sec':>10}")
+    for result in results:
+        print(
+            f"{result['batch_size']:>6} {result['max_concurrency']:>5} {result['calls']:>6} "
+            f"{result['seconds']:>8.3f} {result['items_per_sec']:>10,.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+벤치마크용 합성 거래 데이터
+
+실제 카드 내역과 비슷하게 소수의 프랜차이즈 지점이 대부분의 거래를 차지하고
+나머지는 긴 꼬리(동네 가게)로 분포하도록 Zipf 분포로 가맹점을 뽑는다.
+"""
+
+import numpy as np
+
+from services.category_rules import KEYWORD_CATEGORY_MAP, MERCHANT_CATEGORY_MAP
+
+BRANCHES = [
+    "강남점", "역삼점", "신촌점", "홍대입구점", "건대점", "서울대입구역점",
+    "잠실점", "종로점", "부산서면점", "대구동성로점", "광주충장로점", "대전둔산점",
+]
+
+LOCAL_SHOP_KINDS = ["분식", "식당", "문구", "꽃집", "세탁소", "미용실", "PC방", "노래방"]
+
+MEMOS = list(KEYWORD_CATEGORY_MAP) + ["", "친구랑", "선물", "정기결제"]
+
+
+def build_merchant_pool(size: int, seed: int = 0) -> list[str]:
+    """
+    가맹점명 후보 생성 (앞쪽일수록 인기 가맹점)
+
+    Args:
+        size: 후보 수
+        seed: 난수 시드
+
+    Returns:
+        가맹점명 목록
+    """
+    rng = np.random.default_rng(seed)
+    brands = list(MERCHANT_CATEGORY_MAP)
+    pool: list[str] = list(brands)
+
+    # 프랜차이즈 지점
+    for branch in BRANCHES:
+        for brand in brands:
+            pool.append(f"{brand} {branch}")
+
+    # 긴 꼬리: 동네 가게
+    index = 0
+    while len(pool) < size:
+        kind = LOCAL_SHOP_KINDS[index % len(LOCAL_SHOP_KINDS)]
+        pool.append(f"{kind} {rng.integers(1, 10_000)}호")
+        index += 1
+
+    return pool[:size]
+
+
+def generate_transactions(
+    count: int,
+    seed: int = 0,
+    merchant_pool_size: int = 5_000,
+    zipf_exponent: float = 1.1,
+    memo_rate: float = 0.2,
+) -> tuple[list[str], list[str]]:
+    """
+    (가맹점명, 메모) 컬럼 생성
+
+    Args:
+        count: 거래 수
+        seed: 난수 시드
+        merchant_pool_size: 가맹점 후보 수
+        zipf_exponent: 가맹점 인기도 Zipf 지수 (클수록 상위 쏠림)
+        memo_rate: 메모가 있는 거래 비율
+
+    Returns:
+        (merchants, memos)
+    """
+    rng = np.random.default_rng(seed)
+    pool = np.array(build_merchant_pool(merchant_pool_size, seed), dtype=object)
+
+    ranks = np.arange(1, len(pool) + 1, dtype=np.float64)
+    weights = ranks ** -zipf_exponent
+    merchants = rng.choice(pool, size=count, p=weights / weights.sum())
+
+    memo_choices = np.array(MEMOS, dtype=object)
+    memos = np.where(
+        rng.random(count) < memo_rate,
+        rng.choice(memo_choices, size=count),
+        "",
+    )
+
+    return merchants.tolist(), memos.tolist()
@@ -6,7 +6,9 @@ import logging
 import os
 from pathlib import Path
 
-from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel import Session, create_engine
+
+from migrations import migrate
 
 logger = logging.getLogger(__name__)
 
@@ -27,9 +29,11 @@ engine = create_engine(DATABASE_URL, echo=False, connect_args=connect_args)
 
 
 def create_db_and_tables():
-    """데이터베이스 및 테이블 생성"""
+    """데이터베이스 및 테이블 생성 (기존 DB는 대기 중인 마이그레이션 적용)"""
     logger.info(f"데이터베이스 초기화 중: {DATABASE_URL}")
-    SQLModel.metadata.create_all(engine)
+    applied = migrate(engine)
+    if applied:
+        logger.info(f"마이그레이션 적용: {', '.join(applied)}")
     logger.info("✅ 데이터베이스 테이블 생성 완료")
 
 
@@ -27,9 +27,23 @@ async def lifespan(app: FastAPI):
     # 데이터베이스 초기화
     from models.user import User  # Import User model to register it
     from models.transaction import Transaction  # Import Transaction model
-    from db import create_db_and_tables
+    from models.llm_cache import LLMCacheEntry  # Import LLM cache model
+    from models.category_rule import CategoryRule, RuleSetVersion  # Import rule models
+    from models.daily_spend import DailySpend  # Import daily rollup model
+    from models.spend_sketch import SpendSketch  # Import distribution sketch model
+    from models.cohort_stat import CohortStat  # Import cohort statistics model
+    from db import create_db_and_tables, engine
     create_db_and_tables()
+    # 롤업 도입 전 DB면 일별 롤업 초기 생성
+    from services.daily_rollup import ensure_daily_spend
+    ensure_daily_spend(engine)
+    # 외부 규칙 소스 로드 및 변경 감시
+    from services.category_rules import configure_rule_source, get_rule_store
+    configure_rule_source()
     yield
+    get_rule_store().stop_watching()
+    from services.classify_jobs import get_job_manager
+    get_job_manager().shutdown(wait=False)
     logger.info("🛑 API 서버 종료")
 
 
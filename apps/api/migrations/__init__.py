@@ -0,0 +1,173 @@
+"""
+스키마 마이그레이션
+
+create_all은 없는 테이블만 만들고 기존 테이블은 바꾸지 못하므로, 기존 DB의 스키마 변경은
+번호 붙은 마이그레이션(migrations/versions/NNNN_이름.py)으로 적용한다.
+
+- 각 마이그레이션 모듈은 upgrade(engine)를 제공한다. 트랜잭션은 모듈이 직접 관리하므로
+  큰 테이블은 배치마다 커밋하는 온라인 백필로 나눌 수 있다.
+- 적용 기록: schema_migrations 테이블
+- 새 DB: create_all로 최신 스키마를 만들고 모든 마이그레이션을 적용된 것으로 기록
+
+CLI (apps/api에서, DATABASE_URL의 DB 사용):
+    python -m migrations status
+    python -m migrations upgrade
+"""
+
+import importlib
+import logging
+import pkgutil
+from dataclasses import dataclass
+from types import ModuleType
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    MetaData,
+    String,
+    Table,
+    func,
+    insert,
+    inspect,
+    select,
+    text,
+)
+from sqlalchemy.engine import Engine
+from sqlmodel import SQLModel
+
+from migrations import versions
+
+logger = logging.getLogger(__name__)
+
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", String, primary_key=True),
+    Column("applied_at", DateTime, nullable=False, server_default=func.now()),
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    """마이그레이션 하나 (version: 파일 이름 앞 번호)"""
+
+    version: str
+    name: str
+    module: ModuleType
+
+    def upgrade(self, engine: Engine) -> None:
+        self.module.upgrade(engine)
+
+
+def create_index(
+    engine: Engine,
+    name: str,
+    table: str,
+    columns: list[str],
+    include: list[str] | None = None,
+    unique: bool = False,
+) -> None:
+    """
+    인덱스 생성 (없을 때만, PostgreSQL은 쓰기를 막지 않도록 CONCURRENTLY)
+
+    Args:
+        include: PostgreSQL 커버링 인덱스의 INCLUDE 컬럼 (다른 DB에서는 무시)
+        unique: UNIQUE 인덱스 여부
+    """
+    column_list = ", ".join(columns)
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    if engine.dialect.name == "postgresql":
+        suffix = f" INCLUDE ({', '.join(include)})" if include else ""
+        # CONCURRENTLY는 트랜잭션 밖에서만 실행 가능
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.execute(
+                text(
+                    f"CREATE {kind} CONCURRENTLY IF NOT EXISTS {name} ON {table} ({column_list}){suffix}"
+                )
+            )
+        return
+    with engine.begin() as connection:
+        connection.execute(text(f"CREATE {kind} IF NOT EXISTS {name} ON {table} ({column_list})"))
+
+
+def drop_index(engine: Engine, name: str) -> None:
+    """인덱스 삭제 (있을 때만)"""
+    if engine.dialect.name == "postgresql":
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+        return
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+
+def discover_migrations() -> list[Migration]:
+    """migrations/versions의 마이그레이션 목록 (번호 순)"""
+    migrations = []
+    for info in pkgutil.iter_modules(versions.__path__):
+        version, _, name = info.name.partition("_")
+        if not version.isdigit():
+            continue
+        module = importlib.import_module(f"{versions.__name__}.{info.name}")
+        migrations.append(Migration(version=version, name=name, module=module))
+    return sorted(migrations, key=lambda migration: migration.version)
+
+
+def applied_versions(engine: Engine) -> set[str]:
+    """적용된 마이그레이션 번호"""
+    schema_migrations.create(engine, checkfirst=True)
+    with engine.connect() as connection:
+        return set(connection.execute(select(schema_migrations.c.version)).scalars())
+
+
+def pending_migrations(engine: Engine) -> list[Migration]:
+    """아직 적용하지 않은 마이그레이션 (번호 순)"""
+    applied = applied_versions(engine)
+    return [migration for migration in discover_migrations() if migration.version not in applied]
+
+
+def _record(engine: Engine, migrations: list[Migration]) -> None:
+    if not migrations:
+        return
+    with engine.begin() as connection:
+        connection.execute(
+            insert(schema_migrations), [{"version": migration.version} for migration in migrations]
+        )
+
+
+def upgrade(engine: Engine) -> list[str]:
+    """
+    대기 중인 마이그레이션을 순서대로 적용
+
+    Returns:
+        적용한 마이그레이션 번호 목록
+    """
+    applied = []
+    for migration in pending_migrations(engine):
+        logger.info(f"마이그레이션 적용 중: {migration.version} {migration.name}")
+        migration.upgrade(engine)
+        _record(engine, [migration])
+        applied.append(migration.version)
+    return applied
+
+
+def stamp(engine: Engine) -> None:
+    """모든 마이그레이션을 적용된 것으로 기록 (이미 최신 스키마인 새 DB용)"""
+    _record(engine, pending_migrations(engine))
+
+
+def migrate(engine: Engine) -> list[str]:
+    """
+    DB를 최신 스키마로 (서버 시작 시 호출)
+
+    - 새 DB: create_all 후 stamp
+    - 기존 DB: 없는 테이블만 create_all로 만들고 대기 중인 마이그레이션 적용
+
+    Returns:
+        적용한 마이그레이션 번호 목록
+    """
+    fresh = not inspect(engine).has_table("transactions")
+    SQLModel.metadata.create_all(engine)
+    if fresh:
+        stamp(engine)
+        return []
+    return upgrade(engine)
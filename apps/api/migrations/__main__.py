@@ -0,0 +1,48 @@
+"""
+마이그레이션 CLI
+
+    python -m migrations status
+    python -m migrations upgrade
+"""
+
+import argparse
+import logging
+
+from migrations import discover_migrations, migrate, pending_migrations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="DB 스키마 마이그레이션")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    subcommands.add_parser("status", help="마이그레이션 적용 상태")
+    subcommands.add_parser("upgrade", help="대기 중인 마이그레이션 적용")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    from db import engine
+    from models.category_rule import CategoryRule, RuleSetVersion  # noqa: F401 (테이블 등록)
+    from models.cohort_stat import CohortStat  # noqa: F401 (테이블 등록)
+    from models.daily_spend import DailySpend  # noqa: F401 (테이블 등록)
+    from models.llm_cache import LLMCacheEntry  # noqa: F401 (테이블 등록)
+    from models.spend_sketch import SpendSketch  # noqa: F401 (테이블 등록)
+    from models.transaction import Transaction  # noqa: F401 (테이블 등록)
+    from models.user import User  # noqa: F401 (테이블 등록)
+
+    if args.command == "status":
+        pending = {migration.version for migration in pending_migrations(engine)}
+        for migration in discover_migrations():
+            state = "대기" if migration.version in pending else "적용됨"
+            print(f"{migration.version} {migration.name}: {state}")
+        return
+
+    applied = migrate(engine)
+    if applied:
+        # 공유 캐시 백엔드를 쓰는 서버라면 이전 집계 결과가 무효화된다
+        from services.aggregate_cache import bump_user_data_version
+
+        bump_user_data_version()
+    print(f"마이그레이션 완료: {', '.join(applied) if applied else '적용할 마이그레이션 없음'}")
+
+
+if __name__ == "__main__":
+    main()
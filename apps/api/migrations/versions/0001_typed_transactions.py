@@ -0,0 +1,156 @@
+"""
+거래 테이블 타입/인덱스 변경
+
+- date: 문자열 → DATE, time: 문자열 → TIME, amount_krw: 실수 → 정수(BIGINT, 원)
+- 인덱스: (user_id, date), (user_id, category) 추가, user_id 단일 인덱스 제거 (복합 인덱스가 대신함)
+
+서버를 멈추지 않고 적용할 수 있도록 나눠서 진행한다.
+1. 새 타입 컬럼(date_new, time_new, amount_new) 추가
+2. BATCH_SIZE건씩 변환해 채우고 배치마다 커밋 (중단돼도 다시 실행하면 이어서 진행)
+3. 짧은 트랜잭션 하나에서 그 사이 추가된 행을 마저 채우고 기존 컬럼과 교체
+4. 인덱스 생성 (PostgreSQL은 CONCURRENTLY)
+
+SQLite는 ADD COLUMN에 NOT NULL을 붙일 수 없어 교체된 컬럼이 NULL 허용으로 남는다
+(새로 만든 DB는 create_all로 NOT NULL).
+"""
+
+import logging
+import os
+from datetime import date, time
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Date,
+    Float,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Time,
+    bindparam,
+    inspect,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.engine import Connection, Engine
+
+from migrations import create_index, drop_index
+
+logger = logging.getLogger(__name__)
+
+# 백필 배치 크기 (배치마다 커밋)
+BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", "5000"))
+
+transactions = Table(
+    "transactions",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("date", String),
+    Column("time", String),
+    Column("amount_krw", Float),
+    Column("date_new", Date),
+    Column("time_new", Time),
+    Column("amount_new", BigInteger),
+)
+
+NEW_COLUMNS = {"date_new": "DATE", "time_new": "TIME", "amount_new": "BIGINT"}
+SWAPS = {"date_new": "date", "time_new": "time", "amount_new": "amount_krw"}
+INDEXES = {
+    "ix_transactions_user_date": ["user_id", "date"],
+    "ix_transactions_user_category": ["user_id", "category"],
+}
+
+
+def upgrade(engine: Engine) -> None:
+    columns = {column["name"]: column for column in inspect(engine).get_columns("transactions")}
+    if "date_new" not in columns and not isinstance(columns["amount_krw"]["type"], Integer):
+        _add_columns(engine)
+        columns = dict.fromkeys(NEW_COLUMNS)
+
+    if "date_new" in columns:
+        rows = 0
+        while True:
+            with engine.begin() as connection:
+                converted = _backfill(connection, BATCH_SIZE)
+            rows += converted
+            if converted < BATCH_SIZE:
+                break
+            logger.info(f"거래 타입 변환 중: {rows}건")
+        _swap(engine)
+        logger.info(f"거래 타입 변환 완료: {rows}건")
+
+    _create_indexes(engine)
+
+
+def _add_columns(engine: Engine) -> None:
+    with engine.begin() as connection:
+        for name, type_name in NEW_COLUMNS.items():
+            connection.execute(text(f"ALTER TABLE transactions ADD COLUMN {name} {type_name}"))
+
+
+def _convert(row) -> dict:
+    try:
+        return {
+            "_id": row.id,
+            "_date": date.fromisoformat(row.date),
+            "_time": time.fromisoformat(row.time),
+            "_amount": round(row.amount_krw),
+        }
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"거래 {row.id}의 값을 변환할 수 없습니다: {e}") from e
+
+
+def _backfill(connection: Connection, limit: int | None) -> int:
+    """아직 변환하지 않은 행을 (최대 limit건) 채우기"""
+    statement = (
+        select(transactions.c.id, transactions.c.date, transactions.c.time, transactions.c.amount_krw)
+        .where(transactions.c.date_new.is_(None))
+        .order_by(transactions.c.id)
+    )
+    if limit is not None:
+        statement = statement.limit(limit)
+    rows = connection.execute(statement).all()
+    if rows:
+        connection.execute(
+            update(transactions)
+            .where(transactions.c.id == bindparam("_id"))
+            .values(
+                date_new=bindparam("_date"),
+                time_new=bindparam("_time"),
+                amount_new=bindparam("_amount"),
+            ),
+            [_convert(row) for row in rows],
+        )
+    return len(rows)
+
+
+def _swap(engine: Engine) -> None:
+    postgres = engine.dialect.name == "postgresql"
+    with engine.begin() as connection:
+        # 교체가 끝날 때까지 다른 쓰기를 막는다
+        # (SQLite는 쓰기 문장이 시작될 때 쓰기 잠금을 잡으므로 빈 UPDATE로 충분)
+        if postgres:
+            connection.execute(text("LOCK TABLE transactions IN ACCESS EXCLUSIVE MODE"))
+        else:
+            connection.execute(text("UPDATE transactions SET date_new = date_new WHERE 1 = 0"))
+
+        # 백필 중에 (이전 버전 서버가) 추가한 행
+        _backfill(connection, limit=None)
+
+        for new_name, old_name in SWAPS.items():
+            connection.execute(text(f"ALTER TABLE transactions DROP COLUMN {old_name}"))
+            connection.execute(text(f"ALTER TABLE transactions RENAME COLUMN {new_name} TO {old_name}"))
+            if postgres:
+                connection.execute(text(f"ALTER TABLE transactions ALTER COLUMN {old_name} SET NOT NULL"))
+
+        # 금액 반올림이 반영되도록 일별 롤업은 비워 두고 서버 시작 시 다시 계산(ensure_daily_spend)
+        if inspect(connection).has_table("daily_spend"):
+            connection.execute(text("DELETE FROM daily_spend"))
+
+
+def _create_indexes(engine: Engine) -> None:
+    for name, columns in INDEXES.items():
+        create_index(engine, name, "transactions", columns)
+    drop_index(engine, "ix_transactions_user_id")
@@ -0,0 +1,15 @@
+"""
+거래 목록 정렬 인덱스
+
+GET /api/transactions 커서 페이지네이션 순서 (user_id, date, time, id) 인덱스를 만들고,
+앞부분이 같은 (user_id, date) 인덱스는 이 인덱스가 대신하므로 제거한다.
+"""
+
+from sqlalchemy.engine import Engine
+
+from migrations import create_index, drop_index
+
+
+def upgrade(engine: Engine) -> None:
+    create_index(engine, "ix_transactions_user_order", "transactions", ["user_id", "date", "time", "id"])
+    drop_index(engine, "ix_transactions_user_date")
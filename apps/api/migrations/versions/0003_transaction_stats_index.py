@@ -0,0 +1,23 @@
+"""
+거래 통계 커버링 인덱스 (PostgreSQL 전용)
+
+GET /api/transactions/stats의 집계가 테이블을 읽지 않고 인덱스만으로(index-only scan) 끝나도록
+(user_id, date) INCLUDE (amount_krw, category, needs_review) 인덱스를 만든다.
+SQLite는 INCLUDE가 없고 기존 (user_id, date, time, id) 인덱스로 범위를 좁히므로 만들지 않는다.
+"""
+
+from sqlalchemy.engine import Engine
+
+from migrations import create_index
+
+
+def upgrade(engine: Engine) -> None:
+    if engine.dialect.name != "postgresql":
+        return
+    create_index(
+        engine,
+        "ix_transactions_user_stats",
+        "transactions",
+        ["user_id", "date"],
+        include=["amount_krw", "category", "needs_review"],
+    )
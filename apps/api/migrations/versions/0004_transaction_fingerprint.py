@@ -0,0 +1,136 @@
+"""
+거래 지문 (중복 업로드 방지)
+
+- fingerprint 컬럼 추가: transaction_fingerprint(사용자, 날짜, 시간, 가맹점, 금액)
+- BATCH_SIZE건씩 id 순서로 채우고 배치마다 커밋 (중단돼도 다시 실행하면 이어서 진행)
+- fingerprint UNIQUE 인덱스 생성 (PostgreSQL은 CONCURRENTLY)
+
+지문 함수와 날짜/시간 문자열 변환은 이 마이그레이션 안에 고정된 복사본을 쓴다
+(models.transaction.transaction_fingerprint와 같은 값, 모델이 바뀌어도 이 결과는 그대로).
+
+이미 중복으로 저장된 거래는 지우지 않는다. id가 가장 작은 거래만 지문을 갖고
+나머지는 NULL로 남긴다 (UNIQUE 인덱스는 NULL끼리 충돌하지 않음).
+"""
+
+import hashlib
+import logging
+import os
+from datetime import date, time
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Date,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Time,
+    bindparam,
+    func,
+    inspect,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.engine import Connection, Engine
+
+from migrations import create_index
+
+logger = logging.getLogger(__name__)
+
+# 백필 배치 크기 (배치마다 커밋)
+BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", "5000"))
+
+transactions = Table(
+    "transactions",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("user_id", Integer),
+    Column("date", Date),
+    Column("time", Time),
+    Column("merchant", String),
+    Column("amount_krw", BigInteger),
+    Column("fingerprint", String),
+)
+
+
+def _fingerprint(user_id: int, day: date, moment: time, merchant: str, amount_krw: int) -> str:
+    """이 마이그레이션 시점의 transaction_fingerprint (날짜 'YYYY-MM-DD', 시간 'HH:MM' 또는 'HH:MM:SS')"""
+    clock = moment.strftime("%H:%M:%S" if moment.second else "%H:%M")
+    content = "\x1f".join((str(user_id), day.isoformat(), clock, merchant, str(amount_krw)))
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def upgrade(engine: Engine) -> None:
+    columns = {column["name"] for column in inspect(engine).get_columns("transactions")}
+    if "fingerprint" not in columns:
+        with engine.begin() as connection:
+            connection.execute(text("ALTER TABLE transactions ADD COLUMN fingerprint VARCHAR"))
+
+    # 지문이 있는 마지막 행 다음부터 (그 앞의 NULL은 이미 처리한 중복)
+    with engine.connect() as connection:
+        after = connection.execute(
+            select(func.max(transactions.c.id)).where(transactions.c.fingerprint.is_not(None))
+        ).scalar() or 0
+
+    rows = duplicates = 0
+    while True:
+        with engine.begin() as connection:
+            after, converted, skipped = _backfill(connection, after, BATCH_SIZE)
+        rows += converted
+        duplicates += skipped
+        if converted < BATCH_SIZE:
+            break
+        logger.info(f"거래 지문 계산 중: {rows}건")
+    logger.info(f"거래 지문 계산 완료: {rows}건 (기존 중복 {duplicates}건은 지문 없이 유지)")
+
+    create_index(engine, "ix_transactions_fingerprint", "transactions", ["fingerprint"], unique=True)
+
+
+def _backfill(connection: Connection, after: int, limit: int) -> tuple[int, int, int]:
+    """
+    id가 after보다 큰 행을 (최대 limit건) 채우기
+
+    Returns:
+        (마지막으로 처리한 id, 처리한 행 수, 중복이라 건너뛴 행 수)
+    """
+    rows = connection.execute(
+        select(
+            transactions.c.id,
+            transactions.c.user_id,
+            transactions.c.date,
+            transactions.c.time,
+            transactions.c.merchant,
+            transactions.c.amount_krw,
+        )
+        .where(transactions.c.id > after)
+        .order_by(transactions.c.id)
+        .limit(limit)
+    ).all()
+    if not rows:
+        return after, 0, 0
+
+    # 배치 안에서는 처음 나온 행만, 이전 배치에서 이미 쓰인 지문은 건너뜀
+    first: dict[str, int] = {}
+    for row in rows:
+        fingerprint = _fingerprint(row.user_id, row.date, row.time, row.merchant, row.amount_krw)
+        first.setdefault(fingerprint, row.id)
+    taken = set(
+        connection.execute(
+            select(transactions.c.fingerprint).where(transactions.c.fingerprint.in_(list(first)))
+        ).scalars()
+    )
+    updates = [
+        {"_id": txn_id, "_fingerprint": fingerprint}
+        for fingerprint, txn_id in first.items()
+        if fingerprint not in taken
+    ]
+    if updates:
+        connection.execute(
+            update(transactions)
+            .where(transactions.c.id == bindparam("_id"))
+            .values(fingerprint=bindparam("_fingerprint")),
+            updates,
+        )
+    return rows[-1].id, len(rows), len(rows) - len(updates)
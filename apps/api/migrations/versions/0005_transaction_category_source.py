@@ -0,0 +1,16 @@
+"""
+거래 카테고리 출처 (category_source)
+
+- category_source 컬럼 추가: rule | model | llm | manual (models.transaction.CategorySource)
+- 기존 거래는 누가 정했는지 알 수 없으므로 NULL로 둔다 (n-gram 모델 학습에서 제외됨)
+"""
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+
+def upgrade(engine: Engine) -> None:
+    columns = {column["name"] for column in inspect(engine).get_columns("transactions")}
+    if "category_source" not in columns:
+        with engine.begin() as connection:
+            connection.execute(text("ALTER TABLE transactions ADD COLUMN category_source VARCHAR"))
@@ -0,0 +1,5 @@
+"""
+마이그레이션 모듈 (NNNN_이름.py, upgrade(engine) 제공)
+
+모델 코드가 바뀌어도 결과가 같도록 모델을 import하지 않고 필요한 테이블/컬럼을 직접 정의한다.
+"""
@@ -0,0 +1,37 @@
+"""
+분류 규칙 모델 정의 (SQLModel)
+
+RULES_SOURCE=db일 때 규칙 테이블을 DB에서 읽는다.
+규칙을 바꾼 뒤 rule_set_version.version을 올리면 실행 중인 서버가 다시 읽는다.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Column, DateTime, func
+from sqlmodel import Field, SQLModel
+
+
+class CategoryRule(SQLModel, table=True):
+    """분류 규칙 테이블"""
+
+    __tablename__ = "category_rules"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    kind: str = Field(..., description="규칙 종류 (merchant | keyword)")
+    pattern: str = Field(..., description="가맹점명 또는 메모 키워드")
+    category: str = Field(..., description="분류 카테고리")
+    priority: int = Field(default=0, description="우선순위 (작을수록 먼저 매칭)")
+
+
+class RuleSetVersion(SQLModel, table=True):
+    """규칙 버전 테이블 (단일 행)"""
+
+    __tablename__ = "rule_set_version"
+
+    id: int = Field(default=1, primary_key=True)
+    version: int = Field(default=0, description="규칙 변경 시 증가")
+    updated_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
+    )
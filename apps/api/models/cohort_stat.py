@@ -0,0 +1,27 @@
+"""
+코호트 통계 모델 정의 (SQLModel)
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import LargeBinary
+from sqlmodel import Field, SQLModel
+
+
+class CohortStat(SQLModel, table=True):
+    """(기준, 값, 월, 카테고리)별 사용자 지출 분포 (services.cohort_stats 배치 작업이 생성)"""
+
+    __tablename__ = "cohort_stat"
+
+    dimension: str = Field(primary_key=True, description="코호트 기준 (all | city | channel | payment_type)")
+    value: str = Field(primary_key=True, description="기준 값 (all이면 빈 문자열)")
+    month: str = Field(primary_key=True, description="거래 월 (YYYY-MM)")
+    category: str = Field(primary_key=True, description="카테고리 (미분류는 빈 문자열, 전체는 '*')")
+    user_count: int = Field(..., description="지출이 있는 사용자 수")
+    p25: float = Field(..., description="사용자별 월 지출 25% 분위수 (원)")
+    p50: float = Field(..., description="사용자별 월 지출 중앙값 (원)")
+    p75: float = Field(..., description="사용자별 월 지출 75% 분위수 (원)")
+    p90: float = Field(..., description="사용자별 월 지출 90% 분위수 (원)")
+    sketch: bytes = Field(sa_type=LargeBinary, description="QuantileSketch.to_bytes() (순위 계산용)")
+    computed_at: Optional[datetime] = Field(default=None, description="계산 시각 (UTC)")
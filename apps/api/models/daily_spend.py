@@ -0,0 +1,22 @@
+"""
+일별 지출 롤업 모델 정의 (SQLModel)
+"""
+
+from sqlmodel import Field, SQLModel
+
+# 미분류 거래의 category 값 (기본 키라 NULL 대신 사용)
+UNCLASSIFIED = ""
+
+
+class DailySpend(SQLModel, table=True):
+    """(사용자, 날짜, 카테고리, 가맹점)별 금액 합계/건수 테이블"""
+
+    __tablename__ = "daily_spend"
+
+    user_id: int = Field(primary_key=True, description="사용자 ID")
+    date: str = Field(primary_key=True, description="거래 날짜 (YYYY-MM-DD)")
+    category: str = Field(primary_key=True, description="분류 카테고리 (미분류는 빈 문자열)")
+    merchant: str = Field(primary_key=True, description="가맹점명")
+    amount_sum: float = Field(default=0.0, description="금액 합계 (원)")
+    txn_count: int = Field(default=0, description="거래 건수")
+    first_id: int = Field(..., description="가장 먼저 저장된 거래 ID (집계 결과 정렬용)")
@@ -0,0 +1,24 @@
+"""
+LLM 분류 결과 캐시 모델 정의 (SQLModel)
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Column, DateTime, func
+from sqlmodel import Field, SQLModel
+
+
+class LLMCacheEntry(SQLModel, table=True):
+    """LLM 분류 결과 캐시 테이블 (정규화된 가맹점명 기준)"""
+
+    __tablename__ = "llm_cache"
+
+    merchant: str = Field(primary_key=True, description="정규화된 가맹점명")
+    category: str = Field(..., description="분류 카테고리")
+    confidence: float = Field(..., description="분류 신뢰도 (0-1)")
+    rationale: str = Field(default="", description="분류 근거")
+    created_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime, nullable=False, server_default=func.now())
+    )
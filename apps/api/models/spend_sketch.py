@@ -0,0 +1,19 @@
+"""
+지출 분포 스케치 모델 정의 (SQLModel)
+"""
+
+from sqlalchemy import LargeBinary
+from sqlmodel import Field, SQLModel
+
+
+class SpendSketch(SQLModel, table=True):
+    """(사용자, 월, 카테고리|가맹점)별 금액 분포 스케치 테이블"""
+
+    __tablename__ = "spend_sketch"
+
+    user_id: int = Field(primary_key=True, description="사용자 ID")
+    month: str = Field(primary_key=True, description="거래 월 (YYYY-MM)")
+    kind: str = Field(primary_key=True, description="묶음 기준 (category | merchant)")
+    key: str = Field(primary_key=True, description="카테고리(미분류는 빈 문자열) 또는 가맹점명")
+    txn_count: int = Field(default=0, description="거래 건수")
+    sketch: bytes = Field(sa_type=LargeBinary, description="QuantileSketch.to_bytes()")
@@ -2,12 +2,18 @@
 Transaction 모델 정의 (SQLModel)
 """
 
+import hashlib
+import math
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Annotated, NotRequired, Optional
 
+from pydantic import BeforeValidator
 from sqlmodel import Field, SQLModel
-from sqlalchemy import Column, DateTime, func
+from sqlalchemy import BigInteger, Column, DateTime, Index, func
+from typing_extensions import TypedDict  # pydantic은 3.12 미만에서 typing_extensions 버전 필요
+
+from models.types import IsoDate, IsoDateStr, IsoTime, IsoTimeStr
 
 
 class PaymentType(str, Enum):
@@ -29,24 +35,59 @@ class Channel(str, Enum):
     KIOSK = "kiosk"
 
 
+class CategorySource(str, Enum):
+    """카테고리를 정한 주체 (n-gram 모델 학습 데이터 선별용)"""
+
+    RULE = "rule"
+    MODEL = "model"
+    LLM = "llm"
+    MANUAL = "manual"
+
+    @classmethod
+    def from_method(cls, method: str) -> "CategorySource":
+        """분류 결과의 method (merchant | keyword | default | model | llm) → 주체"""
+        return cls(method) if method in (cls.MODEL.value, cls.LLM.value) else cls.RULE
+
+
 class Transaction(SQLModel, table=True):
     """거래 테이블"""
 
     __tablename__ = "transactions"
+    # 기존 DB는 migrations/versions/로 같은 스키마가 된다
+    __table_args__ = (
+        # 목록 정렬 순서이자 기간 조회용 (user_id, date) 접두사
+        Index("ix_transactions_user_order", "user_id", "date", "time", "id"),
+        Index("ix_transactions_user_category", "user_id", "category"),
+        # 통계 조회용 커버링 인덱스 (INCLUDE는 PostgreSQL만 지원)
+        Index(
+            "ix_transactions_user_stats",
+            "user_id",
+            "date",
+            postgresql_include=["amount_krw", "category", "needs_review"],
+        ).ddl_if(dialect="postgresql"),
+        # 같은 거래 재업로드 방지 (NULL은 중복으로 보지 않음)
+        Index("ix_transactions_fingerprint", "fingerprint", unique=True),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    user_id: int = Field(foreign_key="users.id", index=True, description="사용자 ID")
-    date: str = Field(..., description="거래 날짜 (YYYY-MM-DD)")
-    time: str = Field(..., description="거래 시간 (HH:MM)")
+    user_id: int = Field(foreign_key="users.id", description="사용자 ID")
+    date: str = Field(..., sa_type=IsoDate, description="거래 날짜 (YYYY-MM-DD, DB에는 DATE)")
+    time: str = Field(..., sa_type=IsoTime, description="거래 시간 (HH:MM, DB에는 TIME)")
     merchant: str = Field(..., description="가맹점명")
     memo: str = Field(default="", description="메모")
-    amount_krw: float = Field(..., gt=0, description="금액 (원)")
+    amount_krw: int = Field(..., gt=0, sa_type=BigInteger, description="금액 (원, 정수)")
     payment_type: str = Field(..., description="결제 수단")
     city: str = Field(..., description="도시명")
     channel: str = Field(..., description="거래 채널")
     category: Optional[str] = Field(default=None, description="분류 카테고리")
     confidence: Optional[float] = Field(default=None, description="분류 신뢰도 (0-1)")
     needs_review: bool = Field(default=False, description="수동 검토 필요 여부")
+    category_source: Optional[str] = Field(
+        default=None, description="카테고리를 정한 주체 (CategorySource, 출처를 모르는 기존 거래는 NULL)"
+    )
+    fingerprint: Optional[str] = Field(
+        default=None, description="중복 판별용 지문 (transaction_fingerprint)"
+    )
     created_at: Optional[datetime] = Field(
         default=None,
         sa_column=Column(DateTime, nullable=False, server_default=func.now())
@@ -57,14 +98,66 @@ class Transaction(SQLModel, table=True):
     )
 
 
+def transaction_fingerprint(user_id: int, date: str, time: str, merchant: str, amount_krw: int) -> str:
+    """
+    거래 지문 (사용자, 날짜, 시간, 가맹점, 금액이 같으면 같은 거래로 본다)
+
+    Args:
+        date: 정규화된 날짜 (parse_iso_date)
+        time: 정규화된 시간 (parse_iso_time)
+
+    Returns:
+        32자리 16진수 문자열
+    """
+    content = "\x1f".join((str(user_id), date, time, merchant, str(amount_krw)))
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _round_amount(value):
+    # 원 단위 정수로 저장 (외화 환산 등으로 소수가 오면 반올림)
+    # CSV에서 만든 JSON처럼 "1500.5" 같은 숫자 문자열도 예전(float 필드)처럼 받는다
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+        try:
+            number = float(value)
+        except ValueError:
+            return value  # 숫자가 아니면 int 검증이 거부
+        return round(number) if math.isfinite(number) else value
+    return round(value) if isinstance(value, float) else value
+
+
+AmountKrw = Annotated[int, BeforeValidator(_round_amount)]
+
+
 class TransactionCreate(SQLModel):
     """Transaction 생성용 스키마"""
 
-    date: str
-    time: str
+    date: IsoDateStr
+    time: IsoTimeStr
     merchant: str
     memo: str = ""
-    amount_krw: float
+    amount_krw: AmountKrw
+    payment_type: str
+    city: str
+    channel: str
+
+
+class TransactionRow(TypedDict):
+    """
+    TransactionCreate와 같은 필드/검증 규칙의 dict 버전 (대량 업로드 검증용)
+
+    모델 객체를 만들지 않아 TypeAdapter(list[TransactionRow])로 한 번에 검증하면
+    TransactionCreate를 행마다 만드는 것보다 몇 배 빠르다. 필드를 바꾸면 둘 다 바꿀 것.
+    """
+
+    date: IsoDateStr
+    time: IsoTimeStr
+    merchant: str
+    memo: NotRequired[str]
+    amount_krw: AmountKrw
     payment_type: str
     city: str
     channel: str
@@ -79,7 +172,7 @@ class TransactionRead(SQLModel):
     time: str
     merchant: str
     memo: str
-    amount_krw: float
+    amount_krw: int
     payment_type: str
     city: str
     channel: str
@@ -90,6 +183,34 @@ class TransactionRead(SQLModel):
     updated_at: Optional[datetime] = None
 
 
+class TransactionPage(SQLModel):
+    """거래 목록 한 페이지"""
+
+    items: list[TransactionRead]
+    next_cursor: Optional[str] = Field(default=None, description="다음 페이지 커서 (마지막 페이지면 없음)")
+
+
+class MonthlyCount(SQLModel):
+    """월별 거래 건수/금액"""
+
+    month: str = Field(..., description="YYYY-MM")
+    count: int
+    amount: float
+
+
+class TransactionStats(SQLModel):
+    """거래 통계"""
+
+    total_count: int
+    total_amount: float
+    avg_amount: float
+    min_amount: Optional[float] = None
+    max_amount: Optional[float] = None
+    needs_review_count: int = 0
+    needs_review_ratio: float = Field(default=0.0, description="검토 필요 거래 비율 (0-1)")
+    by_month: list[MonthlyCount] = []
+
+
 class ClassificationResult(SQLModel):
     """분류 결과"""
 
@@ -98,10 +219,115 @@ class ClassificationResult(SQLModel):
     needs_review_count: int
 
 
+class MerchantTotal(SQLModel):
+    """가맹점별 금액"""
+
+    merchant: str
+    amount: float
+
+
+class DailyTotal(SQLModel):
+    """일별 금액"""
+
+    date: str
+    amount: float
+
+
+class SeriesBucket(SQLModel):
+    """추이 구간별 금액"""
+
+    bucket: str = Field(..., description="구간 이름 (2025-01-15 | 2025-W03 | 2025-01)")
+    start: str = Field(..., description="구간 시작일 (YYYY-MM-DD)")
+    amount: float
+    by_category: Optional[dict[str, float]] = None
+
+
 class AggregationResult(SQLModel):
     """집계 결과"""
 
     total_amount: float
     by_category: dict[str, float]
-    top_merchants: list[dict[str, float]]
-    daily_totals: list[dict[str, float]]
+    top_merchants: list[MerchantTotal]
+    daily_totals: list[DailyTotal]
+    active_days: int = 0
+    series: list[SeriesBucket] = []
+
+
+class WindowSummary(SQLModel):
+    """비교 기간 하나의 집계"""
+
+    start: str
+    end: str
+    total_amount: float
+    transaction_count: int
+    by_category: dict[str, float]
+
+
+class WindowDelta(SQLModel):
+    """기준 기간(첫 번째) - 비교 기간"""
+
+    start: str
+    end: str
+    total_amount: float
+    total_pct: Optional[float] = Field(default=None, description="비교 기간 대비 증감률 (%)")
+    by_category: dict[str, float]
+
+
+class ComparisonResult(SQLModel):
+    """여러 기간 비교 결과"""
+
+    windows: list[WindowSummary]
+    deltas: list[WindowDelta]
+
+
+class HistogramBin(SQLModel):
+    """히스토그램 구간 [lower, upper)"""
+
+    lower: int
+    upper: Optional[int] = Field(default=None, description="없으면 상한 없음")
+    count: int
+
+
+class DistributionSummary(SQLModel):
+    """금액 분포 요약"""
+
+    transaction_count: int
+    quantiles: dict[str, Optional[float]] = Field(..., description="분위수 금액 (p50, p90, ...)")
+    histogram: list[HistogramBin]
+
+
+class DistributionGroup(DistributionSummary):
+    """카테고리/가맹점 하나의 금액 분포"""
+
+    key: str
+
+
+class DistributionResult(SQLModel):
+    """금액 분포 조회 결과"""
+
+    by: str
+    overall: DistributionSummary
+    groups: list[DistributionGroup]
+
+
+class CohortCategory(SQLModel):
+    """카테고리 하나의 코호트 비교"""
+
+    category: str
+    amount: float = Field(..., description="내 월 지출 (원)")
+    user_count: int
+    p25: float
+    p50: float
+    p75: float
+    p90: float
+    percentile: Optional[float] = Field(default=None, description="코호트 내 위치 (0~100)")
+
+
+class CohortComparison(SQLModel):
+    """코호트 비교 결과"""
+
+    month: str
+    dimension: str
+    value: Optional[str] = None
+    computed_at: Optional[datetime] = Field(default=None, description="코호트 통계 계산 시각 (UTC)")
+    categories: list[CohortCategory]
@@ -0,0 +1,63 @@
+"""
+DB 컬럼 타입
+
+DB에는 네이티브 DATE/TIME으로 저장하고, 파이썬(ORM 속성, API)에서는
+기존처럼 'YYYY-MM-DD' / 'HH:MM' 문자열로 다룬다.
+"""
+
+from datetime import date, time
+from typing import Annotated
+
+from pydantic import AfterValidator
+from sqlalchemy import Date, Time
+from sqlalchemy.types import TypeDecorator
+
+
+class IsoDate(TypeDecorator):
+    """DATE ↔ 'YYYY-MM-DD'"""
+
+    impl = Date
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None or isinstance(value, date):
+            return value
+        return date.fromisoformat(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return value.isoformat()
+
+
+class IsoTime(TypeDecorator):
+    """TIME ↔ 'HH:MM' (초가 있으면 'HH:MM:SS')"""
+
+    impl = Time
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None or isinstance(value, time):
+            return value
+        return time.fromisoformat(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return value.strftime("%H:%M:%S" if value.second else "%H:%M")
+
+
+def parse_iso_date(value: str) -> str:
+    """날짜 문자열 검증 및 정규화 (잘못된 값이면 ValueError)"""
+    return date.fromisoformat(value).isoformat()
+
+
+def parse_iso_time(value: str) -> str:
+    """시간 문자열 검증 및 정규화 ('HH:MM' 또는 'HH:MM:SS', 잘못된 값이면 ValueError)"""
+    parsed = time.fromisoformat(value)
+    return parsed.strftime("%H:%M:%S" if parsed.second else "%H:%M")
+
+
+# 검증 후 정규화된 문자열 (TransactionCreate, TransactionRow 공용)
+IsoDateStr = Annotated[str, AfterValidator(parse_iso_date)]
+IsoTimeStr = Annotated[str, AfterValidator(parse_iso_time)]
@@ -3,19 +3,45 @@ Aggregation 라우터
 """
 
 import logging
+import re
+from datetime import date
 from typing import Annotated, Literal
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlmodel import Session
 
 from db import get_session
-from models.transaction import AggregationResult
+from models.transaction import (
+    AggregationResult,
+    CohortComparison,
+    ComparisonResult,
+    DistributionResult,
+)
+from models.types import parse_iso_date
 from models.user import User
 from routers.auth import get_current_user_dependency
-from services.aggregator import aggregate_transactions
+from services.aggregate_cache import get_aggregate_cache
+from services.aggregator import aggregate_transactions, compare_windows
+from services.cohort_stats import cohort_comparison
+from services.columnar_store import get_columnar_store
+from services.spend_sketch import DEFAULT_HISTOGRAM_EDGES, spend_distribution
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# 한 번에 비교할 수 있는 최대 기간 수
+MAX_COMPARE_WINDOWS = 12
+# 비교 기간 하나의 최대 일수 (약 10년)
+MAX_COMPARE_WINDOW_DAYS = 3660
+WINDOW_PATTERN = re.compile(r"^(\d{4}-\d{2}-\d{2})\.\.(\d{4}-\d{2}-\d{2})$")
+
+
+def _parse_date(value: str) -> str:
+    """형식은 맞지만 없는 날짜(2025-02-30 등)면 400 (롤업/컬럼 저장소 경로가 같은 입력을 같게 처리하도록)"""
+    try:
+        return parse_iso_date(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"존재하지 않는 날짜입니다: {value}") from None
+
 
 @router.get("/aggregate", response_model=AggregationResult)
 async def get_aggregation(
@@ -28,20 +54,36 @@ async def get_aggregation(
         ..., description="종료일 (YYYY-MM-DD)", regex=r"^\d{4}-\d{2}-\d{2}$"
     ),
     range: Literal["day", "week", "month"] = Query(
-        default="month", description="집계 범위"
+        default="month", description="추이 구간 (day | week: ISO 주 | month: 달력 월)"
     ),
+    by_category: bool = Query(default=False, description="구간별 카테고리 금액 포함 여부"),
+    daily: bool = Query(default=True, description="일별 총액(daily_totals) 포함 여부"),
 ):
     """
     거래 집계 조회
 
     - 날짜 범위 내 거래 통계 제공
     - 카테고리별 금액, 상위 가맹점, 일별 총액 반환
+    - series: range 구간(일/ISO 주/월)별 총액 (by_category=true면 구간별 카테고리 금액 포함)
+    - 긴 기간은 daily=false로 일별 총액을 빼고 series만 받으면 응답이 작아짐
     - 현재 로그인한 사용자의 거래만 집계
     """
+    start, end = _parse_date(start), _parse_date(end)
     logger.info(f"집계 조회: {start} ~ {end} (range={range}, user_id={current_user.id})")
 
-    result = aggregate_transactions(
-        session, user_id=current_user.id, start_date=start, end_date=end, range_type=range
+    # 같은 (기간, 구간, 옵션) 조회는 거래가 바뀌기 전까지 캐시된 결과 사용
+    result = get_aggregate_cache().get_or_compute(
+        current_user.id,
+        (start, end, range, by_category, daily),
+        lambda: aggregate_transactions(
+            session,
+            user_id=current_user.id,
+            start_date=start,
+            end_date=end,
+            range_type=range,
+            series_by_category=by_category,
+            include_daily_totals=daily,
+        ),
     )
 
     return AggregationResult(
@@ -49,4 +91,134 @@ async def get_aggregation(
         by_category=result["by_category"],
         top_merchants=result["top_merchants"],
         daily_totals=result["daily_totals"],
+        active_days=result["active_days"],
+        series=result["series"],
     )
+
+
+@router.get("/aggregate/compare", response_model=ComparisonResult)
+async def get_comparison(
+    session: Annotated[Session, Depends(get_session)],
+    current_user: Annotated[User, Depends(get_current_user_dependency)],
+    window: list[str] = Query(
+        ..., description="비교 기간 START..END (YYYY-MM-DD..YYYY-MM-DD, 반복 지정, 첫 번째가 기준)"
+    ),
+):
+    """
+    여러 기간 비교 조회
+
+    - 예: ?window=2025-03-01..2025-03-31&window=2025-02-01..2025-02-28&window=2024-03-01..2024-03-31
+    - 기간별 총액/건수/카테고리별 금액과 기준 기간 대비 증감(deltas)을 한 번의 집계로 반환
+    - 현재 로그인한 사용자의 거래만 집계
+    """
+    if len(window) > MAX_COMPARE_WINDOWS:
+        raise HTTPException(
+            status_code=400, detail=f"기간은 최대 {MAX_COMPARE_WINDOWS}개까지 비교할 수 있습니다."
+        )
+    windows = []
+    for value in window:
+        match = WINDOW_PATTERN.match(value)
+        if match is None:
+            raise HTTPException(
+                status_code=400, detail=f"기간 형식이 올바르지 않습니다: {value} (YYYY-MM-DD..YYYY-MM-DD)"
+            )
+        start, end = _parse_date(match.group(1)), _parse_date(match.group(2))
+        if (date.fromisoformat(end) - date.fromisoformat(start)).days >= MAX_COMPARE_WINDOW_DAYS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"기간 하나는 최대 {MAX_COMPARE_WINDOW_DAYS}일까지 지정할 수 있습니다: {value}",
+            )
+        windows.append((start, end))
+
+    logger.info(f"기간 비교 조회: {windows} (user_id={current_user.id})")
+
+    result = get_aggregate_cache().get_or_compute(
+        current_user.id,
+        ("compare", *(f"{start}..{end}" for start, end in windows)),
+        lambda: compare_windows(session, user_id=current_user.id, windows=windows),
+    )
+    return ComparisonResult(**result)
+
+
+@router.get("/aggregate/distribution", response_model=DistributionResult)
+async def get_distribution(
+    session: Annotated[Session, Depends(get_session)],
+    current_user: Annotated[User, Depends(get_current_user_dependency)],
+    start: str = Query(..., description="시작 월 (YYYY-MM)", regex=r"^\d{4}-\d{2}$"),
+    end: str = Query(..., description="종료 월 (YYYY-MM)", regex=r"^\d{4}-\d{2}$"),
+    by: Literal["category", "merchant"] = Query(default="category", description="묶음 기준"),
+    q: list[float] = Query(default=[0.5, 0.9], description="분위수 (0~1, 반복 지정)"),
+    edges: list[int] = Query(
+        default=list(DEFAULT_HISTOGRAM_EDGES), description="히스토그램 구간 경계 (원, 오름차순, 반복 지정)"
+    ),
+    limit: int = Query(default=20, ge=1, le=200, description="건수 상위 몇 개까지"),
+):
+    """
+    금액 분포 조회 (카테고리/가맹점별 중앙값, p90, 히스토그램)
+
+    - 월별로 미리 유지하는 분포 스케치를 합쳐 계산 (거래 수와 무관한 비용)
+    - 분위수는 상대 오차 약 1% 근사값
+    - 현재 로그인한 사용자의 거래만 집계
+    """
+    if any(not 0 <= value <= 1 for value in q):
+        raise HTTPException(status_code=400, detail="분위수는 0~1 사이여야 합니다.")
+    if not edges or any(lower >= upper for lower, upper in zip(edges, edges[1:])):
+        raise HTTPException(status_code=400, detail="히스토그램 경계는 오름차순이어야 합니다.")
+
+    logger.info(f"분포 조회: {start} ~ {end} (by={by}, user_id={current_user.id})")
+
+    result = get_aggregate_cache().get_or_compute(
+        current_user.id,
+        ("distribution", start, end, by, tuple(q), tuple(edges), limit),
+        lambda: spend_distribution(
+            session,
+            user_id=current_user.id,
+            start_month=start,
+            end_month=end,
+            by=by,
+            quantiles=q,
+            edges=edges,
+            limit=limit,
+        ),
+    )
+    return DistributionResult(**result)
+
+
+@router.get("/aggregate/cohort", response_model=CohortComparison)
+async def get_cohort_comparison(
+    session: Annotated[Session, Depends(get_session)],
+    current_user: Annotated[User, Depends(get_current_user_dependency)],
+    month: str = Query(..., description="월 (YYYY-MM)", regex=r"^\d{4}-(0[1-9]|1[0-2])$"),
+    dimension: Literal["all", "city", "channel", "payment_type"] = Query(
+        default="city", description="코호트 기준"
+    ),
+    value: str | None = Query(default=None, description="기준 값 (없으면 그 달 내 거래에서 가장 많은 값)"),
+):
+    """
+    코호트 비교 조회 ("같은 도시 다른 사용자들과 비교")
+
+    - 카테고리별 내 월 지출과 코호트 사용자 월 지출 분위수(p25/p50/p75/p90), 코호트 내 위치
+    - 코호트 통계는 배치 작업(python -m services.cohort_stats)이 미리 계산한 값
+    - 사용자 수가 적은 코호트는 제공하지 않음
+    """
+    logger.info(f"코호트 비교 조회: {month} ({dimension}={value}, user_id={current_user.id})")
+    return CohortComparison(
+        **cohort_comparison(session, current_user.id, month, dimension=dimension, value=value)
+    )
+
+
+@router.get("/aggregate/cache")
+async def get_aggregate_cache_stats(
+    current_user: Annotated[User, Depends(get_current_user_dependency)],
+):
+    """
+    집계 결과 캐시 통계 조회 (디버깅용)
+    
+    - 적중/실패/축출/만료 횟수와 적중률
+    - 컬럼 저장소를 켠 경우 사용자 수/메모리 사용량
+    """
+    store = get_columnar_store()
+    return {
+        **get_aggregate_cache().stats(),
+        "columnar_store": store.stats() if store is not None else None,
+    }
@@ -3,15 +3,20 @@ Classification 라우터
 """
 
 import logging
+from datetime import datetime
 from typing import Annotated
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
 from sqlmodel import Session
 
 from db import get_session
 from models.transaction import ClassificationResult
 from models.user import User
 from routers.auth import get_current_user_dependency
-from services.classifier import classify_all_unclassified
+from services.category_rules import get_classification_cache_stats, get_rule_snapshot
+from services.classifier import CLASSIFY_CHUNK_SIZE
+from services.classify_jobs import get_job_manager
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -22,18 +27,38 @@ async def classify_transactions(
     session: Annotated[Session, Depends(get_session)],
     current_user: Annotated[User, Depends(get_current_user_dependency)],
     use_llm: bool = Query(default=False, description="LLM 백업 사용 여부"),
+    chunk_size: int = Query(
+        default=CLASSIFY_CHUNK_SIZE, ge=1, le=10000, description="청크당 처리 건수"
+    ),
 ):
     """
     미분류 거래 자동 분류
     
     - Rules engine을 사용하여 가맹점/키워드 기반 분류
     - use_llm=true 설정 시 LLM 백업 사용 (현재는 stub)
+    - chunk_size건씩 나눠 분류하고 청크마다 커밋
     - 분류 후 카테고리별 건수와 검토 필요 건수 반환
     - 현재 로그인한 사용자의 거래만 분류
+    - 대량 분류는 POST /classify/jobs 사용 권장
+    - 같은 사용자의 분류 작업이 실행 중이면 409
     """
     logger.info(f"분류 시작 (use_llm={use_llm}, user_id={current_user.id})")
     
-    result = classify_all_unclassified(session, user_id=current_user.id, use_llm=use_llm)
+    # 분류는 동기 DB 작업이므로 이벤트 루프를 막지 않도록 스레드 풀에서 실행
+    # (백그라운드 작업과 같은 사용자당 단일 실행 규칙)
+    job, ran = await run_in_threadpool(
+        get_job_manager().run,
+        session,
+        current_user.id,
+        use_llm=use_llm,
+        chunk_size=chunk_size,
+    )
+    if not ran:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": "이미 실행 중인 분류 작업이 있습니다.", "job_id": job.id},
+        )
+    result = job.result
     
     logger.info(
         f"분류 완료: {result['total_classified']}건 처리, "
@@ -45,3 +70,98 @@ async def classify_transactions(
         by_category=result["by_category"],
         needs_review_count=result["needs_review_count"],
     )
+
+
+class ClassifyJobStatus(BaseModel):
+    """백그라운드 분류 작업 상태"""
+
+    job_id: str
+    status: str
+    rows_done: int
+    rows_total: int
+    throughput: float
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    result: ClassificationResult | None = None
+    error: str | None = None
+
+
+@router.post(
+    "/classify/jobs",
+    response_model=ClassifyJobStatus,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def create_classify_job(
+    current_user: Annotated[User, Depends(get_current_user_dependency)],
+    use_llm: bool = Query(default=False, description="LLM 백업 사용 여부"),
+    chunk_size: int = Query(
+        default=CLASSIFY_CHUNK_SIZE, ge=1, le=10000, description="청크당 처리 건수"
+    ),
+):
+    """
+    미분류 거래 백그라운드 분류 작업 등록
+    
+    - 작업 id를 바로 반환하고 분류는 워커 풀에서 진행
+    - 진행 상황은 GET /classify/jobs/{job_id}로 조회
+    - 사용자당 하나의 작업만 실행 (실행 중인 작업이 있으면 409)
+    """
+    job, created = get_job_manager().submit(
+        current_user.id, use_llm=use_llm, chunk_size=chunk_size
+    )
+    if not created:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": "이미 실행 중인 분류 작업이 있습니다.", "job_id": job.id},
+        )
+    return ClassifyJobStatus(**job.to_dict())
+
+
+@router.get("/classify/jobs/{job_id}", response_model=ClassifyJobStatus)
+async def get_classify_job(
+    job_id: str,
+    current_user: Annotated[User, Depends(get_current_user_dependency)],
+):
+    """
+    백그라운드 분류 작업 상태 조회
+    
+    - 처리 건수 / 전체 건수 / 초당 처리 건수
+    - 완료되면 result에 분류 결과
+    """
+    job = get_job_manager().get(job_id)
+    if job is None or job.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="분류 작업을 찾을 수 없습니다.",
+        )
+    return ClassifyJobStatus(**job.to_dict())
+
+
+class RuleSetInfo(BaseModel):
+    """현재 규칙 스냅샷 정보"""
+
+    version: str
+    source: str
+    loaded_at: datetime
+    rule_count: int
+    cache: dict
+
+
+@router.get("/classify/rules", response_model=RuleSetInfo)
+async def get_rule_set_info(
+    current_user: Annotated[User, Depends(get_current_user_dependency)],
+):
+    """
+    현재 적용 중인 분류 규칙 버전 조회 (디버깅용)
+    
+    - 규칙 소스(builtin | file:경로 | db:category_rules)와 로드 시각
+    - 분류 캐시 적중률 등 통계
+    """
+    snapshot = get_rule_snapshot()
+    return RuleSetInfo(
+        version=snapshot.matcher.version,
+        source=snapshot.source,
+        loaded_at=snapshot.loaded_at,
+        rule_count=snapshot.matcher.rule_count,
+        cache=get_classification_cache_stats(),
+    )
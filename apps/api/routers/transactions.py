@@ -2,17 +2,47 @@
 거래 업로드 라우터
 """
 
+import base64
+import json
 import logging
-from typing import Annotated
+from typing import Annotated, Literal, NamedTuple
 
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel, ValidationError
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Integer, String, case, cast, literal, tuple_
+from sqlmodel import Session, func, select
 
 from db import get_session
-from models.transaction import Transaction, TransactionCreate, TransactionRead
+from models.transaction import (
+    MonthlyCount,
+    Transaction,
+    TransactionPage,
+    TransactionStats,
+)
+from models.types import IsoDate, IsoTime, parse_iso_date, parse_iso_time
 from models.user import User
 from routers.auth import get_current_user_dependency
+from services.aggregate_cache import bump_user_data_version, get_user_data_version
+from services.classifier import classify_transactions_batch
+from services.columnar_store import get_columnar_store
+from services.daily_rollup import RollupDelta, apply_rollup_delta
+from services.transaction_export import MEDIA_TYPES, ExportFormat, export_transactions
+from services.transaction_ingest import (
+    INGEST_CHUNK_SIZE,
+    IngestedTransaction,
+    classify_input,
+    insert_transactions,
+    validate_transactions,
+)
+from services.upload_stream import (
+    STREAM_UPLOAD_MAX_REASONS,
+    JsonArrayParser,
+    NdjsonParser,
+    iter_row_chunks,
+    validate_row_chunk,
+)
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -36,6 +66,7 @@ class UploadResponse(BaseModel):
 
     accepted: int
     rejected: int
+    duplicates: int = 0  # 이미 저장된 거래와 같아 건너뛴 건수
     reasons: list[RejectionReason]
 
 
@@ -44,122 +75,330 @@ async def upload_transactions(
     request: UploadRequest,
     session: Annotated[Session, Depends(get_session)],
     current_user: Annotated[User, Depends(get_current_user_dependency)],
+    classify: bool = Query(default=False, description="저장 전 rules engine으로 분류 여부"),
 ):
     """
     거래 데이터 일괄 업로드
     
-    - 각 거래를 검증하여 유효한 것만 DB에 저장
+    - 각 거래를 검증하여 유효한 것만 DB에 저장 (목록 전체를 한 번에 검증하고 일괄 INSERT)
     - 무효한 거래는 거부 사유와 함께 반환
+    - 이미 저장된 거래(사용자, 날짜, 시간, 가맹점, 금액이 같음)는 건너뛰고 duplicates로 반환
+      (겹치는 명세서를 다시 올려도 중복 저장되지 않음)
+    - classify=true면 검증된 거래를 가맹점 단위로 일괄 분류한 뒤 저장
+      (이후 /api/classify로 다시 읽어 분류할 필요 없음)
     - 현재 로그인한 사용자의 거래로 저장
     """
-    accepted = 0
-    rejected = 0
+    rows, rejections = validate_transactions(request.transactions)
+    reasons = [RejectionReason(row=row_number, reason=reason) for row_number, reason in rejections]
+    _log_rejections(reasons)
+
+    db_transactions = _save_rows(session, current_user.id, rows, classify)
+    accepted = len(db_transactions)
+    duplicates = len(rows) - accepted
+    logger.info(
+        f"업로드 완료: {accepted}건 성공, {len(reasons)}건 실패, {duplicates}건 중복 (user_id: {current_user.id})",
+        extra={
+            "accepted": accepted,
+            "rejected": len(reasons),
+            "duplicates": duplicates,
+            "user_id": current_user.id,
+        },
+    )
+
+    return UploadResponse(
+        accepted=accepted,
+        rejected=len(reasons),
+        duplicates=duplicates,
+        reasons=reasons,
+    )
+
+
+@router.post("/transactions/upload/stream", response_model=UploadResponse)
+async def upload_transactions_stream(
+    request: Request,
+    session: Annotated[Session, Depends(get_session)],
+    current_user: Annotated[User, Depends(get_current_user_dependency)],
+    classify: bool = Query(default=False, description="저장 전 rules engine으로 분류 여부"),
+    chunk_size: int = Query(
+        default=INGEST_CHUNK_SIZE, ge=1, le=50000, description="청크당 검증/저장 건수"
+    ),
+):
+    """
+    거래 대량 업로드 (본문 스트리밍)
+
+    - 본문: NDJSON (Content-Type: application/x-ndjson) 또는 JSON 배열 (application/json)
+    - 본문을 받는 대로 파싱해 chunk_size건씩 검증/저장하고 청크마다 커밋
+      (서버 메모리가 본문 크기가 아니라 청크 크기에 비례)
+    - 검증/중복 처리는 /transactions/upload와 같음, 거부된 행은 처리하는 대로 로그에 남김
+    - 응답 reasons에는 앞 STREAM_UPLOAD_MAX_REASONS건까지만 (rejected는 전체 건수)
+    - JSON 배열 문법 오류면 400 (그 앞 청크는 이미 저장됨)
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type == MEDIA_TYPES["ndjson"]:
+        parser = NdjsonParser()
+    elif content_type == "application/json":
+        parser = JsonArrayParser()
+    else:
+        raise HTTPException(
+            status_code=415,
+            detail=f"지원하지 않는 Content-Type입니다 ({MEDIA_TYPES['ndjson']} 또는 application/json)",
+        )
+
+    accepted = rejected = duplicates = 0
     reasons: list[RejectionReason] = []
+    try:
+        async for chunk in iter_row_chunks(request.stream(), parser, chunk_size):
+            rows, rejections = validate_row_chunk(chunk)
+            chunk_reasons = [RejectionReason(row=row_number, reason=reason) for row_number, reason in rejections]
+            _log_rejections(chunk_reasons)
+            rejected += len(chunk_reasons)
+            reasons.extend(chunk_reasons[: STREAM_UPLOAD_MAX_REASONS - len(reasons)])
+
+            # 동기 DB 작업이므로 이벤트 루프를 막지 않도록 스레드 풀에서 실행
+            db_transactions = await run_in_threadpool(_save_rows, session, current_user.id, rows, classify)
+            accepted += len(db_transactions)
+            duplicates += len(rows) - len(db_transactions)
+    except ValueError as e:
+        logger.warning(f"스트리밍 업로드 본문 오류: {e} (앞서 {accepted}건 저장됨)")
+        raise HTTPException(status_code=400, detail=f"{e} (앞서 {accepted}건 저장됨)")
+
+    logger.info(
+        f"스트리밍 업로드 완료: {accepted}건 성공, {rejected}건 실패, {duplicates}건 중복"
+        f" (user_id: {current_user.id})",
+        extra={
+            "accepted": accepted,
+            "rejected": rejected,
+            "duplicates": duplicates,
+            "user_id": current_user.id,
+        },
+    )
+    return UploadResponse(
+        accepted=accepted,
+        rejected=rejected,
+        duplicates=duplicates,
+        reasons=reasons,
+    )
+
+
+def _log_rejections(reasons: list[RejectionReason]) -> None:
+    for reason in reasons:
+        logger.warning(
+            f"Row {reason.row} 검증 실패",
+            extra={"row": reason.row, "error": reason.reason},
+        )
+
+
+def _save_rows(
+    session: Session, user_id: int, rows: list, classify: bool
+) -> list[IngestedTransaction]:
+    """
+    검증된 행 분류(선택)/저장 후 커밋 (일별 롤업도 같은 트랜잭션에서 갱신)
+
+    Returns:
+        실제로 저장된 거래 (중복 제외)
+    """
+    # 분류 (선택): 검증된 거래 전체를 한 번에
+    classification = (
+        classify_transactions_batch(classify_input(rows)) if classify and rows else None
+    )
 
-    for index, txn_data in enumerate(request.transactions):
-        row_number = index + 1
-        try:
-            # Pydantic 검증
-            txn_create = TransactionCreate(**txn_data)
-
-            # DB에 저장 (user_id 추가)
-            db_transaction = Transaction(
-                **txn_create.model_dump(),
-                user_id=current_user.id  # 현재 사용자 ID 추가
-            )
-            session.add(db_transaction)
-            accepted += 1
-
-        except ValidationError as e:
-            # 검증 실패
-            rejected += 1
-            error_messages = "; ".join(
-                [f"{err['loc'][0]}: {err['msg']}" for err in e.errors()]
-            )
-            reasons.append(
-                RejectionReason(
-                    row=row_number,
-                    reason=error_messages,
-                )
-            )
-            logger.warning(
-                f"Row {row_number} 검증 실패",
-                extra={"row": row_number, "error": error_messages},
-            )
-
-        except Exception as e:
-            # 기타 에러
-            rejected += 1
-            reasons.append(
-                RejectionReason(
-                    row=row_number,
-                    reason=f"예상치 못한 에러: {str(e)}",
-                )
-            )
-            logger.error(
-                f"Row {row_number} 처리 실패",
-                extra={"row": row_number, "error": str(e)},
-            )
-
-    # 커밋
     try:
+        db_transactions = insert_transactions(session, user_id, rows, classification)
+        rollup = RollupDelta()
+        rollup.add_transactions(db_transactions)
+        apply_rollup_delta(session, rollup)
+        previous_version = get_user_data_version(user_id)
         session.commit()
-        logger.info(
-            f"업로드 완료: {accepted}건 성공, {rejected}건 실패 (user_id: {current_user.id})",
-            extra={"accepted": accepted, "rejected": rejected, "user_id": current_user.id},
-        )
+        current_version = bump_user_data_version(user_id)
+        store = get_columnar_store()
+        if store is not None:
+            store.append(user_id, db_transactions, previous_version, current_version)
     except Exception as e:
         session.rollback()
         logger.error(f"DB 커밋 실패: {e}")
         raise HTTPException(status_code=500, detail="데이터베이스 저장 실패")
+    return db_transactions
 
-    return UploadResponse(
-        accepted=accepted,
-        rejected=rejected,
-        reasons=reasons,
-    )
+
+class DateRange(NamedTuple):
+    """기간 필터 (정규화된 YYYY-MM-DD, 없으면 None)"""
+
+    start: str | None
+    end: str | None
+
+
+def date_range(
+    start: str | None = Query(default=None, description="시작일 (YYYY-MM-DD)", regex=r"^\d{4}-\d{2}-\d{2}$"),
+    end: str | None = Query(default=None, description="종료일 (YYYY-MM-DD)", regex=r"^\d{4}-\d{2}-\d{2}$"),
+) -> DateRange:
+    """목록/통계/내보내기 공통 기간 파라미터 (형식은 맞지만 없는 날짜면 400)"""
+    try:
+        return DateRange(
+            parse_iso_date(start) if start is not None else None,
+            parse_iso_date(end) if end is not None else None,
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="존재하지 않는 날짜입니다.") from None
+
+
+def _filter_conditions(
+    user_id: int,
+    start: str | None = None,
+    end: str | None = None,
+    category: str | None = None,
+    needs_review: bool | None = None,
+) -> list:
+    """목록/통계/내보내기 공통 필터 조건"""
+    conditions = [Transaction.user_id == user_id]
+    if start is not None:
+        conditions.append(Transaction.date >= start)
+    if end is not None:
+        conditions.append(Transaction.date <= end)
+    if category is not None:
+        conditions.append(Transaction.category == category)
+    if needs_review is not None:
+        conditions.append(Transaction.needs_review == needs_review)
+    return conditions
+
+
+def _encode_cursor(order: str, txn: Transaction) -> str:
+    payload = json.dumps([order, txn.date, txn.time, txn.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
 
 
-@router.get("/transactions", response_model=list[TransactionRead])
+def _decode_cursor(cursor: str, order: str) -> tuple[str, str, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_order, date, time, txn_id = json.loads(base64.urlsafe_b64decode(padded))
+        values = (parse_iso_date(date), parse_iso_time(time), int(txn_id))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.") from None
+    if cursor_order != order:
+        raise HTTPException(status_code=400, detail="커서와 정렬 순서(order)가 다릅니다.")
+    return values
+
+
+@router.get("/transactions", response_model=TransactionPage)
 async def get_transactions(
     session: Annotated[Session, Depends(get_session)],
     current_user: Annotated[User, Depends(get_current_user_dependency)],
-    limit: int = 100,
-    offset: int = 0,
+    dates: Annotated[DateRange, Depends(date_range)],
+    limit: int = Query(default=100, ge=1, le=1000, description="페이지 크기"),
+    cursor: str | None = Query(default=None, description="이전 응답의 next_cursor"),
+    order: Literal["asc", "desc"] = Query(default="desc", description="(날짜, 시간, id) 정렬 방향"),
+    category: str | None = Query(default=None, description="카테고리"),
+    needs_review: bool | None = Query(default=None, description="수동 검토 필요 여부"),
 ):
     """
-    거래 목록 조회
-    
+    거래 목록 조회 (커서 페이지네이션)
+
+    - (날짜, 시간, id) 순서로 limit건씩 반환, 다음 페이지는 next_cursor로 요청
+    - (user_id, date, time, id) 인덱스를 따라 읽으므로 뒤쪽 페이지도 앞 페이지만큼 빠르고,
+      조회 중 거래가 추가돼도 페이지가 겹치거나 빠지지 않음
+    - 필터(기간, 카테고리, 검토 필요)는 페이지를 넘겨도 같은 값으로 보내야 함
     - 현재 로그인한 사용자의 거래만 조회
     """
-    statement = (
-        select(Transaction)
-        .where(Transaction.user_id == current_user.id)
-        .offset(offset)
-        .limit(limit)
+    order_key = tuple_(Transaction.date, Transaction.time, Transaction.id)
+    statement = select(Transaction).where(
+        *_filter_conditions(current_user.id, dates.start, dates.end, category, needs_review)
+    )
+    if cursor is not None:
+        date, time, txn_id = _decode_cursor(cursor, order)
+        last = tuple_(
+            literal(date, IsoDate()), literal(time, IsoTime()), literal(txn_id, Integer())
+        )
+        statement = statement.where(order_key > last if order == "asc" else order_key < last)
+
+    if order == "asc":
+        statement = statement.order_by(Transaction.date, Transaction.time, Transaction.id)
+    else:
+        statement = statement.order_by(
+            Transaction.date.desc(), Transaction.time.desc(), Transaction.id.desc()
+        )
+
+    # 한 건 더 읽어서 다음 페이지가 있는지 확인
+    transactions = session.exec(statement.limit(limit + 1)).all()
+    next_cursor = None
+    if len(transactions) > limit:
+        transactions = transactions[:limit]
+        next_cursor = _encode_cursor(order, transactions[-1])
+    return TransactionPage(items=transactions, next_cursor=next_cursor)
+
+
+@router.get("/transactions/export")
+async def export_transactions_file(
+    session: Annotated[Session, Depends(get_session)],
+    current_user: Annotated[User, Depends(get_current_user_dependency)],
+    dates: Annotated[DateRange, Depends(date_range)],
+    format: ExportFormat = Query(default="csv", description="파일 형식 (csv | ndjson)"),
+    gzip: bool = Query(default=False, description="gzip 압축 (.gz 파일로 받음)"),
+    category: str | None = Query(default=None, description="카테고리"),
+    needs_review: bool | None = Query(default=None, description="수동 검토 필요 여부"),
+):
+    """
+    거래 내보내기 (CSV / NDJSON 파일 다운로드)
+
+    - (날짜, 시간, id) 순서로 전체 거래를 스트리밍 (행 수와 무관하게 서버 메모리 일정)
+    - 필터는 목록 조회와 같음 (잘못된 필터는 응답을 시작하기 전에 400)
+    - 현재 로그인한 사용자의 거래만 내보냄
+    """
+    conditions = _filter_conditions(current_user.id, dates.start, dates.end, category, needs_review)
+    filename = f"transactions.{format}" + (".gz" if gzip else "")
+    logger.info(f"거래 내보내기 시작: {filename} (user_id: {current_user.id})")
+    return StreamingResponse(
+        export_transactions(session.get_bind(), conditions, export_format=format, compress=gzip),
+        media_type="application/gzip" if gzip else MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
-    transactions = session.exec(statement).all()
-    return transactions
 
 
-@router.get("/transactions/stats")
+@router.get("/transactions/stats", response_model=TransactionStats)
 async def get_transaction_stats(
     session: Annotated[Session, Depends(get_session)],
     current_user: Annotated[User, Depends(get_current_user_dependency)],
+    dates: Annotated[DateRange, Depends(date_range)],
+    category: str | None = Query(default=None, description="카테고리"),
 ):
     """
     거래 통계
-    
+
+    - 건수/합계/평균/최소/최대, 검토 필요 비율, 월별 건수
+    - DB에서 집계하므로 거래를 메모리로 읽지 않음
+      (PostgreSQL은 커버링 인덱스로 테이블을 읽지 않고 계산)
     - 현재 로그인한 사용자의 거래만 집계
     """
-    statement = select(Transaction).where(Transaction.user_id == current_user.id)
-    transactions = session.exec(statement).all()
+    conditions = _filter_conditions(current_user.id, dates.start, dates.end, category)
 
-    total_count = len(transactions)
-    total_amount = sum(txn.amount_krw for txn in transactions)
+    total_count, total_amount, avg_amount, min_amount, max_amount, needs_review_count = session.exec(
+        select(
+            func.count(),
+            func.coalesce(func.sum(Transaction.amount_krw), 0),
+            func.avg(Transaction.amount_krw),
+            func.min(Transaction.amount_krw),
+            func.max(Transaction.amount_krw),
+            func.coalesce(func.sum(case((Transaction.needs_review, 1), else_=0)), 0),
+        ).where(*conditions)
+    ).one()
 
-    return {
-        "total_count": total_count,
-        "total_amount": total_amount,
-        "avg_amount": total_amount / total_count if total_count > 0 else 0,
-    }
+    # 'YYYY-MM' (SQLite/PostgreSQL 모두 DATE → 'YYYY-MM-DD' 문자열)
+    month = func.substr(cast(Transaction.date, String), 1, 7)
+    by_month = session.exec(
+        select(month, func.count(), func.sum(Transaction.amount_krw))
+        .where(*conditions)
+        .group_by(month)
+        .order_by(month)
+    ).all()
+
+    return TransactionStats(
+        total_count=total_count,
+        total_amount=total_amount,
+        avg_amount=float(avg_amount or 0),
+        min_amount=min_amount,
+        max_amount=max_amount,
+        needs_review_count=needs_review_count,
+        needs_review_ratio=needs_review_count / total_count if total_count else 0.0,
+        by_month=[
+            MonthlyCount(month=month_value, count=count, amount=amount)
+            for month_value, count, amount in by_month
+        ],
+    )
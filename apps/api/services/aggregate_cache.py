@@ -0,0 +1,249 @@
+"""
+집계 결과 캐시
+
+aggregate_transactions 결과를 (user_id, 기간, 구간, 옵션) 키로 캐시한다.
+
+- 무효화: 사용자별 데이터 버전 카운터를 키에 포함한다. 업로드/분류 등 거래가 바뀌면
+  커밋 후 버전을 올리므로 이전 버전으로 저장된 결과는 다시 읽히지 않는다.
+- 프로세스 내 LRU + TTL
+- 선택: 공유 백엔드 (여러 워커 프로세스가 버전과 결과를 공유)
+  SharedCacheBackend 프로토콜(get/set/incr)만 맞추면 되고,
+  AGGREGATE_CACHE_URL=redis://... 이면 Redis를 사용한다 (redis 패키지 필요).
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Protocol
+
+logger = logging.getLogger(__name__)
+
+# 캐시 설정
+AGGREGATE_CACHE_SIZE = int(os.getenv("AGGREGATE_CACHE_SIZE", "1024"))
+AGGREGATE_CACHE_TTL = float(os.getenv("AGGREGATE_CACHE_TTL", "300"))
+AGGREGATE_CACHE_URL = os.getenv("AGGREGATE_CACHE_URL", "")
+
+# 전체 사용자 무효화용 (예: 롤업 전체 재계산)
+GLOBAL_VERSION_KEY = "aggregate:version:*"
+
+
+class SharedCacheBackend(Protocol):
+    """프로세스 간 공유 캐시 백엔드 인터페이스 (Redis 명령 부분집합)"""
+
+    def get(self, key: str) -> bytes | str | None:
+        ...
+
+    def set(self, key: str, value: str, ex: int | None = None) -> object:
+        ...
+
+    def incr(self, key: str) -> int:
+        ...
+
+
+def _version_key(user_id: int) -> str:
+    return f"aggregate:version:{user_id}"
+
+
+class AggregateCache:
+    """
+    사용자별 버전으로 무효화되는 집계 결과 캐시
+
+    반환된 결과는 여러 요청이 공유하므로 읽기 전용으로 다뤄야 한다.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = AGGREGATE_CACHE_SIZE,
+        ttl: float = AGGREGATE_CACHE_TTL,
+        backend: SharedCacheBackend | None = None,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.backend = backend
+        self._entries: OrderedDict[Hashable, tuple[float, dict]] = OrderedDict()
+        self._versions: dict[int | str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def version(self, user_id: int) -> tuple[int, int]:
+        """사용자 데이터 버전 (전체 버전, 사용자 버전)"""
+        if self.backend is not None:
+            try:
+                return (
+                    int(self.backend.get(GLOBAL_VERSION_KEY) or 0),
+                    int(self.backend.get(_version_key(user_id)) or 0),
+                )
+            except Exception as e:
+                logger.warning(f"공유 캐시 버전 조회 실패, 로컬 버전 사용: {e}")
+        with self._lock:
+            return self._versions.get("*", 0), self._versions.get(user_id, 0)
+
+    def bump(self, user_id: int | None = None) -> tuple[int, int] | None:
+        """
+        데이터 버전 올리기 (거래 변경을 커밋한 뒤 호출)
+
+        Args:
+            user_id: 사용자 ID (None이면 전체 사용자)
+
+        Returns:
+            올린 뒤의 사용자 데이터 버전 (전체 사용자면 None)
+        """
+        local_key: int | str = "*" if user_id is None else user_id
+        with self._lock:
+            self._versions[local_key] = self._versions.get(local_key, 0) + 1
+        if self.backend is not None:
+            try:
+                self.backend.incr(GLOBAL_VERSION_KEY if user_id is None else _version_key(user_id))
+            except Exception as e:
+                logger.warning(f"공유 캐시 버전 갱신 실패: {e}")
+        return None if user_id is None else self.version(user_id)
+
+    def get_or_compute(self, user_id: int, params: tuple, compute: Callable[[], dict]) -> dict:
+        """
+        캐시된 결과 조회, 없으면 compute() 결과를 저장 후 반환
+
+        Args:
+            user_id: 사용자 ID
+            params: 결과를 결정하는 나머지 인자 (기간, 구간, 옵션)
+            compute: 집계 함수
+        """
+        if self.maxsize <= 0 and self.backend is None:
+            return compute()
+
+        # 버전을 먼저 읽는다: 계산 중에 데이터가 바뀌면 결과는 이전 버전 키로 저장된다
+        key = (user_id, self.version(user_id), *params)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+
+        shared_key = f"aggregate:result:{json.dumps(key, ensure_ascii=False)}"
+        value = self._get_shared(shared_key)
+        if value is not None:
+            with self._lock:
+                self.shared_hits += 1
+        else:
+            with self._lock:
+                self.misses += 1
+            value = compute()
+            self._set_shared(shared_key, value)
+
+        self._put(key, value, now)
+        return value
+
+    def _put(self, key: Hashable, value: dict, now: float) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _get_shared(self, key: str) -> dict | None:
+        if self.backend is None:
+            return None
+        try:
+            raw = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"공유 캐시 조회 실패: {e}")
+            return None
+        return None if raw is None else json.loads(raw)
+
+    def _set_shared(self, key: str, value: dict) -> None:
+        if self.backend is None:
+            return
+        try:
+            self.backend.set(key, json.dumps(value, ensure_ascii=False), ex=max(int(self.ttl), 1))
+        except Exception as e:
+            logger.warning(f"공유 캐시 저장 실패: {e}")
+
+    def clear(self) -> None:
+        """로컬 결과 비우기 (버전/통계는 유지)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """캐시 통계"""
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "shared_backend": type(self.backend).__name__ if self.backend else None,
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": (self.hits + self.shared_hits) / lookups if lookups else 0.0,
+            }
+
+
+def create_shared_backend(url: str) -> SharedCacheBackend | None:
+    """
+    AGGREGATE_CACHE_URL로 공유 백엔드 생성
+
+    Returns:
+        백엔드 (url이 비어 있으면 None)
+    """
+    if not url:
+        return None
+    try:
+        import redis
+    except ImportError as e:
+        raise RuntimeError("AGGREGATE_CACHE_URL을 쓰려면 redis 패키지가 필요합니다.") from e
+    return redis.Redis.from_url(url)
+
+
+_aggregate_cache: AggregateCache | None = None
+_aggregate_cache_lock = threading.Lock()
+
+
+def get_aggregate_cache() -> AggregateCache:
+    """프로세스 공용 집계 캐시 조회 (최초 호출 시 생성)"""
+    global _aggregate_cache
+    with _aggregate_cache_lock:
+        if _aggregate_cache is None:
+            _aggregate_cache = AggregateCache(backend=create_shared_backend(AGGREGATE_CACHE_URL))
+        return _aggregate_cache
+
+
+def set_aggregate_cache(cache: AggregateCache | None) -> None:
+    """집계 캐시 교체 (테스트용, None이면 다음 조회 때 설정대로 다시 생성)"""
+    global _aggregate_cache
+    with _aggregate_cache_lock:
+        _aggregate_cache = cache
+
+
+def get_user_data_version(user_id: int) -> tuple[int, int]:
+    """사용자 데이터 버전 조회"""
+    return get_aggregate_cache().version(user_id)
+
+
+def bump_user_data_version(user_id: int | None = None) -> tuple[int, int] | None:
+    """
+    사용자 거래가 바뀌었음을 집계 캐시에 알림 (커밋 후 호출)
+
+    Returns:
+        올린 뒤의 사용자 데이터 버전 (전체 사용자면 None)
+    """
+    return get_aggregate_cache().bump(user_id)
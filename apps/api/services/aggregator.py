@@ -1,22 +1,61 @@
 """
 거래 집계 서비스
+
+원본 거래 대신 일별 롤업(daily_spend)을 읽으므로 비용은 기간 내 일수 × 가맹점 수에 비례한다.
+컬럼 저장소(COLUMNAR_STORE_MB)를 켜면 메모리의 NumPy 컬럼에서 벡터 연산으로 집계한다.
 """
 
 import logging
-from datetime import datetime
+from datetime import date
 from typing import Literal
+import numpy as np
+import pandas as pd
+from sqlalchemy import Date, cast, literal, union_all
 from sqlmodel import Session, select, func
-from models.transaction import Transaction
+from models.daily_spend import UNCLASSIFIED, DailySpend
+from services.columnar_store import UserColumns, get_columnar_store
 
 logger = logging.getLogger(__name__)
 
+RangeType = Literal["day", "week", "month"]
+
+
+def _bucket_start(range_type: RangeType, dialect: str):
+    """
+    날짜 → 구간 시작일 (YYYY-MM-DD) SQL 식
+
+    - day: 그 날짜
+    - week: ISO 주의 월요일
+    - month: 그 달 1일
+    """
+    if range_type == "day":
+        return DailySpend.date
+    if range_type == "month":
+        return func.substr(DailySpend.date, 1, 7) + "-01"
+    if dialect == "postgresql":
+        return func.to_char(func.date_trunc("week", cast(DailySpend.date, Date)), "YYYY-MM-DD")
+    # SQLite: 6일 전 날짜 다음(당일 포함) 월요일 = 이번 주 월요일
+    return func.date(DailySpend.date, "-6 days", "weekday 1")
+
+
+def _bucket_label(range_type: RangeType, start: str) -> str:
+    """구간 이름 (2025-01-15 | 2025-W03 | 2025-01)"""
+    if range_type == "day":
+        return start
+    if range_type == "month":
+        return start[:7]
+    iso_year, iso_week, _ = date.fromisoformat(start).isocalendar()
+    return f"{iso_year}-W{iso_week:02d}"
+
 
 def aggregate_transactions(
     session: Session,
     user_id: int,
     start_date: str,
     end_date: str,
-    range_type: Literal["day", "week", "month"] = "month"
+    range_type: RangeType = "month",
+    series_by_category: bool = False,
+    include_daily_totals: bool = True,
 ) -> dict:
     """
     거래 집계
@@ -36,52 +75,409 @@ def aggregate_transactions(
             "daily_totals": [{date: 날짜, amount: 금액}]
         }
     """
-    # 날짜 범위 내 해당 사용자의 거래 조회
-    statement = select(Transaction).where(
-        Transaction.user_id == user_id,
-        Transaction.date >= start_date,
-        Transaction.date <= end_date
-    )
-    transactions = session.exec(statement).all()
-    
-    # 총 금액
-    total_amount = sum(txn.amount_krw for txn in transactions)
+    store = get_columnar_store()
+    if store is not None:
+        result, transaction_count = aggregate_columns(
+            store.get(session, user_id),
+            start_date,
+            end_date,
+            range_type,
+            series_by_category,
+            include_daily_totals,
+        )
+    else:
+        result, transaction_count = _aggregate_rollup(
+            session,
+            user_id,
+            start_date,
+            end_date,
+            range_type,
+            series_by_category,
+            include_daily_totals,
+        )
     
+    logger.info(
+        f"집계 완료: {transaction_count}건, "
+        f"총 {result['total_amount']:,.0f}원 ({start_date} ~ {end_date})"
+    )
+    return result
+
+
+def _aggregate_rollup(
+    session: Session,
+    user_id: int,
+    start_date: str,
+    end_date: str,
+    range_type: RangeType,
+    series_by_category: bool,
+    include_daily_totals: bool,
+) -> tuple[dict, int]:
+    """일별 롤업(daily_spend)에서 SQL GROUP BY로 집계. (결과, 거래 건수)"""
+    # 날짜 범위 내 해당 사용자의 롤업 행만 DB에서 GROUP BY로 요약해 가져온다
+    conditions = (
+        DailySpend.user_id == user_id,
+        DailySpend.date >= start_date,
+        DailySpend.date <= end_date,
+    )
+    amount = func.sum(DailySpend.amount_sum)
+    # 키 순서/동점 순서는 처음 등장한 거래(가장 작은 id) 순
+    first_seen = func.min(DailySpend.first_id)
+
+    # 총 금액, 건수
+    total_amount, transaction_count = session.exec(
+        select(func.coalesce(amount, 0), func.coalesce(func.sum(DailySpend.txn_count), 0))
+        .where(*conditions)
+    ).one()
+
     # 카테고리별 금액
-    by_category = {}
-    for txn in transactions:
-        category = txn.category or "미분류"
-        by_category[category] = by_category.get(category, 0.0) + txn.amount_krw
-    
+    category = func.coalesce(func.nullif(DailySpend.category, UNCLASSIFIED), "미분류")
+    by_category = {
+        name: total
+        for name, total in session.exec(
+            select(category, amount).where(*conditions).group_by(category).order_by(first_seen)
+        )
+    }
+
     # 가맹점별 금액 (상위 3개)
-    merchant_totals = {}
-    for txn in transactions:
-        merchant_totals[txn.merchant] = merchant_totals.get(txn.merchant, 0.0) + txn.amount_krw
-    
-    top_merchants = sorted(
-        [{"merchant": k, "amount": v} for k, v in merchant_totals.items()],
-        key=lambda x: x["amount"],
-        reverse=True
-    )[:3]
-    
+    top_merchants = [
+        {"merchant": merchant, "amount": total}
+        for merchant, total in session.exec(
+            select(DailySpend.merchant, amount)
+            .where(*conditions)
+            .group_by(DailySpend.merchant)
+            .order_by(amount.desc(), first_seen)
+            .limit(3)
+        )
+    ]
+
     # 일별 총액
-    daily_totals_dict = {}
-    for txn in transactions:
-        daily_totals_dict[txn.date] = daily_totals_dict.get(txn.date, 0.0) + txn.amount_krw
-    
-    daily_totals = sorted(
-        [{"date": k, "amount": v} for k, v in daily_totals_dict.items()],
-        key=lambda x: x["date"]
-    )
+    daily_totals = []
+    if include_daily_totals:
+        daily_totals = [
+            {"date": day, "amount": total}
+            for day, total in session.exec(
+                select(DailySpend.date, amount)
+                .where(*conditions)
+                .group_by(DailySpend.date)
+                .order_by(DailySpend.date)
+            )
+        ]
+    active_days = session.exec(
+        select(func.count(DailySpend.date.distinct())).where(*conditions)
+    ).one()
     
-    logger.info(
-        f"집계 완료: {len(transactions)}건, "
-        f"총 {total_amount:,.0f}원 ({start_date} ~ {end_date})"
-    )
+    # 구간별 총액 (일/ISO 주/월 구간은 DB에서 GROUP BY)
+    bucket = _bucket_start(range_type, session.get_bind().dialect.name).label("bucket")
+    series: list[dict] = []
+    if series_by_category:
+        statement = (
+            select(bucket, category, amount)
+            .where(*conditions)
+            .group_by(bucket, category)
+            .order_by(bucket, first_seen)
+        )
+        for start, name, total in session.exec(statement):
+            if not series or series[-1]["start"] != start:
+                series.append(
+                    {
+                        "bucket": _bucket_label(range_type, start),
+                        "start": start,
+                        "amount": 0.0,
+                        "by_category": {},
+                    }
+                )
+            series[-1]["amount"] += total
+            series[-1]["by_category"][name] = total
+    else:
+        series = [
+            {
+                "bucket": _bucket_label(range_type, start),
+                "start": start,
+                "amount": total,
+                "by_category": None,
+            }
+            for start, total in session.exec(
+                select(bucket, amount).where(*conditions).group_by(bucket).order_by(bucket)
+            )
+        ]
     
     return {
         "total_amount": total_amount,
         "by_category": by_category,
         "top_merchants": top_merchants,
         "daily_totals": daily_totals,
-    }
+        "active_days": active_days,
+        "series": series,
+    }, transaction_count
+
+
+def _ordered_groups(codes: np.ndarray, weights: np.ndarray, size: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    코드별 금액 합계와 처음 등장한 위치 (정렬 없이 bincount / minimum.at)
+
+    Returns:
+        (등장한 코드 - 처음 등장 순, 코드별 합계, 코드별 처음 위치)
+    """
+    sums = np.bincount(codes, weights=weights, minlength=size)
+    first = np.full(size, len(codes), dtype=np.int64)
+    np.minimum.at(first, codes, np.arange(len(codes)))
+    present = np.flatnonzero(first < len(codes))
+    return present[np.argsort(first[present], kind="stable")], sums, first
+
+
+def aggregate_columns(
+    columns: UserColumns,
+    start_date: str,
+    end_date: str,
+    range_type: RangeType = "month",
+    series_by_category: bool = False,
+    include_daily_totals: bool = True,
+) -> tuple[dict, int]:
+    """
+    컬럼 저장소에서 벡터 연산으로 집계 (결과는 롤업 집계와 같다)
+
+    Returns:
+        (aggregate_transactions와 같은 결과, 거래 건수)
+    """
+    date_ordinals, amounts, category_codes, merchant_codes = columns.snapshot()
+
+    mask = (date_ordinals >= date.fromisoformat(start_date).toordinal()) & (
+        date_ordinals <= date.fromisoformat(end_date).toordinal()
+    )
+    days = date_ordinals[mask]
+    amounts = amounts[mask]
+    category_codes = category_codes[mask]
+    merchant_codes = merchant_codes[mask]
+    transaction_count = len(days)
+    if transaction_count == 0:
+        return {
+            "total_amount": 0,
+            "by_category": {},
+            "top_merchants": [],
+            "daily_totals": [],
+            "active_days": 0,
+            "series": [],
+        }, 0
+
+    # 카테고리별 금액 (처음 등장한 순)
+    categories = columns.categories.values
+    order, category_sums, _ = _ordered_groups(category_codes, amounts, len(categories))
+    by_category = {categories[code]: float(category_sums[code]) for code in order}
+
+    # 가맹점별 금액 (상위 3개, 동점은 처음 등장한 순)
+    merchants = columns.merchants.values
+    present, merchant_sums, merchant_first = _ordered_groups(merchant_codes, amounts, len(merchants))
+    top = present[np.lexsort((merchant_first[present], -merchant_sums[present]))[:3]]
+    top_merchants = [{"merchant": merchants[code], "amount": float(merchant_sums[code])} for code in top]
+
+    # 일별 총액: 기간 첫날부터의 일수로 bincount (정렬 없이 날짜순)
+    offsets = days - days.min()
+    day_counts = np.bincount(offsets)
+    present_days = np.flatnonzero(day_counts)
+    unique_days = present_days + days.min()
+    day_sums = np.bincount(offsets, weights=amounts)[present_days]
+    day_labels = [date.fromordinal(int(ordinal)).isoformat() for ordinal in unique_days]
+
+    daily_totals = []
+    if include_daily_totals:
+        daily_totals = [
+            {"date": label, "amount": float(total)} for label, total in zip(day_labels, day_sums)
+        ]
+
+    # 구간별 총액: 날짜 → 구간 시작일
+    if range_type == "day":
+        bucket_starts = day_labels
+    elif range_type == "week":
+        # date.fromordinal(1)은 월요일이므로 (서수 - 1) % 7이 요일
+        bucket_starts = [
+            date.fromordinal(int(ordinal - (ordinal - 1) % 7)).isoformat() for ordinal in unique_days
+        ]
+    else:
+        bucket_starts = [label[:7] + "-01" for label in day_labels]
+    bucket_codes, bucket_values = pd.factorize(np.array(bucket_starts, dtype=object))
+
+    if series_by_category:
+        # (구간, 카테고리) 조합별 합계, 구간 안에서는 처음 등장한 순
+        day_buckets = np.zeros(len(day_counts), dtype=np.int64)
+        day_buckets[present_days] = bucket_codes
+        row_buckets = day_buckets[offsets]
+        pair_codes = row_buckets.astype(np.int64) * len(categories) + category_codes
+        pairs, pair_sums, pair_first = _ordered_groups(
+            pair_codes, amounts, len(bucket_values) * len(categories)
+        )
+        pairs = pairs[np.lexsort((pair_first[pairs], pairs // len(categories)))]
+        series = []
+        for pair in pairs:
+            start = bucket_values[pair // len(categories)]
+            if not series or series[-1]["start"] != start:
+                series.append(
+                    {
+                        "bucket": _bucket_label(range_type, start),
+                        "start": start,
+                        "amount": 0.0,
+                        "by_category": {},
+                    }
+                )
+            total = float(pair_sums[pair])
+            series[-1]["amount"] += total
+            series[-1]["by_category"][categories[pair % len(categories)]] = total
+    else:
+        bucket_sums = np.bincount(bucket_codes, weights=day_sums, minlength=len(bucket_values))
+        series = [
+            {
+                "bucket": _bucket_label(range_type, start),
+                "start": start,
+                "amount": float(total),
+                "by_category": None,
+            }
+            for start, total in zip(bucket_values, bucket_sums)
+        ]
+
+    return {
+        "total_amount": float(amounts.sum()),
+        "by_category": by_category,
+        "top_merchants": top_merchants,
+        "daily_totals": daily_totals,
+        "active_days": len(unique_days),
+        "series": series,
+    }, transaction_count
+
+
+def compare_windows(
+    session: Session,
+    user_id: int,
+    windows: list[tuple[str, str]],
+) -> dict:
+    """
+    여러 기간 비교 (이번 달 vs 지난달 vs 작년 같은 달 등)
+
+    모든 기간을 한 번에 집계한다 (롤업은 GROUP BY 쿼리 한 번, 컬럼 저장소는 한 번의 스캔).
+
+    Args:
+        session: DB 세션
+        user_id: 사용자 ID
+        windows: [(시작일, 종료일)] - 첫 번째 기간이 비교 기준
+
+    Returns:
+        {
+            "windows": [{start, end, total_amount, transaction_count, by_category}],
+            "deltas": [{start, end, total_amount, total_pct, by_category}]
+                - 두 번째 기간부터, (기준 기간 - 해당 기간) 변화량
+        }
+    """
+    if not windows:
+        raise ValueError("비교할 기간이 하나 이상 필요합니다.")
+
+    store = get_columnar_store()
+    if store is not None:
+        rows = _window_rows_columns(store.get(session, user_id), windows)
+    else:
+        rows = _window_rows_rollup(session, user_id, windows)
+
+    summaries = [
+        {"start": start, "end": end, "total_amount": 0.0, "transaction_count": 0, "by_category": {}}
+        for start, end in windows
+    ]
+    for index, category, total, count in rows:
+        summary = summaries[index]
+        summary["total_amount"] += total
+        summary["transaction_count"] += count
+        summary["by_category"][category] = total
+
+    base = summaries[0]
+    deltas = []
+    for summary in summaries[1:]:
+        delta = base["total_amount"] - summary["total_amount"]
+        categories = list(base["by_category"]) + [
+            category for category in summary["by_category"] if category not in base["by_category"]
+        ]
+        deltas.append(
+            {
+                "start": summary["start"],
+                "end": summary["end"],
+                "total_amount": delta,
+                "total_pct": delta / summary["total_amount"] * 100 if summary["total_amount"] else None,
+                "by_category": {
+                    category: base["by_category"].get(category, 0.0)
+                    - summary["by_category"].get(category, 0.0)
+                    for category in categories
+                },
+            }
+        )
+
+    logger.info(f"기간 비교 완료: {len(windows)}개 기간 (user_id: {user_id})")
+    return {"windows": summaries, "deltas": deltas}
+
+
+def _window_rows_rollup(
+    session: Session, user_id: int, windows: list[tuple[str, str]]
+) -> list[tuple[int, str, float, int]]:
+    """롤업에서 (기간 번호, 카테고리, 금액, 건수) - 기간 목록을 서브쿼리로 만들어 조인 한 번"""
+    window_table = union_all(
+        *(
+            select(
+                literal(index).label("idx"),
+                literal(start).label("start"),
+                literal(end).label("end"),
+            )
+            for index, (start, end) in enumerate(windows)
+        )
+    ).subquery("windows")
+    category = func.coalesce(func.nullif(DailySpend.category, UNCLASSIFIED), "미분류")
+
+    statement = (
+        select(
+            window_table.c.idx,
+            category,
+            func.sum(DailySpend.amount_sum),
+            func.sum(DailySpend.txn_count),
+        )
+        .join(
+            DailySpend,
+            (DailySpend.date >= window_table.c.start) & (DailySpend.date <= window_table.c.end),
+        )
+        .where(DailySpend.user_id == user_id)
+        .group_by(window_table.c.idx, category)
+        .order_by(window_table.c.idx, func.min(DailySpend.first_id))
+    )
+    return [(index, name, total, count) for index, name, total, count in session.exec(statement)]
+
+
+def _window_rows_columns(
+    columns: UserColumns, windows: list[tuple[str, str]]
+) -> list[tuple[int, str, float, int]]:
+    """
+    컬럼 저장소에서 (기간 번호, 카테고리, 금액, 건수)
+
+    기간마다 범위 안의 행만 골라 (기간, 카테고리) 코드로 묶는다. 메모리는 기간 길이가 아니라
+    범위 안 행 수에 비례한다 (기간이 겹치면 행이 여러 기간에 들어감).
+    """
+    date_ordinals, amounts, category_codes, _ = columns.snapshot()
+    categories = columns.categories.values
+    width = max(len(categories), 1)
+
+    row_indexes = []
+    keys = []
+    for index, (start, end) in enumerate(windows):
+        rows_in_window = np.flatnonzero(
+            (date_ordinals >= date.fromisoformat(start).toordinal())
+            & (date_ordinals <= date.fromisoformat(end).toordinal())
+        )
+        row_indexes.append(rows_in_window)
+        keys.append(index * width + category_codes[rows_in_window].astype(np.int64))
+    row_indexes = np.concatenate(row_indexes)
+    if len(row_indexes) == 0:
+        return []
+
+    groups, inverse = np.unique(np.concatenate(keys), return_inverse=True)
+    sums = np.bincount(inverse, weights=amounts[row_indexes], minlength=len(groups))
+    counts = np.bincount(inverse, minlength=len(groups))
+    first = np.full(len(groups), np.iinfo(np.int64).max, dtype=np.int64)
+    np.minimum.at(first, inverse, row_indexes)
+
+    # 기간 순, 기간 안에서는 카테고리가 처음 등장한 순
+    window_indexes, codes = np.divmod(groups, width)
+    return [
+        (int(window_indexes[group]), categories[codes[group]], float(sums[group]), int(counts[group]))
+        for group in np.lexsort((first, window_indexes))
+    ]
@@ -2,6 +2,17 @@
 카테고리 분류 규칙 정의
 """
 
+import os
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from services.classification_cache import ClassificationCache
+from services.rule_matcher import RuleMatcher
+from services.rule_store import DatabaseRuleSource, FileRuleSource, RuleSnapshot, RuleStore
+
 # 가맹점 → 카테고리 매핑
 MERCHANT_CATEGORY_MAP = {
     # 식비/카페
@@ -105,6 +116,78 @@ def normalize_merchant(merchant: str) -> str:
     return normalized
 
 
+# 분류 결과 캐시 최대 항목 수 ((정규화 가맹점명, 정규화 메모) 조합 기준)
+CLASSIFICATION_CACHE_SIZE = int(os.getenv("CLASSIFICATION_CACHE_SIZE", "65536"))
+
+# 외부 규칙 소스 ("" = 위의 내장 테이블, "file" = RULES_PATH, "db" = category_rules 테이블)
+RULES_SOURCE = os.getenv("RULES_SOURCE", "file" if os.getenv("RULES_PATH") else "")
+RULES_PATH = os.getenv("RULES_PATH", "")
+RULES_RELOAD_INTERVAL = float(os.getenv("RULES_RELOAD_INTERVAL", "5"))
+
+_rule_store = RuleStore(normalize_merchant)
+_classification_cache = ClassificationCache(CLASSIFICATION_CACHE_SIZE)
+
+
+def get_rule_store() -> RuleStore:
+    """규칙 스냅샷 보관소 조회"""
+    return _rule_store
+
+
+def get_rule_snapshot() -> RuleSnapshot:
+    """
+    현재 규칙 스냅샷 조회 (스냅샷이 없으면 내장 테이블로 컴파일)
+
+    Returns:
+        RuleSnapshot (matcher, source, loaded_at)
+    """
+    snapshot = _rule_store.current()
+    if snapshot is None:
+        snapshot = _rule_store.install(MERCHANT_CATEGORY_MAP, KEYWORD_CATEGORY_MAP, "builtin")
+    return snapshot
+
+
+def get_rule_matcher() -> RuleMatcher:
+    """
+    현재 규칙 스냅샷의 매처 조회
+
+    한 번의 분류 작업 안에서는 처음 받은 매처를 계속 쓰면 된다.
+    도중에 규칙이 바뀌어도 이미 받은 매처는 변하지 않는다.
+
+    Returns:
+        RuleMatcher
+    """
+    return get_rule_snapshot().matcher
+
+
+def rebuild_rule_matcher() -> RuleMatcher:
+    """
+    내장 규칙 테이블 변경 후 매처 재컴파일
+
+    캐시는 규칙 버전으로 태그되어 있으므로 내용이 바뀌었으면 다음 조회 때 비워진다.
+
+    Returns:
+        새로 컴파일된 RuleMatcher
+    """
+    return _rule_store.install(MERCHANT_CATEGORY_MAP, KEYWORD_CATEGORY_MAP, "builtin").matcher
+
+
+def configure_rule_source() -> None:
+    """
+    RULES_SOURCE 설정에 따라 외부 규칙을 읽고 변경 감시 시작 (서버 시작 시 호출)
+    """
+    if RULES_SOURCE == "file":
+        source = FileRuleSource(Path(RULES_PATH))
+    elif RULES_SOURCE == "db":
+        from db import engine
+
+        source = DatabaseRuleSource(engine)
+    else:
+        return
+
+    _rule_store.set_source(source)
+    _rule_store.start_watching(RULES_RELOAD_INTERVAL)
+
+
 def get_category_by_merchant(merchant: str) -> tuple[str | None, float]:
     """
     가맹점명으로 카테고리 찾기
@@ -115,17 +198,45 @@ def get_category_by_merchant(merchant: str) -> tuple[str | None, float]:
     Returns:
         (카테고리, 신뢰도) 튜플
     """
-    normalized = normalize_merchant(merchant)
-    
+    return _match_normalized_merchant(normalize_merchant(merchant), get_rule_matcher())
+
+
+def _match_normalized_merchant(normalized: str, matcher: RuleMatcher) -> tuple[str | None, float]:
+    """정규화된 가맹점명으로 카테고리 찾기"""
     # 1. 정확한 매칭
-    for key, category in MERCHANT_CATEGORY_MAP.items():
-        if normalize_merchant(key) == normalized:
-            return category, RULE_CONFIDENCE["merchant_exact_match"]
+    category = matcher.match_merchant_exact(normalized)
+    if category:
+        return category, RULE_CONFIDENCE["merchant_exact_match"]
+    
+    # 2. 부분 매칭 (가맹점명에 키워드 포함 또는 그 반대)
+    category = matcher.match_merchant_partial(normalized)
+    if category:
+        return category, RULE_CONFIDENCE["merchant_partial_match"]
+    
+    return None, 0.0
+
+
+def normalize_memo(memo: str) -> str:
+    """
+    메모 정규화 (키워드 매칭 및 캐시 키용)
+    
+    Args:
+        memo: 원본 메모
+        
+    Returns:
+        소문자로 바꾸고 앞뒤 공백을 제거한 메모
+    """
+    return memo.lower().strip() if memo else ""
+
+
+def _match_normalized_memo(memo_key: str, matcher: RuleMatcher) -> tuple[str | None, float]:
+    """정규화된 메모로 카테고리 찾기"""
+    if not memo_key:
+        return None, 0.0
     
-    # 2. 부분 매칭 (가맹점명에 키워드 포함)
-    for key, category in MERCHANT_CATEGORY_MAP.items():
-        if normalize_merchant(key) in normalized or normalized in normalize_merchant(key):
-            return category, RULE_CONFIDENCE["merchant_partial_match"]
+    category = matcher.match_keyword(memo_key)
+    if category:
+        return category, RULE_CONFIDENCE["keyword_match"]
     
     return None, 0.0
 
@@ -140,22 +251,55 @@ def get_category_by_keyword(memo: str) -> tuple[str | None, float]:
     Returns:
         (카테고리, 신뢰도) 튜플
     """
-    if not memo:
-        return None, 0.0
+    return _match_normalized_memo(normalize_memo(memo), get_rule_matcher())
+
+
+def _resolve(
+    merchant_match: tuple[str | None, float],
+    keyword_match: tuple[str | None, float] | None,
+) -> tuple[str, float, bool, str]:
+    """가맹점 → 키워드 → 기타 순으로 (카테고리, 신뢰도, 검토 필요, 방법) 결정"""
+    category, confidence = merchant_match
+    if category:
+        return category, confidence, False, "merchant"
     
-    memo_lower = memo.lower().strip()
+    if keyword_match is not None:
+        category, confidence = keyword_match
+        if category:
+            return category, confidence, False, "keyword"
     
-    for keyword, category in KEYWORD_CATEGORY_MAP.items():
-        if keyword.lower() in memo_lower:
-            return category, RULE_CONFIDENCE["keyword_match"]
+    return "기타", RULE_CONFIDENCE["default"], True, "default"
+
+
+def get_classification_cache_stats() -> dict:
+    """
+    분류 캐시 통계 (hits, misses, hit_rate, evictions, 규칙 버전 등)
+    """
+    return _classification_cache.stats()
+
+
+def clear_classification_cache() -> None:
+    """분류 캐시와 통계 초기화"""
+    _classification_cache.clear()
+
+
+def resize_classification_cache(maxsize: int) -> None:
+    """
+    분류 캐시 크기 변경 (기존 내용과 통계는 버림)
     
-    return None, 0.0
+    Args:
+        maxsize: 최대 항목 수 (0이면 캐시 사용 안 함)
+    """
+    global _classification_cache
+    _classification_cache = ClassificationCache(maxsize)
 
 
 def classify_transaction(merchant: str, memo: str = "") -> dict:
     """
     거래 분류
     
+    (정규화된 가맹점명, 정규화된 메모) 기준으로 프로세스 전역 LRU 캐시를 거친다.
+    
     Args:
         merchant: 가맹점명
         memo: 메모
@@ -168,31 +312,123 @@ def classify_transaction(merchant: str, memo: str = "") -> dict:
             "method": str  # "merchant" | "keyword" | "default"
         }
     """
-    # 1. 가맹점명으로 시도
-    category, confidence = get_category_by_merchant(merchant)
-    if category:
-        return {
-            "category": category,
-            "confidence": confidence,
-            "needs_review": False,
-            "method": "merchant",
-        }
+    matcher = get_rule_matcher()
+    key = (normalize_merchant(merchant), normalize_memo(memo))
     
-    # 2. 키워드로 시도
-    category, confidence = get_category_by_keyword(memo)
-    if category:
-        return {
-            "category": category,
-            "confidence": confidence,
-            "needs_review": False,
-            "method": "keyword",
-        }
+    result = _classification_cache.get(key, matcher.version)
+    if result is None:
+        # 1. 가맹점명으로 시도 → 2. 키워드로 시도 → 3. 미분류 (기타)
+        merchant_match = _match_normalized_merchant(key[0], matcher)
+        keyword_match = None if merchant_match[0] else _match_normalized_memo(key[1], matcher)
+        result = _resolve(merchant_match, keyword_match)
+        _classification_cache.put(key, result, matcher.version)
     
-    # 3. 미분류 (기타)
+    category, confidence, needs_review, method = result
     return {
-        "category": "기타",
-        "confidence": RULE_CONFIDENCE["default"],
-        "needs_review": True,
-        "method": "default",
+        "category": category,
+        "confidence": confidence,
+        "needs_review": needs_review,
+        "method": method,
     }
 
+
+def classify_batch(
+    merchants: Sequence[str] | np.ndarray | pd.Series,
+    memos: Sequence[str] | np.ndarray | pd.Series | None = None,
+    matcher: RuleMatcher | None = None,
+) -> dict[str, np.ndarray]:
+    """
+    거래 일괄 분류 (컬럼 단위)
+
+    classify_transaction과 같은 결과를 내지만, 배치 안에서 같은
+    (정규화 가맹점명, 정규화 메모) 조합은 한 번만 캐시를 조회하고,
+    캐시에 없는 조합도 가맹점명은 정규화된 이름당 한 번, 메모는 한 번만 매칭한다.
+
+    Args:
+        merchants: 가맹점명 컬럼 (list, NumPy 배열, pandas Series)
+        memos: 메모 컬럼 (생략 시 모두 빈 메모)
+        matcher: 사용할 규칙 매처 (생략 시 현재 스냅샷)
+
+    Returns:
+        {
+            "category": ndarray[object],
+            "confidence": ndarray[float64],
+            "method": ndarray[object],
+            "needs_review": ndarray[bool]
+        }
+    """
+    merchant_values = pd.Series(np.asarray(merchants, dtype=object)).fillna("").astype(str)
+    size = len(merchant_values)
+    if memos is None:
+        memo_values = pd.Series([""] * size, dtype=object)
+    else:
+        memo_values = pd.Series(np.asarray(memos, dtype=object)).fillna("").astype(str)
+        if len(memo_values) != size:
+            raise ValueError("merchants와 memos의 길이가 다릅니다.")
+
+    if size == 0:
+        return {
+            "category": np.empty(0, dtype=object),
+            "confidence": np.empty(0, dtype=np.float64),
+            "method": np.empty(0, dtype=object),
+            "needs_review": np.empty(0, dtype=bool),
+        }
+
+    # 1. 원본 → 정규화 값 순으로 중복 제거 (정규화 함수는 고유값에만 적용)
+    raw_codes, raw_uniques = pd.factorize(merchant_values)
+    normalized_codes, merchant_keys = pd.factorize(
+        np.array([normalize_merchant(merchant) for merchant in raw_uniques], dtype=object)
+    )
+    merchant_codes = normalized_codes[raw_codes].astype(np.int64)
+
+    raw_codes, raw_uniques = pd.factorize(memo_values)
+    normalized_codes, memo_keys = pd.factorize(
+        np.array([normalize_memo(memo) for memo in raw_uniques], dtype=object)
+    )
+    memo_codes = normalized_codes[raw_codes].astype(np.int64)
+
+    # 2. (가맹점, 메모) 조합 단위로 캐시 조회
+    pair_codes, pairs = pd.factorize(merchant_codes * len(memo_keys) + memo_codes)
+
+    matcher = matcher or get_rule_matcher()
+    version = matcher.version
+    pair_results: list[tuple[str, float, bool, str] | None] = []
+    misses: list[int] = []
+    for pair_index, pair in enumerate(pairs):
+        key = (merchant_keys[pair // len(memo_keys)], memo_keys[pair % len(memo_keys)])
+        cached = _classification_cache.get(key, version)
+        if cached is None:
+            misses.append(pair_index)
+        pair_results.append(cached)
+
+    # 3. 캐시에 없는 조합: 가맹점명은 고유값당 한 번, 실패한 경우만 메모 키워드 매칭
+    merchant_matches: dict[str, tuple[str | None, float]] = {}
+    keyword_matches: dict[str, tuple[str | None, float]] = {}
+    for pair_index in misses:
+        pair = pairs[pair_index]
+        key = (merchant_keys[pair // len(memo_keys)], memo_keys[pair % len(memo_keys)])
+
+        merchant_match = merchant_matches.get(key[0])
+        if merchant_match is None:
+            merchant_match = _match_normalized_merchant(key[0], matcher)
+            merchant_matches[key[0]] = merchant_match
+
+        keyword_match = None
+        if not merchant_match[0]:
+            keyword_match = keyword_matches.get(key[1])
+            if keyword_match is None:
+                keyword_match = _match_normalized_memo(key[1], matcher)
+                keyword_matches[key[1]] = keyword_match
+
+        result = _resolve(merchant_match, keyword_match)
+        _classification_cache.put(key, result, version)
+        pair_results[pair_index] = result
+
+    # 4. 조합 결과를 행 단위 컬럼으로 펼치기
+    category, confidence, needs_review, method = zip(*pair_results)
+    return {
+        "category": np.array(category, dtype=object)[pair_codes],
+        "confidence": np.array(confidence, dtype=np.float64)[pair_codes],
+        "method": np.array(method, dtype=object)[pair_codes],
+        "needs_review": np.array(needs_review, dtype=bool)[pair_codes],
+    }
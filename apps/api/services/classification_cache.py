@@ -0,0 +1,126 @@
+"""
+분류 결과 캐시
+
+(정규화된 가맹점명, 정규화된 메모) → 분류 결과를 프로세스 단위로 저장하는 LRU 캐시.
+항목 키에 규칙 테이블 버전이 들어가므로 다른 버전의 결과는 보이지 않는다. 규칙이 바뀌어도
+캐시를 비우지 않아, 이전 스냅샷에 고정된 긴 작업과 새 버전의 요청이 번갈아 조회해도
+서로의 항목을 지우지 않고 이전 버전 항목은 LRU로 자연히 밀려난다.
+"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+
+class ClassificationCache:
+    """(규칙 버전, 키) LRU 캐시 (스레드 안전)"""
+
+    def __init__(self, maxsize: int):
+        if maxsize < 0:
+            raise ValueError("maxsize는 0 이상이어야 합니다.")
+        self.maxsize = maxsize
+        self._entries: OrderedDict[tuple[str, Hashable], Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self._version: str | None = None
+        self._seen_versions: set[str] = set()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def version(self) -> str | None:
+        """마지막으로 조회/저장에 쓰인 규칙 버전"""
+        return self._version
+
+    def _note_version(self, version: str) -> None:
+        # 호출자가 lock을 잡은 상태여야 한다
+        # invalidations: 캐시가 비어 있지 않을 때 처음 보는 버전이 나온 횟수 (이전 항목은 더 이상 안 맞음)
+        if self._version != version:
+            if version not in self._seen_versions and self._entries:
+                self.invalidations += 1
+            self._seen_versions.add(version)
+            self._version = version
+
+    def get(self, key: Hashable, version: str) -> Any | None:
+        """
+        캐시 조회
+
+        Args:
+            key: 캐시 키
+            version: 현재 규칙 버전 (같은 버전으로 저장된 값만 찾음)
+
+        Returns:
+            저장된 값 (없으면 None)
+        """
+        with self._lock:
+            self._note_version(version)
+            entry_key = (version, key)
+            value = self._entries.get(entry_key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(entry_key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, version: str) -> None:
+        """
+        캐시 저장 (maxsize 초과 시 가장 오래 쓰이지 않은 항목 제거)
+
+        Args:
+            key: 캐시 키
+            value: 저장할 값 (None 제외)
+            version: 값을 계산한 규칙 버전
+        """
+        if self.maxsize == 0:
+            return
+        with self._lock:
+            self._note_version(version)
+            entry_key = (version, key)
+            self._entries[entry_key] = value
+            self._entries.move_to_end(entry_key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """캐시 내용과 통계 초기화"""
+        with self._lock:
+            self._entries.clear()
+            self._version = None
+            self._seen_versions.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.invalidations = 0
+
+    def stats(self) -> dict:
+        """
+        캐시 통계
+
+        Returns:
+            {
+                "size": int,
+                "maxsize": int,
+                "hits": int,
+                "misses": int,
+                "hit_rate": float,
+                "evictions": int,
+                "invalidations": int,
+                "version": str | None
+            }
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "version": self._version,
+            }
@@ -3,19 +3,34 @@
 """
 
 import logging
+import os
+from collections.abc import Callable, Sequence
 from datetime import datetime
-from sqlmodel import Session, select
-from models.transaction import Transaction
-from services.category_rules import classify_transaction
+
+import numpy as np
+from sqlmodel import Session, func, select, update
+
+from models.transaction import CategorySource, Transaction
+from services.aggregate_cache import bump_user_data_version, get_user_data_version
+from services.category_rules import classify_batch, classify_transaction, get_rule_matcher
+from services.columnar_store import get_columnar_store
+from services.daily_rollup import RollupDelta, apply_rollup_delta
+from services.llm_backend import get_llm_classifier, stub_llm_classify
+from services.ngram_model import NGRAM_MIN_CONFIDENCE, get_ngram_model
+from services.rule_matcher import RuleMatcher
 
 logger = logging.getLogger(__name__)
 
+# 미분류 거래 일괄 분류 시 청크당 처리 건수
+CLASSIFY_CHUNK_SIZE = int(os.getenv("CLASSIFY_CHUNK_SIZE", "1000"))
+
 
 def classify_with_llm(transaction: Transaction) -> dict:
     """
-    LLM을 사용한 분류 (stub)
+    LLM을 사용한 분류 (stub, 단건)
     
-    실제 LLM API 호출 없이 deterministic fallback 반환
+    실제 LLM API 호출 없이 deterministic fallback 반환.
+    여러 건을 분류할 때는 services.llm_backend의 LLMClassifier를 사용한다.
     
     Args:
         transaction: 거래 객체
@@ -27,36 +42,7 @@ def classify_with_llm(transaction: Transaction) -> dict:
             "rationale": str
         }
     """
-    # TODO: 실제 LLM API 연동 (OpenAI, Anthropic 등)
-    # 현재는 mock 응답 반환
-    
-    merchant_lower = transaction.merchant.lower()
-    
-    # Deterministic fallback logic
-    if any(keyword in merchant_lower for keyword in ["학교", "대학", "university"]):
-        return {
-            "category": "교육",
-            "confidence": 0.8,
-            "rationale": "LLM: 가맹점명에 교육 관련 키워드 포함"
-        }
-    elif any(keyword in merchant_lower for keyword in ["병원", "약국", "pharmacy"]):
-        return {
-            "category": "의료/건강",
-            "confidence": 0.8,
-            "rationale": "LLM: 가맹점명에 의료 관련 키워드 포함"
-        }
-    elif any(keyword in merchant_lower for keyword in ["영화", "cgv", "롯데시네마", "메가박스"]):
-        return {
-            "category": "문화/여가",
-            "confidence": 0.85,
-            "rationale": "LLM: 영화관 관련 가맹점"
-        }
-    else:
-        return {
-            "category": "기타",
-            "confidence": 0.6,
-            "rationale": "LLM: 명확한 카테고리 판단 불가"
-        }
+    return stub_llm_classify(transaction.merchant)
 
 
 def classify_single_transaction(transaction: Transaction, use_llm: bool = False) -> dict:
@@ -72,8 +58,19 @@ def classify_single_transaction(transaction: Transaction, use_llm: bool = False)
     """
     # 1. Rules engine으로 시도
     result = classify_transaction(transaction.merchant, transaction.memo)
-    
-    # 2. 미분류이고 LLM 사용 설정이면 LLM 시도
+
+    # 2. 미분류면 n-gram 모델 (classify_transactions_batch와 같은 기준)
+    if result["category"] == "기타":
+        prediction = _predict_with_model([transaction.merchant], [transaction.memo])
+        if prediction is not None and prediction[2][0]:
+            result = {
+                "category": str(prediction[0][0]),
+                "confidence": float(prediction[1][0]),
+                "needs_review": False,
+                "method": "model",
+            }
+
+    # 3. 여전히 미분류이고 LLM 사용 설정이면 LLM 시도
     if result["category"] == "기타" and use_llm:
         llm_result = classify_with_llm(transaction)
         if llm_result["confidence"] > result["confidence"]:
@@ -88,14 +85,125 @@ def classify_single_transaction(transaction: Transaction, use_llm: bool = False)
     return result
 
 
-def classify_all_unclassified(session: Session, user_id: int, use_llm: bool = False) -> dict:
+def _predict_with_model(
+    merchants: list[str], memos: list[str]
+) -> tuple[np.ndarray, np.ndarray, np.ndarray] | None:
+    """
+    n-gram 모델 예측 (모델이 없거나 입력이 비었으면 None)
+
+    Returns:
+        (카테고리, 신뢰도, 채택 여부) - 신뢰도가 NGRAM_MIN_CONFIDENCE 이상이고 기타가 아닌 예측만 채택
+    """
+    model = get_ngram_model()
+    if model is None or not merchants:
+        return None
+    categories, confidences = model.predict(merchants, memos)
+    accepted = (confidences >= NGRAM_MIN_CONFIDENCE) & (categories != "기타")
+    return categories, confidences, accepted
+
+
+def classify_transactions_batch(
+    transactions: Sequence[Transaction],
+    use_llm: bool = False,
+    matcher: RuleMatcher | None = None,
+) -> dict[str, np.ndarray]:
+    """
+    여러 거래 일괄 분류
+
+    1. Rules engine (classify_batch)
+    2. n-gram 모델: 학습된 모델이 있으면 미분류(기타) 거래를 일괄 예측해
+       신뢰도가 NGRAM_MIN_CONFIDENCE 이상인 것만 채택
+    3. LLM 백업 (use_llm): 여전히 기타인 거래만 배치로 묶어 동시에 호출하며,
+       타임아웃/실패한 거래는 이전 결과를 그대로 유지
+
+    Args:
+        transactions: 거래 객체 또는 merchant/memo 컬럼을 가진 Row 목록
+        use_llm: LLM 사용 여부 (기본값: False)
+        matcher: 사용할 규칙 매처 (생략 시 현재 스냅샷)
+
+    Returns:
+        classify_batch와 같은 형태의 컬럼 딕셔너리
+    """
+    result = classify_batch(
+        [transaction.merchant for transaction in transactions],
+        [transaction.memo for transaction in transactions],
+        matcher=matcher,
+    )
+
+    unresolved = np.flatnonzero(result["category"] == "기타")
+    prediction = _predict_with_model(
+        [transactions[index].merchant for index in unresolved],
+        [transactions[index].memo for index in unresolved],
+    )
+    if prediction is not None:
+        categories, confidences, accepted = prediction
+        rows = unresolved[accepted]
+        result["category"][rows] = categories[accepted]
+        result["confidence"][rows] = confidences[accepted]
+        result["needs_review"][rows] = False
+        result["method"][rows] = "model"
+
+    unresolved = np.flatnonzero(result["category"] == "기타") if use_llm else []
+    if len(unresolved):
+        llm_results = get_llm_classifier().classify_many_sync(
+            [
+                {"merchant": transactions[index].merchant, "memo": transactions[index].memo}
+                for index in unresolved
+            ]
+        )
+        for index, llm_result in zip(unresolved, llm_results):
+            # 타임아웃/실패(None)면 rules 결과 유지
+            if llm_result is not None and llm_result["confidence"] > result["confidence"][index]:
+                result["category"][index] = llm_result["category"]
+                result["confidence"][index] = llm_result["confidence"]
+                result["needs_review"][index] = llm_result["category"] == "기타"
+                result["method"][index] = "llm"
+
+    return result
+
+
+def count_unclassified(session: Session, user_id: int) -> int:
     """
-    미분류 거래 전체 분류
+    미분류 거래 건수
+    
+    Args:
+        session: DB 세션
+        user_id: 사용자 ID
+        
+    Returns:
+        category가 없는 해당 사용자의 거래 수
+    """
+    statement = select(func.count()).select_from(Transaction).where(
+        Transaction.category.is_(None),
+        Transaction.user_id == user_id,
+    )
+    return session.exec(statement).one()
+
+
+def classify_all_unclassified(
+    session: Session,
+    user_id: int,
+    use_llm: bool = False,
+    chunk_size: int = CLASSIFY_CHUNK_SIZE,
+    on_progress: Callable[[int], None] | None = None,
+) -> dict:
+    """
+    미분류 거래 전체 분류 (청크 단위 스트리밍)
+    
+    id 기준 keyset 페이지네이션으로 미분류 거래를 chunk_size건씩 읽고,
+    같은 (카테고리, 신뢰도, 검토 필요, 출처) 결과끼리 묶어 청크당 일괄 UPDATE 후
+    커밋한다. 일별 롤업(daily_spend)도 같은 트랜잭션에서 옮겨 적는다.
+    UPDATE는 아직 미분류인 거래만 바꾸고(RETURNING id), 실제로 바뀐 거래만 롤업에 반영하므로
+    동시에 실행된 다른 분류 작업이 먼저 분류한 거래를 두 번 옮기지 않는다.
+    중간에 실패해도 커밋된 청크까지는 분류가 유지된다.
+    규칙이 도중에 다시 로드되어도 모든 청크는 시작 시점의 규칙 스냅샷으로 분류한다.
     
     Args:
         session: DB 세션
         user_id: 사용자 ID
         use_llm: LLM 사용 여부
+        chunk_size: 청크당 처리 건수
+        on_progress: 청크 커밋마다 지금까지 분류한 건수로 호출되는 콜백
         
     Returns:
         {
@@ -104,42 +212,107 @@ def classify_all_unclassified(session: Session, user_id: int, use_llm: bool = Fa
             "needs_review_count": int
         }
     """
-    # 미분류 거래 조회 (category가 None이고 해당 사용자의 거래만)
-    statement = select(Transaction).where(
-        Transaction.category.is_(None),
-        Transaction.user_id == user_id
-    )
-    unclassified = session.exec(statement).all()
-    
+    if chunk_size < 1:
+        raise ValueError("chunk_size는 1 이상이어야 합니다.")
+
+    matcher = get_rule_matcher()
     total_classified = 0
     by_category = {}
     needs_review_count = 0
+    last_id = 0
     
-    for transaction in unclassified:
-        result = classify_single_transaction(transaction, use_llm=use_llm)
+    while True:
+        # 미분류 거래 조회 (category가 None이고 해당 사용자의 거래만)
+        statement = (
+            select(
+                Transaction.id,
+                Transaction.merchant,
+                Transaction.memo,
+                Transaction.date,
+                Transaction.amount_krw,
+            )
+            .where(
+                Transaction.category.is_(None),
+                Transaction.user_id == user_id,
+                Transaction.id > last_id,
+            )
+            .order_by(Transaction.id)
+            .limit(chunk_size)
+        )
+        chunk = session.exec(statement).all()
+        if not chunk:
+            break
+        last_id = chunk[-1].id
         
-        # 거래 업데이트
-        transaction.category = result["category"]
-        transaction.confidence = result["confidence"]
-        transaction.needs_review = result["needs_review"]
-        transaction.updated_at = datetime.utcnow()
+        results = classify_transactions_batch(chunk, use_llm=use_llm, matcher=matcher)
         
-        session.add(transaction)
+        # 같은 분류 결과끼리 묶어서 UPDATE 한 번씩
+        groups: dict[tuple[str, float, bool, str], list[int]] = {}
+        for index, row in enumerate(chunk):
+            key = (
+                str(results["category"][index]),
+                float(results["confidence"][index]),
+                bool(results["needs_review"][index]),
+                CategorySource.from_method(results["method"][index]).value,
+            )
+            groups.setdefault(key, []).append(row.id)
+
+        # 읽은 뒤 다른 분류 작업이 먼저 분류한 거래는 건너뛰고, 실제로 바뀐 거래만 롤업/통계에 반영
+        rows_by_id = {row.id: row for row in chunk}
+        rollup = RollupDelta()
+        updated_ids = []
+        updated_categories = []
+        now = datetime.utcnow()
+        for (category, confidence, needs_review, source), ids in groups.items():
+            updated = session.exec(
+                update(Transaction)
+                .where(Transaction.id.in_(ids), Transaction.category.is_(None))
+                .values(
+                    category=category,
+                    confidence=confidence,
+                    needs_review=needs_review,
+                    category_source=source,
+                    updated_at=now,
+                )
+                .returning(Transaction.id)
+                .execution_options(synchronize_session=False)
+            ).scalars().all()
+            for txn_id in updated:
+                row = rows_by_id[txn_id]
+                # 일별 롤업: 미분류 → 분류 카테고리로 이동
+                rollup.add(user_id, row.date, None, row.merchant, -row.amount_krw, count=-1)
+                rollup.add(user_id, row.date, category, row.merchant, row.amount_krw, first_id=row.id)
+            updated_ids.extend(updated)
+            updated_categories.extend([category] * len(updated))
+
+            # 통계 집계
+            total_classified += len(updated)
+            if updated:
+                by_category[category] = by_category.get(category, 0) + len(updated)
+            if needs_review:
+                needs_review_count += len(updated)
         
-        # 통계 집계
-        total_classified += 1
-        by_category[result["category"]] = by_category.get(result["category"], 0) + 1
-        if result["needs_review"]:
-            needs_review_count += 1
+        apply_rollup_delta(session, rollup)
+        previous_version = get_user_data_version(user_id)
+        session.commit()
+        current_version = bump_user_data_version(user_id)
+        store = get_columnar_store()
+        if store is not None:
+            store.set_categories(
+                user_id,
+                updated_ids,
+                updated_categories,
+                previous_version,
+                current_version,
+            )
+        if on_progress is not None:
+            on_progress(total_classified)
         
         logger.info(
-            f"Classified transaction {transaction.id}: "
-            f"{transaction.merchant} -> {result['category']} "
-            f"(confidence: {result['confidence']:.2f}, method: {result['method']})"
+            f"Classified chunk of {len(chunk)} transactions "
+            f"(user_id: {user_id}, last_id: {last_id}, updates: {len(groups)})"
         )
     
-    session.commit()
-    
     return {
         "total_classified": total_classified,
         "by_category": by_category,
@@ -0,0 +1,226 @@
+"""
+백그라운드 분류 작업
+
+대량의 미분류 거래를 요청 처리와 분리해 프로세스 내 워커 스레드 풀에서 분류한다.
+사용자당 동시에 하나의 작업만 실행되며(동기 POST /classify도 작업으로 등록), 진행 상황은 작업 id로 조회한다.
+"""
+
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from services.classifier import CLASSIFY_CHUNK_SIZE, classify_all_unclassified, count_unclassified
+
+logger = logging.getLogger(__name__)
+
+# 분류 작업 워커 수와 보관할 완료 작업 수
+CLASSIFY_JOB_WORKERS = int(os.getenv("CLASSIFY_JOB_WORKERS", "2"))
+CLASSIFY_JOB_HISTORY = int(os.getenv("CLASSIFY_JOB_HISTORY", "1000"))
+
+
+class ClassifyJob:
+    """분류 작업 상태"""
+
+    def __init__(self, user_id: int, use_llm: bool, chunk_size: int):
+        self.id = uuid.uuid4().hex
+        self.user_id = user_id
+        self.use_llm = use_llm
+        self.chunk_size = chunk_size
+        self.status = "pending"  # pending | running | succeeded | failed
+        self.rows_done = 0
+        self.rows_total = 0
+        self.result: dict | None = None
+        self.error: str | None = None
+        self.created_at = datetime.utcnow()
+        self.started_at: datetime | None = None
+        self.finished_at: datetime | None = None
+        self._started_clock: float | None = None
+        self._finished_clock: float | None = None
+
+    def mark_running(self, rows_total: int) -> None:
+        self.rows_total = rows_total
+        self.started_at = datetime.utcnow()
+        self._started_clock = time.monotonic()
+        self.status = "running"
+
+    def mark_finished(self, status: str) -> None:
+        self.finished_at = datetime.utcnow()
+        self._finished_clock = time.monotonic()
+        self.status = status
+
+    @property
+    def active(self) -> bool:
+        return self.status in ("pending", "running")
+
+    @property
+    def throughput(self) -> float:
+        """초당 분류 건수"""
+        if self._started_clock is None:
+            return 0.0
+        elapsed = (self._finished_clock or time.monotonic()) - self._started_clock
+        return self.rows_done / elapsed if elapsed > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        """상태 응답용 딕셔너리"""
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "rows_done": self.rows_done,
+            "rows_total": self.rows_total,
+            "throughput": round(self.throughput, 1),
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class ClassifyJobManager:
+    """분류 작업 관리자 (작업 등록, 사용자당 단일 실행, 상태 조회)"""
+
+    def __init__(self, engine: Engine, max_workers: int = CLASSIFY_JOB_WORKERS):
+        self.engine = engine
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="classify-job")
+        self._jobs: dict[str, ClassifyJob] = {}
+        self._active_by_user: dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self, user_id: int, use_llm: bool = False, chunk_size: int = CLASSIFY_CHUNK_SIZE
+    ) -> tuple[ClassifyJob, bool]:
+        """
+        분류 작업 등록
+
+        Args:
+            user_id: 사용자 ID
+            use_llm: LLM 사용 여부
+            chunk_size: 청크당 처리 건수
+
+        Returns:
+            (작업, 새로 만들었는지 여부) - 이미 실행 중인 작업이 있으면 그 작업과 False
+        """
+        job, created = self._register(user_id, use_llm, chunk_size)
+        if created:
+            self._executor.submit(self._run, job)
+            logger.info(f"분류 작업 등록: {job.id} (user_id={user_id})")
+        return job, created
+
+    def run(
+        self,
+        session: Session,
+        user_id: int,
+        use_llm: bool = False,
+        chunk_size: int = CLASSIFY_CHUNK_SIZE,
+    ) -> tuple[ClassifyJob, bool]:
+        """
+        분류를 호출한 스레드에서 바로 실행 (POST /classify)
+
+        백그라운드 작업과 같은 사용자당 단일 실행 규칙을 따르므로 같은 사용자의 분류가 겹치지 않는다.
+
+        Args:
+            session: DB 세션
+            user_id: 사용자 ID
+            use_llm: LLM 사용 여부
+            chunk_size: 청크당 처리 건수
+
+        Returns:
+            (작업, 실행했는지 여부) - 이미 실행 중인 작업이 있으면 실행하지 않고 그 작업과 False
+        """
+        job, created = self._register(user_id, use_llm, chunk_size)
+        if created:
+            self._execute(job, session)
+        return job, created
+
+    def get(self, job_id: str) -> ClassifyJob | None:
+        """작업 조회"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """워커 풀 종료"""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _prune(self) -> None:
+        # 호출자가 lock을 잡은 상태여야 한다. 오래된 완료 작업부터 정리
+        finished = [job for job in self._jobs.values() if not job.active]
+        overflow = len(finished) - CLASSIFY_JOB_HISTORY
+        for job in sorted(finished, key=lambda job: job.created_at)[:max(overflow, 0)]:
+            del self._jobs[job.id]
+
+    def _register(self, user_id: int, use_llm: bool, chunk_size: int) -> tuple[ClassifyJob, bool]:
+        with self._lock:
+            active_id = self._active_by_user.get(user_id)
+            if active_id is not None:
+                return self._jobs[active_id], False
+
+            job = ClassifyJob(user_id, use_llm, chunk_size)
+            self._jobs[job.id] = job
+            self._active_by_user[user_id] = job.id
+            self._prune()
+        return job, True
+
+    def _run(self, job: ClassifyJob) -> None:
+        try:
+            with Session(self.engine) as session:
+                self._execute(job, session)
+        except Exception:
+            pass  # _execute에서 작업 상태에 기록됨
+
+    def _execute(self, job: ClassifyJob, session: Session) -> None:
+        def on_progress(rows_done: int) -> None:
+            job.rows_done = rows_done
+
+        status = "failed"
+        try:
+            job.mark_running(count_unclassified(session, job.user_id))
+            job.result = classify_all_unclassified(
+                session,
+                user_id=job.user_id,
+                use_llm=job.use_llm,
+                chunk_size=job.chunk_size,
+                on_progress=on_progress,
+            )
+            status = "succeeded"
+        except Exception as e:
+            logger.error(f"분류 작업 실패: {job.id}: {e}")
+            job.error = str(e)
+            raise
+        finally:
+            job.mark_finished(status)
+            with self._lock:
+                self._active_by_user.pop(job.user_id, None)
+
+        logger.info(
+            f"분류 작업 종료: {job.id} ({job.status}, {job.rows_done}건, "
+            f"{job.throughput:,.0f}건/초)"
+        )
+
+
+_job_manager: ClassifyJobManager | None = None
+_job_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> ClassifyJobManager:
+    """프로세스 공용 작업 관리자 조회 (최초 호출 시 생성)"""
+    global _job_manager
+    with _job_manager_lock:
+        if _job_manager is None:
+            from db import engine
+
+            _job_manager = ClassifyJobManager(engine)
+        return _job_manager
+
+
+def set_job_manager(manager: ClassifyJobManager | None) -> None:
+    """작업 관리자 교체 (테스트용)"""
+    global _job_manager
+    with _job_manager_lock:
+        _job_manager = manager
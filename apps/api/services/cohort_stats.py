@@ -0,0 +1,365 @@
+"""
+코호트(도시/채널/결제 수단) 지출 통계
+
+"같은 도시 다른 학생들과 비교"처럼 여러 사용자를 가로지르는 통계는 요청마다 계산할 수 없으므로
+배치 작업으로 cohort_stat 테이블에 미리 만들어 두고, 조회는 그 행만 읽는다.
+
+- 코호트: (기준, 값) - all(전체 사용자), city, channel, payment_type
+- 통계: (코호트, 월, 카테고리)별로 지출이 있는 사용자들의 월 지출 합계 분포 (p25/p50/p75/p90)
+- 계산: 사용자를 id 구간으로 나눠 프로세스 풀에서 구간별 분포 스케치(services.spend_sketch)를 만들고
+  부모 프로세스에서 합친다 (스케치는 합칠 수 있으므로 결과가 작업자 수와 무관)
+- COHORT_MIN_USERS명 미만인 코호트는 저장하지 않는다 (개인 지출이 드러나지 않도록)
+
+배치 실행 (apps/api에서, DATABASE_URL의 DB 사용):
+    python -m services.cohort_stats --workers 4
+    python -m services.cohort_stats --workers 1 2 4 8   # 작업자 수별 소요 시간 비교 (마지막 결과 저장)
+"""
+
+import argparse
+import calendar
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import String, cast, delete, insert
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, create_engine, func, select
+
+from models.cohort_stat import CohortStat
+from models.daily_spend import UNCLASSIFIED
+from models.transaction import Transaction
+from services.spend_sketch import QuantileSketch
+
+logger = logging.getLogger(__name__)
+
+# 저장할 최소 코호트 사용자 수
+COHORT_MIN_USERS = int(os.getenv("COHORT_MIN_USERS", "5"))
+
+COHORT_DIMENSIONS = ("all", "city", "channel", "payment_type")
+COHORT_QUANTILES = (0.25, 0.5, 0.75, 0.9)
+
+# 카테고리 전체 합계 행의 category 값
+TOTAL_CATEGORY = "*"
+
+CohortKey = tuple[str, str, str, str]  # (dimension, value, month, category)
+
+_worker_engines: dict[str, Engine] = {}
+
+
+def cohort_sketches(rows: list[tuple]) -> dict[CohortKey, QuantileSketch]:
+    """
+    거래 합계 행 → 코호트 키별 사용자 월 지출 분포 스케치
+
+    Args:
+        rows: [(user_id, 월 또는 날짜, category, city, channel, payment_type, amount)]
+              (같은 사용자의 행은 모두 같은 rows에 있어야 함)
+    """
+    frame = pd.DataFrame(
+        rows, columns=["user_id", "date", "category", "city", "channel", "payment_type", "amount"]
+    )
+    sketches: dict[CohortKey, QuantileSketch] = {}
+    if frame.empty:
+        return sketches
+
+    frame["month"] = frame["date"].str[:7]
+    frame["category"] = frame["category"].fillna(UNCLASSIFIED)
+    frame["all"] = ""
+    totals = frame.assign(category=TOTAL_CATEGORY)
+
+    for dimension in COHORT_DIMENSIONS:
+        for source in (frame, totals):
+            per_user = source.groupby([dimension, "month", "category", "user_id"])["amount"].sum()
+            for (value, month, category), amounts in per_user.groupby(level=[0, 1, 2]):
+                sketch = QuantileSketch()
+                sketch.add_many(amounts.to_numpy())
+                sketches[(dimension, value, month, category)] = sketch
+    return sketches
+
+
+def _init_worker() -> None:
+    # fork로 물려받은 부모 엔진의 연결은 쓰지 않는다 (부모 쪽 연결은 닫지 않고 버림)
+    for engine in _worker_engines.values():
+        engine.dispose(close=False)
+    _worker_engines.clear()
+
+
+def _engine_for(database_url: str) -> Engine:
+    # 프로세스마다 URL당 엔진 하나
+    engine = _worker_engines.get(database_url)
+    if engine is None:
+        connect_args = {"check_same_thread": False} if database_url.startswith("sqlite") else {}
+        engine = _worker_engines[database_url] = create_engine(database_url, connect_args=connect_args)
+    return engine
+
+
+def _partition_sketches(database_url: str, low_id: int, high_id: int) -> tuple[dict[CohortKey, bytes], int, float]:
+    """사용자 id 구간 하나 계산 (작업자 프로세스에서 실행, 결과는 직렬화된 스케치)"""
+    started = time.perf_counter()
+    # 월 단위로 DB에서 먼저 합친다 (SQLite/PostgreSQL 모두 DATE → 'YYYY-MM-DD' 문자열)
+    month = func.substr(cast(Transaction.date, String), 1, 7)
+    columns = (
+        Transaction.user_id,
+        month,
+        Transaction.category,
+        Transaction.city,
+        Transaction.channel,
+        Transaction.payment_type,
+    )
+    statement = (
+        select(*columns, func.sum(Transaction.amount_krw))
+        .where(Transaction.user_id >= low_id, Transaction.user_id <= high_id)
+        .group_by(*columns)
+    )
+    with Session(_engine_for(database_url)) as session:
+        rows = session.exec(statement).all()
+    sketches = {key: sketch.to_bytes() for key, sketch in cohort_sketches(rows).items()}
+    return sketches, len(rows), time.perf_counter() - started
+
+
+def user_partitions(session: Session, parts: int) -> list[tuple[int, int]]:
+    """거래가 있는 사용자를 id 순으로 parts개 구간 [low, high]로 나누기"""
+    user_ids = session.exec(select(Transaction.user_id).distinct().order_by(Transaction.user_id)).all()
+    if not user_ids:
+        return []
+    return [
+        (int(chunk[0]), int(chunk[-1]))
+        for chunk in np.array_split(np.asarray(user_ids, dtype=np.int64), min(parts, len(user_ids)))
+        if len(chunk)
+    ]
+
+
+def compute_cohort_sketches(database_url: str, workers: int = 1) -> tuple[dict[CohortKey, QuantileSketch], dict]:
+    """
+    전체 사용자 코호트 스케치 계산
+
+    Args:
+        database_url: DB URL (작업자 프로세스가 직접 연결)
+        workers: 프로세스 수 (1이면 현재 프로세스에서 실행)
+
+    Returns:
+        (코호트 키별 스케치, 소요 시간 정보)
+    """
+    started = time.perf_counter()
+    with Session(_engine_for(database_url)) as session:
+        # 작업자 수보다 잘게 나눠 구간 크기 차이로 한 작업자만 오래 걸리는 것을 줄인다
+        partitions = user_partitions(session, max(workers, 1) * 4)
+
+    if workers <= 1:
+        results = [_partition_sketches(database_url, low, high) for low, high in partitions]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            results = list(
+                executor.map(
+                    _partition_sketches,
+                    [database_url] * len(partitions),
+                    [low for low, _ in partitions],
+                    [high for _, high in partitions],
+                )
+            )
+    computed = time.perf_counter()
+
+    merged: dict[CohortKey, QuantileSketch] = {}
+    for sketches, _, _ in results:
+        for key, data in sketches.items():
+            sketch = QuantileSketch.from_bytes(data)
+            if key in merged:
+                merged[key].merge(sketch)
+            else:
+                merged[key] = sketch
+    finished = time.perf_counter()
+
+    timing = {
+        "workers": workers,
+        "partitions": len(partitions),
+        "rows": sum(rows for _, rows, _ in results),
+        "compute_seconds": computed - started,
+        "merge_seconds": finished - computed,
+        "partition_seconds": sum(seconds for _, _, seconds in results),
+        "total_seconds": finished - started,
+    }
+    return merged, timing
+
+
+def write_cohort_stats(
+    session: Session,
+    sketches: dict[CohortKey, QuantileSketch],
+    min_users: int = COHORT_MIN_USERS,
+) -> int:
+    """
+    cohort_stat 테이블 전체 교체 (커밋은 호출자가, 커밋 전까지는 이전 통계가 보인다)
+
+    Returns:
+        저장한 행 수
+    """
+    computed_at = datetime.utcnow()
+    rows = []
+    for (dimension, value, month, category), sketch in sketches.items():
+        if sketch.count < min_users:
+            continue
+        p25, p50, p75, p90 = sketch.quantiles(COHORT_QUANTILES)
+        rows.append(
+            {
+                "dimension": dimension,
+                "value": value,
+                "month": month,
+                "category": category,
+                "user_count": sketch.count,
+                "p25": p25,
+                "p50": p50,
+                "p75": p75,
+                "p90": p90,
+                "sketch": sketch.to_bytes(),
+                "computed_at": computed_at,
+            }
+        )
+    connection = session.connection()
+    connection.execute(delete(CohortStat.__table__))
+    if rows:
+        connection.execute(insert(CohortStat.__table__), rows)
+    return len(rows)
+
+
+def _month_bounds(month: str) -> tuple[str, str]:
+    year, month_number = (int(part) for part in month.split("-"))
+    return f"{month}-01", f"{month}-{calendar.monthrange(year, month_number)[1]:02d}"
+
+
+def cohort_comparison(
+    session: Session,
+    user_id: int,
+    month: str,
+    dimension: str = "city",
+    value: str | None = None,
+) -> dict:
+    """
+    사용자의 월 지출을 코호트 분포와 비교
+
+    Args:
+        session: DB 세션
+        user_id: 사용자 ID
+        month: 월 (YYYY-MM)
+        dimension: 코호트 기준 (all | city | channel | payment_type)
+        value: 기준 값 (None이면 그 달 사용자 거래에서 가장 많은 값)
+
+    Returns:
+        {
+            "month", "dimension", "value", "computed_at",
+            "categories": [{category, amount, user_count, p25, p50, p75, p90, percentile}]
+                - amount: 사용자의 (그 코호트 거래) 월 지출, percentile: 코호트 내 위치 (0~100)
+                - 카테고리 전체 합계는 category '전체'
+        }
+    """
+    if dimension not in COHORT_DIMENSIONS:
+        raise ValueError(f"지원하지 않는 코호트 기준입니다: {dimension}")
+
+    start, end = _month_bounds(month)
+    conditions = [
+        Transaction.user_id == user_id,
+        Transaction.date >= start,
+        Transaction.date <= end,
+    ]
+    if dimension == "all":
+        value = ""
+    else:
+        column = getattr(Transaction, dimension)
+        if value is None:
+            value = session.exec(
+                select(column)
+                .where(*conditions)
+                .group_by(column)
+                .order_by(func.count().desc(), column)
+                .limit(1)
+            ).first()
+        conditions.append(column == value)
+
+    amounts = {
+        category or UNCLASSIFIED: amount
+        for category, amount in session.exec(
+            select(Transaction.category, func.sum(Transaction.amount_krw))
+            .where(*conditions)
+            .group_by(Transaction.category)
+        )
+    }
+    amounts[TOTAL_CATEGORY] = sum(amounts.values())
+
+    stats = session.exec(
+        select(CohortStat)
+        .where(CohortStat.dimension == dimension, CohortStat.value == value, CohortStat.month == month)
+        .order_by(CohortStat.user_count.desc(), CohortStat.category)
+    ).all()
+
+    categories = []
+    for stat in stats:
+        amount = amounts.get(stat.category, 0)
+        rank = QuantileSketch.from_bytes(stat.sketch).rank(amount) if amount else 0.0
+        categories.append(
+            {
+                "category": {TOTAL_CATEGORY: "전체", UNCLASSIFIED: "미분류"}.get(stat.category, stat.category),
+                "amount": amount,
+                "user_count": stat.user_count,
+                "p25": stat.p25,
+                "p50": stat.p50,
+                "p75": stat.p75,
+                "p90": stat.p90,
+                "percentile": rank * 100 if rank is not None else None,
+            }
+        )
+
+    return {
+        "month": month,
+        "dimension": dimension,
+        "value": value,
+        "computed_at": stats[0].computed_at if stats else None,
+        "categories": categories,
+    }
+
+
+def _print_timing(timings: list[dict]) -> None:
+    baseline = timings[0]["compute_seconds"]
+    print(f"{'workers':>7} {'partitions':>10} {'rows':>10} {'compute(s)':>10} {'merge(s)':>9} {'speedup':>8}")
+    for timing in timings:
+        speedup = baseline / timing["compute_seconds"] if timing["compute_seconds"] else 0.0
+        print(
+            f"{timing['workers']:>7} {timing['partitions']:>10} {timing['rows']:>10,} "
+            f"{timing['compute_seconds']:>10.2f} {timing['merge_seconds']:>9.2f} {speedup:>7.2f}x"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="코호트 지출 통계 배치 작업")
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[os.cpu_count() or 1],
+        help="프로세스 수 (여러 개면 각각 실행해 소요 시간 비교, 마지막 결과 저장)",
+    )
+    parser.add_argument("--min-users", type=int, default=COHORT_MIN_USERS, help="저장할 최소 코호트 사용자 수")
+    parser.add_argument("--dry-run", action="store_true", help="계산만 하고 저장하지 않음")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    from db import DATABASE_URL, create_db_and_tables, engine
+
+    create_db_and_tables()
+
+    timings = []
+    sketches: dict[CohortKey, QuantileSketch] = {}
+    for workers in args.workers:
+        sketches, timing = compute_cohort_sketches(DATABASE_URL, workers)
+        timings.append(timing)
+    _print_timing(timings)
+
+    if args.dry_run:
+        print(f"코호트 {len(sketches)}개 계산 (저장 안 함)")
+        return
+    started = time.perf_counter()
+    with Session(engine) as session:
+        rows = write_cohort_stats(session, sketches, min_users=args.min_users)
+        session.commit()
+    print(f"코호트 통계 저장: {rows}행 / {len(sketches)}개 ({time.perf_counter() - started:.2f}초)")
+
+
+if __name__ == "__main__":
+    main()
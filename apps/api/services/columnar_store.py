@@ -0,0 +1,327 @@
+"""
+사용자별 컬럼형 거래 저장소 (선택 기능)
+
+자주 조회하는 사용자의 거래를 NumPy 배열 몇 개로 메모리에 들고 있으면서
+집계를 벡터 연산(np.bincount, np.minimum.at)으로 계산한다.
+
+- 컬럼: 거래 id, 날짜 서수(date.toordinal), 금액, 카테고리 코드, 가맹점 코드 (id 순)
+- 최초 조회 시 DB에서 만들고, 업로드/분류는 같은 프로세스에서 증분 반영
+- 사용자 데이터 버전(services.aggregate_cache)이 예상과 다르면 (다른 프로세스의 변경 등)
+  다음 조회 때 다시 만든다
+- 전체 메모리 예산(COLUMNAR_STORE_MB)을 넘으면 오래 안 쓴 사용자부터 제거
+
+COLUMNAR_STORE_MB=0(기본)이면 사용하지 않는다.
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
+from datetime import date
+
+import numpy as np
+import pandas as pd
+from sqlmodel import Session, select
+
+from models.transaction import Transaction
+from services.aggregate_cache import get_user_data_version
+
+logger = logging.getLogger(__name__)
+
+# 컬럼 저장소 메모리 예산 (0이면 사용 안 함)
+COLUMNAR_STORE_MB = float(os.getenv("COLUMNAR_STORE_MB", "0"))
+
+# 집계 결과에서 미분류 거래의 카테고리 이름
+UNCLASSIFIED_LABEL = "미분류"
+
+
+class CodeBook:
+    """문자열 ↔ 정수 코드"""
+
+    def __init__(self, values: Sequence[str] = ()):
+        self.values: list[str] = list(values)
+        self.codes: dict[str, int] = {value: code for code, value in enumerate(self.values)}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def encode(self, values: Sequence[str]) -> np.ndarray:
+        """코드 배열 (처음 보는 값은 새 코드 부여)"""
+        codes = np.empty(len(values), dtype=np.int32)
+        for index, value in enumerate(values):
+            code = self.codes.get(value)
+            if code is None:
+                code = self.codes[value] = len(self.values)
+                self.values.append(value)
+            codes[index] = code
+        return codes
+
+
+class UserColumns:
+    """한 사용자의 거래 컬럼 (id 오름차순)"""
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        date_ordinals: np.ndarray,
+        amounts: np.ndarray,
+        category_codes: np.ndarray,
+        merchant_codes: np.ndarray,
+        categories: CodeBook,
+        merchants: CodeBook,
+        version: tuple[int, int],
+    ):
+        self.ids = ids
+        self.date_ordinals = date_ordinals
+        self.amounts = amounts
+        self.category_codes = category_codes
+        self.merchant_codes = merchant_codes
+        self.categories = categories
+        self.merchants = merchants
+        self.version = version
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def snapshot(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (날짜 서수, 금액, 카테고리 코드, 가맹점 코드) 배열
+
+        증분 반영은 배열을 새로 만들어 교체하므로 받아 간 배열은 바뀌지 않는다.
+        """
+        with self._lock:
+            return self.date_ordinals, self.amounts, self.category_codes, self.merchant_codes
+
+    @property
+    def nbytes(self) -> int:
+        """배열 메모리 + 코드북 대략치"""
+        arrays = (self.ids, self.date_ordinals, self.amounts, self.category_codes, self.merchant_codes)
+        strings = sum(len(value) * 4 + 64 for value in self.merchants.values)
+        return sum(array.nbytes for array in arrays) + strings
+
+    @classmethod
+    def from_rows(
+        cls,
+        ids: Sequence[int],
+        dates: Sequence[str],
+        amounts: Sequence[float],
+        categories: Sequence[str | None],
+        merchants: Sequence[str],
+        version: tuple[int, int],
+    ) -> "UserColumns":
+        """거래 행 목록에서 생성 (id 오름차순이어야 함)"""
+        category_codes, category_values = pd.factorize(
+            np.array([category_label(value) for value in categories], dtype=object)
+        )
+        merchant_codes, merchant_values = pd.factorize(np.array(merchants, dtype=object))
+        return cls(
+            ids=np.asarray(ids, dtype=np.int64),
+            date_ordinals=encode_dates(dates),
+            amounts=np.asarray(amounts, dtype=np.float64),
+            category_codes=category_codes.astype(np.int32),
+            merchant_codes=merchant_codes.astype(np.int32),
+            categories=CodeBook(category_values),
+            merchants=CodeBook(merchant_values),
+            version=version,
+        )
+
+    def append(self, transactions: Sequence[Transaction], version: tuple[int, int]) -> None:
+        """
+        새로 저장된 거래 추가
+
+        커밋 후 버전을 올리기 전에 다른 요청이 DB에서 다시 만든 경우 이미 들어 있는 거래가 올 수 있다.
+        id는 늘어나기만 하므로 마지막 id 이하는 건너뛴다.
+        """
+        ids = np.array([txn.id for txn in transactions], dtype=np.int64)
+        date_ordinals = encode_dates([txn.date for txn in transactions])
+        amounts = np.array([txn.amount_krw for txn in transactions], dtype=np.float64)
+        with self._lock:
+            if len(self.ids):
+                new = ids > self.ids[-1]
+                if not new.all():
+                    ids, date_ordinals, amounts = ids[new], date_ordinals[new], amounts[new]
+                    transactions = [txn for txn, keep in zip(transactions, new.tolist()) if keep]
+            category_codes = self.categories.encode([category_label(txn.category) for txn in transactions])
+            merchant_codes = self.merchants.encode([txn.merchant for txn in transactions])
+            self.ids = np.concatenate([self.ids, ids])
+            self.date_ordinals = np.concatenate([self.date_ordinals, date_ordinals])
+            self.amounts = np.concatenate([self.amounts, amounts])
+            self.category_codes = np.concatenate([self.category_codes, category_codes])
+            self.merchant_codes = np.concatenate([self.merchant_codes, merchant_codes])
+            self.version = version
+
+    def set_categories(self, ids: Sequence[int], categories: Sequence[str], version: tuple[int, int]) -> None:
+        """재분류된 거래의 카테고리 변경"""
+        with self._lock:
+            positions = np.searchsorted(self.ids, np.asarray(ids, dtype=np.int64))
+            # 집계 중인 다른 요청이 보던 배열은 그대로 두고 새 배열로 교체
+            category_codes = self.category_codes.copy()
+            category_codes[positions] = self.categories.encode(
+                [category_label(value) for value in categories]
+            )
+            self.category_codes = category_codes
+            self.version = version
+
+
+def category_label(category: str | None) -> str:
+    """집계 결과에 쓰는 카테고리 이름 (미분류 → '미분류')"""
+    return category or UNCLASSIFIED_LABEL
+
+
+def encode_dates(dates: Sequence[str]) -> np.ndarray:
+    """YYYY-MM-DD 목록 → 날짜 서수 배열 (고유 날짜만 파싱)"""
+    codes, uniques = pd.factorize(np.array(dates, dtype=object))
+    ordinals = np.array([date.fromisoformat(value).toordinal() for value in uniques], dtype=np.int32)
+    return ordinals[codes]
+
+
+class ColumnarStore:
+    """메모리 예산 안에서 사용자별 UserColumns를 LRU로 보관"""
+
+    def __init__(self, budget_bytes: int):
+        self.budget_bytes = budget_bytes
+        self._users: OrderedDict[int, UserColumns] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.builds = 0
+        self.evictions = 0
+
+    def get(self, session: Session, user_id: int) -> UserColumns:
+        """
+        사용자 컬럼 조회 (없거나 버전이 다르면 DB에서 생성)
+
+        반환된 컬럼은 읽기 전용으로 다뤄야 한다.
+        """
+        version = get_user_data_version(user_id)
+        with self._lock:
+            columns = self._users.get(user_id)
+            if columns is not None and columns.version == version:
+                self._users.move_to_end(user_id)
+                self.hits += 1
+                return columns
+
+        columns = self._build(session, user_id, version)
+        with self._lock:
+            self.builds += 1
+            self._users[user_id] = columns
+            self._users.move_to_end(user_id)
+            self._evict()
+        return columns
+
+    def _build(self, session: Session, user_id: int, version: tuple[int, int]) -> UserColumns:
+        rows = session.exec(
+            select(
+                Transaction.id,
+                Transaction.date,
+                Transaction.amount_krw,
+                Transaction.category,
+                Transaction.merchant,
+            )
+            .where(Transaction.user_id == user_id)
+            .order_by(Transaction.id)
+        ).all()
+        ids, dates, amounts, categories, merchants = zip(*rows) if rows else ((),) * 5
+        columns = UserColumns.from_rows(ids, dates, amounts, categories, merchants, version)
+        logger.info(f"컬럼 저장소 생성: user_id={user_id}, {len(columns)}건, {columns.nbytes:,} bytes")
+        return columns
+
+    def _evict(self) -> None:
+        # 호출자가 lock을 잡은 상태여야 한다. 가장 최근 사용자 하나는 남긴다
+        total = sum(columns.nbytes for columns in self._users.values())
+        while total > self.budget_bytes and len(self._users) > 1:
+            _, columns = self._users.popitem(last=False)
+            total -= columns.nbytes
+            self.evictions += 1
+
+    def _update(self, user_id: int, previous: tuple[int, int], current: tuple[int, int] | None, apply) -> None:
+        # 이번 변경 하나만 반영하면 되는 경우(버전이 정확히 1 증가)에만 증분 반영, 아니면 제거
+        with self._lock:
+            columns = self._users.get(user_id)
+            if columns is None:
+                return
+            if (
+                current is not None
+                and columns.version == previous
+                and current == (previous[0], previous[1] + 1)
+            ):
+                apply(columns, current)
+            else:
+                del self._users[user_id]
+                return
+            self._evict()
+
+    def append(
+        self,
+        user_id: int,
+        transactions: Sequence[Transaction],
+        previous: tuple[int, int],
+        current: tuple[int, int] | None,
+    ) -> None:
+        """
+        업로드된 거래 반영
+
+        Args:
+            previous: 커밋 전 사용자 데이터 버전
+            current: 커밋 후 올린 사용자 데이터 버전
+        """
+        self._update(user_id, previous, current, lambda columns, version: columns.append(transactions, version))
+
+    def set_categories(
+        self,
+        user_id: int,
+        ids: Sequence[int],
+        categories: Sequence[str],
+        previous: tuple[int, int],
+        current: tuple[int, int] | None,
+    ) -> None:
+        """재분류 결과 반영 (인자는 append와 같음)"""
+        self._update(
+            user_id,
+            previous,
+            current,
+            lambda columns, version: columns.set_categories(ids, categories, version),
+        )
+
+    def stats(self) -> dict:
+        """저장소 통계"""
+        with self._lock:
+            return {
+                "users": len(self._users),
+                "rows": sum(len(columns) for columns in self._users.values()),
+                "bytes": sum(columns.nbytes for columns in self._users.values()),
+                "budget_bytes": self.budget_bytes,
+                "hits": self.hits,
+                "builds": self.builds,
+                "evictions": self.evictions,
+            }
+
+
+_columnar_store: ColumnarStore | None = None
+_columnar_store_loaded = False
+_columnar_store_lock = threading.Lock()
+
+
+def get_columnar_store() -> ColumnarStore | None:
+    """
+    프로세스 공용 컬럼 저장소 조회
+
+    Returns:
+        저장소 (COLUMNAR_STORE_MB가 0이면 None)
+    """
+    global _columnar_store, _columnar_store_loaded
+    with _columnar_store_lock:
+        if not _columnar_store_loaded:
+            if COLUMNAR_STORE_MB > 0:
+                _columnar_store = ColumnarStore(int(COLUMNAR_STORE_MB * 1024 * 1024))
+            _columnar_store_loaded = True
+        return _columnar_store
+
+
+def set_columnar_store(store: ColumnarStore | None) -> None:
+    """컬럼 저장소 교체 (테스트용, None이면 사용 안 함)"""
+    global _columnar_store, _columnar_store_loaded
+    with _columnar_store_lock:
+        _columnar_store = store
+        _columnar_store_loaded = True
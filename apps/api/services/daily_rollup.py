@@ -0,0 +1,260 @@
+"""
+일별 지출 롤업 (daily_spend) 관리
+
+집계 API가 원본 거래 대신 읽는 (user_id, date, category, merchant)별 합계/건수 테이블.
+거래 저장/재분류와 같은 DB 트랜잭션 안에서 증분(delta)으로 갱신하고,
+어긋났을 때는 원본 거래에서 다시 계산한다.
+금액 분포 스케치(services.spend_sketch)도 같은 증분으로 함께 갱신/재계산한다.
+
+전체 재계산 (apps/api에서, DATABASE_URL의 DB 사용):
+    python -m services.daily_rollup rebuild
+    python -m services.daily_rollup rebuild --user-id 1
+"""
+
+import argparse
+import logging
+from collections.abc import Iterable
+
+import pandas as pd
+from sqlalchemy import String, case, cast, delete, func, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, select
+
+from models.daily_spend import UNCLASSIFIED, DailySpend
+from models.spend_sketch import SpendSketch
+from models.transaction import Transaction
+from services.aggregate_cache import bump_user_data_version
+from services.spend_sketch import (
+    QuantileSketch,
+    SketchKey,
+    apply_sketch_deltas,
+    build_sketches,
+    rebuild_spend_sketches,
+    sketch_keys,
+)
+
+logger = logging.getLogger(__name__)
+
+RollupKey = tuple[int, str, str, str]  # (user_id, date, category, merchant)
+
+
+class RollupDelta:
+    """
+    롤업 증분 모음
+
+    같은 키의 변경은 합쳐서 키당 한 번만 upsert한다.
+    """
+
+    def __init__(self):
+        self._deltas: dict[RollupKey, list] = {}
+        self.sketches: dict[SketchKey, QuantileSketch] = {}
+
+    def __len__(self) -> int:
+        return len(self._deltas)
+
+    def add(
+        self,
+        user_id: int,
+        date: str,
+        category: str | None,
+        merchant: str,
+        amount: float,
+        count: int = 1,
+        first_id: int | None = None,
+    ) -> None:
+        """
+        키에 금액/건수 더하기 (빼려면 음수)
+
+        Args:
+            count: 거래 건수 (분포 스케치에는 건당 amount / count 금액으로 반영)
+            first_id: 더해지는 거래 ID (빼는 경우 None)
+        """
+        self._add_total((user_id, date, category or UNCLASSIFIED, merchant), amount, count, first_id)
+        if count:
+            for sketch_key in sketch_keys(user_id, date, category, merchant):
+                self._sketch(sketch_key).add(amount / count, count)
+
+    def add_transactions(self, transactions: Iterable[Transaction]) -> None:
+        """
+        새로 저장된 거래 반영 (flush 후 id가 있어야 함)
+
+        키별 합계와 분포 스케치를 pandas로 묶어 한 번에 더한다.
+        """
+        frame = pd.DataFrame(
+            [
+                (txn.id, txn.user_id, txn.date, txn.category, txn.merchant, txn.amount_krw)
+                for txn in transactions
+            ],
+            columns=["id", "user_id", "date", "category", "merchant", "amount"],
+        )
+        if frame.empty:
+            return
+
+        totals = (
+            frame.assign(category=frame["category"].fillna(UNCLASSIFIED))
+            .groupby(["user_id", "date", "category", "merchant"], sort=False)
+            .agg(amount=("amount", "sum"), count=("id", "size"), first_id=("id", "min"))
+            .reset_index()
+        )
+        for user_id, date, category, merchant, amount, count, first_id in zip(
+            *(totals[column].tolist() for column in totals.columns)
+        ):
+            self._add_total((user_id, date, category, merchant), amount, count, first_id)
+
+        for sketch_key, sketch in build_sketches(frame).items():
+            if sketch_key in self.sketches:
+                self.sketches[sketch_key].merge(sketch)
+            else:
+                self.sketches[sketch_key] = sketch
+
+    def _add_total(self, key: RollupKey, amount: float, count: int, first_id: int | None) -> None:
+        delta = self._deltas.setdefault(key, [0.0, 0, None])
+        delta[0] += amount
+        delta[1] += count
+        if first_id is not None and (delta[2] is None or first_id < delta[2]):
+            delta[2] = first_id
+
+    def _sketch(self, key: SketchKey) -> QuantileSketch:
+        sketch = self.sketches.get(key)
+        if sketch is None:
+            sketch = self.sketches[key] = QuantileSketch()
+        return sketch
+
+    def rows(self) -> list[dict]:
+        return [
+            {
+                "user_id": user_id,
+                "date": date,
+                "category": category,
+                "merchant": merchant,
+                "amount_sum": amount,
+                "txn_count": count,
+                # 빼기만 있는 키는 기존 first_id를 유지하도록 가장 큰 값으로
+                "first_id": first_id if first_id is not None else 2**62,
+            }
+            for (user_id, date, category, merchant), (amount, count, first_id) in self._deltas.items()
+        ]
+
+
+def apply_rollup_delta(session: Session, delta: RollupDelta) -> None:
+    """
+    롤업 증분을 현재 세션의 트랜잭션 안에서 upsert (커밋은 호출자가)
+
+    건수가 0이 된 키는 삭제한다. 분포 스케치도 함께 반영한다.
+    """
+    if not len(delta):
+        return
+    apply_sketch_deltas(session, delta.sketches)
+
+    connection = session.connection()
+    dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+    table = DailySpend.__table__
+    statement = dialect.insert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.date, table.c.category, table.c.merchant],
+        set_={
+            "amount_sum": table.c.amount_sum + statement.excluded.amount_sum,
+            "txn_count": table.c.txn_count + statement.excluded.txn_count,
+            "first_id": case(
+                (statement.excluded.first_id < table.c.first_id, statement.excluded.first_id),
+                else_=table.c.first_id,
+            ),
+        },
+    )
+    rows = delta.rows()
+    connection.execute(statement, rows)
+
+    user_ids = {row["user_id"] for row in rows}
+    connection.execute(
+        delete(table).where(table.c.user_id.in_(user_ids), table.c.txn_count <= 0)
+    )
+
+
+def rebuild_daily_spend(session: Session, user_id: int | None = None) -> int:
+    """
+    원본 거래에서 롤업과 분포 스케치 다시 계산 (커밋은 호출자가)
+
+    Args:
+        session: DB 세션
+        user_id: 사용자 ID (None이면 전체)
+
+    Returns:
+        생성된 롤업 행 수
+    """
+    table = DailySpend.__table__
+    category = func.coalesce(Transaction.category, UNCLASSIFIED)
+    # 거래 날짜는 DATE, 롤업 날짜는 'YYYY-MM-DD' 문자열
+    day = cast(Transaction.date, String)
+    source = select(
+        Transaction.user_id,
+        day,
+        category,
+        Transaction.merchant,
+        func.sum(Transaction.amount_krw),
+        func.count(),
+        func.min(Transaction.id),
+    ).group_by(Transaction.user_id, day, category, Transaction.merchant)
+
+    clear = delete(table)
+    if user_id is not None:
+        source = source.where(Transaction.user_id == user_id)
+        clear = clear.where(table.c.user_id == user_id)
+
+    connection = session.connection()
+    connection.execute(clear)
+    connection.execute(
+        insert(table).from_select(
+            ["user_id", "date", "category", "merchant", "amount_sum", "txn_count", "first_id"],
+            source,
+        )
+    )
+
+    rebuild_spend_sketches(session, user_id=user_id)
+
+    count_statement = select(func.count()).select_from(table)
+    if user_id is not None:
+        count_statement = count_statement.where(table.c.user_id == user_id)
+    return session.exec(count_statement).one()
+
+
+def ensure_daily_spend(engine: Engine) -> None:
+    """
+    롤업이나 분포 스케치가 비어 있는데 거래가 있으면 (도입 전 DB) 한 번 다시 계산
+    """
+    with Session(engine) as session:
+        has_rollup = (
+            session.exec(select(DailySpend.user_id).limit(1)).first() is not None
+            and session.exec(select(SpendSketch.user_id).limit(1)).first() is not None
+        )
+        has_transactions = session.exec(select(Transaction.id).limit(1)).first() is not None
+        if has_rollup or not has_transactions:
+            return
+
+        rows = rebuild_daily_spend(session)
+        session.commit()
+    logger.info(f"일별 롤업 초기 생성: {rows}행")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="일별 지출 롤업 관리")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    rebuild = subcommands.add_parser("rebuild", help="원본 거래에서 롤업 다시 계산")
+    rebuild.add_argument("--user-id", type=int, default=None, help="특정 사용자만")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    from db import create_db_and_tables, engine
+    from models.user import User  # noqa: F401 (테이블 등록)
+
+    create_db_and_tables()
+    with Session(engine) as session:
+        rows = rebuild_daily_spend(session, user_id=args.user_id)
+        session.commit()
+    # 공유 캐시 백엔드를 쓰는 서버라면 이전 집계 결과가 무효화된다
+    bump_user_data_version(args.user_id)
+    print(f"롤업 재계산 완료: {rows}행")
+
+
+if __name__ == "__main__":
+    main()
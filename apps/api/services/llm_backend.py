@@ -0,0 +1,349 @@
+"""
+LLM 분류 백엔드
+
+Rules engine이 분류하지 못한 거래(기타)를 LLM으로 다시 분류한다.
+
+- 여러 거래를 한 번의 호출로 묶는 마이크로 배치
+- 동시 호출 수 제한 (asyncio.Semaphore)
+- 호출별 타임아웃, 실패 시 rules 결과 유지
+- 정규화된 가맹점명 기준 영구 캐시 (llm_cache 테이블)
+
+백엔드는 LLMBackend 프로토콜만 맞추면 교체할 수 있다.
+오프라인 테스트용으로 StubLLMBackend(지연 시뮬레이션)와
+같은 규칙으로 응답하는 로컬 대체 서버(create_stub_llm_app)를 제공한다.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Protocol
+
+import httpx
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, select
+
+from models.llm_cache import LLMCacheEntry
+from services.category_rules import normalize_merchant
+
+logger = logging.getLogger(__name__)
+
+# LLM 백엔드 설정
+LLM_BACKEND = os.getenv("LLM_BACKEND", "stub")  # "stub" | "http"
+LLM_API_URL = os.getenv("LLM_API_URL", "http://localhost:8100/classify")
+LLM_BATCH_SIZE = int(os.getenv("LLM_BATCH_SIZE", "32"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "10"))
+
+
+def stub_llm_classify(merchant: str) -> dict:
+    """
+    LLM 분류 stub (deterministic)
+
+    Args:
+        merchant: 가맹점명
+
+    Returns:
+        {
+            "category": str,
+            "confidence": float,
+            "rationale": str
+        }
+    """
+    merchant_lower = merchant.lower()
+
+    if any(keyword in merchant_lower for keyword in ["학교", "대학", "university"]):
+        return {
+            "category": "교육",
+            "confidence": 0.8,
+            "rationale": "LLM: 가맹점명에 교육 관련 키워드 포함"
+        }
+    elif any(keyword in merchant_lower for keyword in ["병원", "약국", "pharmacy"]):
+        return {
+            "category": "의료/건강",
+            "confidence": 0.8,
+            "rationale": "LLM: 가맹점명에 의료 관련 키워드 포함"
+        }
+    elif any(keyword in merchant_lower for keyword in ["영화", "cgv", "롯데시네마", "메가박스"]):
+        return {
+            "category": "문화/여가",
+            "confidence": 0.85,
+            "rationale": "LLM: 영화관 관련 가맹점"
+        }
+    else:
+        return {
+            "category": "기타",
+            "confidence": 0.6,
+            "rationale": "LLM: 명확한 카테고리 판단 불가"
+        }
+
+
+class LLMBackend(Protocol):
+    """LLM 분류 백엔드 인터페이스"""
+
+    async def classify(self, items: list[dict]) -> list[dict]:
+        """
+        거래 묶음 분류
+
+        Args:
+            items: [{"merchant": str, "memo": str}]
+
+        Returns:
+            items와 같은 순서의 [{"category", "confidence", "rationale"}]
+        """
+        ...
+
+
+class StubLLMBackend:
+    """
+    stub 규칙으로 응답하는 가짜 백엔드
+
+    latency를 주면 호출마다 그만큼 대기해 실제 모델 왕복 시간을 흉내 낸다.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def classify(self, items: list[dict]) -> list[dict]:
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            return [stub_llm_classify(item["merchant"]) for item in items]
+        finally:
+            self.in_flight -= 1
+
+
+class HTTPLLMBackend:
+    """
+    HTTP LLM 서버 백엔드
+
+    POST {url} {"items": [...]} → {"results": [...]} 형식으로 호출한다.
+    transport를 넘기면 (예: httpx.ASGITransport) 네트워크 없이 테스트할 수 있다.
+    """
+
+    def __init__(self, url: str, transport: httpx.AsyncBaseTransport | None = None):
+        self.url = url
+        self.transport = transport
+
+    async def classify(self, items: list[dict]) -> list[dict]:
+        async with httpx.AsyncClient(transport=self.transport) as client:
+            response = await client.post(self.url, json={"items": items})
+            response.raise_for_status()
+            results = response.json()["results"]
+
+        if len(results) != len(items):
+            raise ValueError("LLM 응답 건수가 요청 건수와 다릅니다.")
+        return results
+
+
+def create_stub_llm_app():
+    """
+    로컬 대체 LLM 서버 (stub 규칙으로 응답)
+
+    사용법 (apps/api에서):
+        uvicorn "services.llm_backend:create_stub_llm_app" --factory --port 8100
+    """
+    from fastapi import FastAPI
+    from pydantic import BaseModel
+
+    class StubClassifyRequest(BaseModel):
+        items: list[dict]
+
+    app = FastAPI(title="Stub LLM Classifier")
+
+    @app.post("/classify")
+    async def classify(request: StubClassifyRequest):
+        return {"results": [stub_llm_classify(item.get("merchant", "")) for item in request.items]}
+
+    return app
+
+
+class LLMResultStore:
+    """LLM 분류 결과 영구 캐시 (llm_cache 테이블)"""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+
+    def get_many(self, merchants: Sequence[str]) -> dict[str, dict]:
+        """
+        캐시 조회
+
+        Args:
+            merchants: 정규화된 가맹점명 목록
+
+        Returns:
+            {가맹점명: {"category", "confidence", "rationale"}} (캐시에 있는 것만)
+        """
+        if not merchants:
+            return {}
+        with Session(self.engine) as session:
+            entries = session.exec(
+                select(LLMCacheEntry).where(LLMCacheEntry.merchant.in_(list(merchants)))
+            ).all()
+        return {
+            entry.merchant: {
+                "category": entry.category,
+                "confidence": entry.confidence,
+                "rationale": entry.rationale,
+            }
+            for entry in entries
+        }
+
+    def put_many(self, results: dict[str, dict]) -> None:
+        """
+        캐시 저장 (이미 있으면 덮어씀)
+
+        Args:
+            results: {정규화된 가맹점명: LLM 결과}
+        """
+        if not results:
+            return
+        with Session(self.engine) as session:
+            for merchant, result in results.items():
+                session.merge(
+                    LLMCacheEntry(
+                        merchant=merchant,
+                        category=result["category"],
+                        confidence=result["confidence"],
+                        rationale=result.get("rationale", ""),
+                    )
+                )
+            session.commit()
+
+
+class LLMClassifier:
+    """
+    배치/동시성/타임아웃/캐시를 적용한 LLM 분류기
+
+    같은 정규화 가맹점명은 한 번만 요청하고, 캐시에 없는 가맹점만
+    batch_size개씩 묶어 최대 max_concurrency개까지 동시에 호출한다.
+    """
+
+    def __init__(
+        self,
+        backend: LLMBackend,
+        store: LLMResultStore | None = None,
+        batch_size: int = LLM_BATCH_SIZE,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        timeout: float = LLM_TIMEOUT_SECONDS,
+    ):
+        if batch_size < 1 or max_concurrency < 1:
+            raise ValueError("batch_size와 max_concurrency는 1 이상이어야 합니다.")
+        self.backend = backend
+        self.store = store
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+
+    async def _classify_batch(
+        self, semaphore: asyncio.Semaphore, batch: list[dict]
+    ) -> list[dict] | None:
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(self.backend.classify(batch), self.timeout)
+            except TimeoutError:
+                logger.warning(f"LLM 호출 타임아웃 ({len(batch)}건, {self.timeout}s)")
+            except Exception as e:
+                logger.error(f"LLM 호출 실패 ({len(batch)}건): {e}")
+            return None
+
+    async def classify_many(self, items: Sequence[dict]) -> list[dict | None]:
+        """
+        거래 목록 LLM 분류
+
+        Args:
+            items: [{"merchant": str, "memo": str}]
+
+        Returns:
+            items와 같은 순서의 LLM 결과 (타임아웃/실패한 항목은 None)
+        """
+        keys = [normalize_merchant(item["merchant"]) for item in items]
+
+        # 1. 같은 가맹점은 한 번만 (첫 번째 거래를 대표로 요청)
+        representatives: dict[str, dict] = {}
+        for key, item in zip(keys, items):
+            representatives.setdefault(key, {"merchant": item["merchant"], "memo": item.get("memo", "")})
+
+        # 2. 영구 캐시 조회
+        resolved = self.store.get_many(list(representatives)) if self.store else {}
+        pending = [key for key in representatives if key not in resolved]
+
+        # 3. 캐시에 없는 가맹점만 배치로 나눠 동시 호출
+        if pending:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            batches = [
+                pending[start:start + self.batch_size]
+                for start in range(0, len(pending), self.batch_size)
+            ]
+            responses = await asyncio.gather(
+                *(
+                    self._classify_batch(semaphore, [representatives[key] for key in batch])
+                    for batch in batches
+                )
+            )
+
+            fresh: dict[str, dict] = {}
+            for batch, response in zip(batches, responses):
+                if response is not None:
+                    fresh.update(zip(batch, response))
+            if fresh and self.store:
+                self.store.put_many(fresh)
+            resolved.update(fresh)
+
+            logger.info(
+                f"LLM 분류: {len(items)}건 (고유 가맹점 {len(representatives)}개, "
+                f"호출 {len(batches)}회, 실패 {len(pending) - len(fresh)}개)"
+            )
+
+        return [resolved.get(key) for key in keys]
+
+    def classify_many_sync(self, items: Sequence[dict]) -> list[dict | None]:
+        """
+        동기 코드에서 classify_many 실행
+
+        이미 이벤트 루프가 돌고 있는 스레드에서 호출되면 별도 스레드에서 실행한다.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.classify_many(items))
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.classify_many(items)).result()
+
+
+_llm_classifier: LLMClassifier | None = None
+_llm_classifier_lock = threading.Lock()
+
+
+def get_llm_classifier() -> LLMClassifier:
+    """
+    설정(LLM_BACKEND 등)에 따른 LLM 분류기 조회 (최초 호출 시 생성)
+    """
+    global _llm_classifier
+    with _llm_classifier_lock:
+        if _llm_classifier is None:
+            from db import engine
+
+            backend: LLMBackend
+            if LLM_BACKEND == "http":
+                backend = HTTPLLMBackend(LLM_API_URL)
+            else:
+                backend = StubLLMBackend()
+            _llm_classifier = LLMClassifier(backend, store=LLMResultStore(engine))
+        return _llm_classifier
+
+
+def set_llm_classifier(classifier: LLMClassifier | None) -> None:
+    """LLM 분류기 교체 (테스트/벤치마크용, None이면 다음 조회 때 설정대로 다시 생성)"""
+    global _llm_classifier
+    with _llm_classifier_lock:
+        _llm_classifier = classifier
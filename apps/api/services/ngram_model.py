@@ -0,0 +1,338 @@
+"""
+문자 n-gram 분류 모델
+
+Rules engine이 분류하지 못한 거래를 LLM 이전에 분류하는 학습 모델 단계.
+
+- 특징: 정규화된 가맹점명 + 메모의 문자 n-gram 해싱 (HashingVectorizer, 상태 없음)
+- 모델: 다항 로지스틱 회귀, 검토 완료된 거래로 오프라인 학습
+  (모델/LLM이 정한 카테고리는 제외해 모델이 자기 예측을 다시 학습하지 않게 한다)
+- 아티팩트: 디렉터리에 coef.npy / intercept.npy / meta.json 저장
+  coef.npy는 mmap으로 열어 여러 워커 프로세스가 같은 페이지 캐시를 공유한다
+
+학습 (apps/api에서, DATABASE_URL의 DB 사용):
+    python -m services.ngram_model train --out data/ngram_model
+"""
+
+import argparse
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Sequence
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import LogisticRegression
+from sqlmodel import Session, select
+
+from models.transaction import Transaction
+from services.category_rules import normalize_memo, normalize_merchant
+from services.classification_cache import ClassificationCache
+
+logger = logging.getLogger(__name__)
+
+# 모델 아티팩트 경로와 채택 기준
+NGRAM_MODEL_PATH = Path(
+    os.getenv("NGRAM_MODEL_PATH", str(Path(__file__).parent.parent / "data" / "ngram_model"))
+)
+NGRAM_MIN_CONFIDENCE = float(os.getenv("NGRAM_MIN_CONFIDENCE", "0.7"))
+NGRAM_CACHE_SIZE = int(os.getenv("NGRAM_CACHE_SIZE", "65536"))
+
+# 학습에 쓰는 카테고리 출처 (CategorySource 값, 쉼표 구분)
+NGRAM_TRAINING_SOURCES = tuple(
+    source.strip() for source in os.getenv("NGRAM_TRAINING_SOURCES", "manual,rule").split(",")
+)
+
+# 특징 설정 (학습/예측이 같은 값을 써야 하므로 meta.json에도 저장)
+DEFAULT_N_FEATURES = 2**18
+DEFAULT_NGRAM_RANGE = (2, 4)
+
+
+def build_vectorizer(n_features: int, ngram_range: tuple[int, int]) -> HashingVectorizer:
+    """문자 n-gram 해싱 벡터라이저"""
+    return HashingVectorizer(
+        analyzer="char_wb",
+        ngram_range=ngram_range,
+        n_features=n_features,
+        alternate_sign=False,
+        norm="l2",
+        lowercase=False,
+        dtype=np.float32,
+    )
+
+
+def build_texts(merchants: Sequence[str], memos: Sequence[str] | None = None) -> list[str]:
+    """
+    모델 입력 텍스트 (정규화 가맹점명 + 정규화 메모)
+
+    Args:
+        merchants: 가맹점명 목록
+        memos: 메모 목록 (생략 시 빈 메모)
+
+    Returns:
+        입력 텍스트 목록
+    """
+    if memos is None:
+        memos = [""] * len(merchants)
+    return [
+        f"{normalize_merchant(merchant or '')} | {normalize_memo(memo or '')}"
+        for merchant, memo in zip(merchants, memos)
+    ]
+
+
+class NgramModel:
+    """
+    학습된 n-gram 분류 모델 (읽기 전용)
+
+    coef는 (n_features, n_classes) 행렬로, mmap된 배열도 그대로 쓸 수 있다.
+    특징 추출(문자 n-gram 분석)이 예측 비용의 대부분이므로 입력 텍스트별
+    예측 결과를 LRU 캐시에 두고, 캐시에 없는 텍스트만 벡터화한다.
+    """
+
+    def __init__(
+        self,
+        coef: np.ndarray,
+        intercept: np.ndarray,
+        classes: Sequence[str],
+        ngram_range: tuple[int, int],
+        version: str = "",
+        cache_size: int = NGRAM_CACHE_SIZE,
+    ):
+        self.coef = coef
+        self.intercept = intercept
+        self.classes = np.array(classes, dtype=object)
+        self.version = version
+        self._vectorizer = build_vectorizer(coef.shape[0], ngram_range)
+        self._cache = ClassificationCache(cache_size)
+
+    @classmethod
+    def load(cls, path: Path, mmap: bool = True) -> "NgramModel":
+        """
+        아티팩트 디렉터리에서 모델 로드
+
+        Args:
+            path: 아티팩트 디렉터리
+            mmap: coef.npy를 메모리 매핑으로 열지 여부
+        """
+        meta = json.loads((path / "meta.json").read_text(encoding="utf-8"))
+        coef = np.load(path / "coef.npy", mmap_mode="r" if mmap else None)
+        intercept = np.load(path / "intercept.npy")
+        return cls(coef, intercept, meta["classes"], tuple(meta["ngram_range"]), meta["version"])
+
+    def predict(
+        self, merchants: Sequence[str], memos: Sequence[str] | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        일괄 예측 (같은 입력 텍스트는 한 번만 계산)
+
+        Args:
+            merchants: 가맹점명 목록
+            memos: 메모 목록
+
+        Returns:
+            (카테고리 배열, 신뢰도 배열)
+        """
+        if len(merchants) == 0:
+            return np.empty(0, dtype=object), np.empty(0, dtype=np.float64)
+
+        # 원본 (가맹점, 메모) 조합 → 정규화 텍스트 순으로 중복 제거
+        merchant_codes, merchant_uniques = pd.factorize(
+            pd.Series(np.asarray(merchants, dtype=object)).fillna("").astype(str)
+        )
+        memo_codes, memo_uniques = pd.factorize(
+            pd.Series(np.asarray(memos if memos is not None else [""] * len(merchants), dtype=object))
+            .fillna("")
+            .astype(str)
+        )
+        pair_codes, pairs = pd.factorize(
+            merchant_codes.astype(np.int64) * len(memo_uniques) + memo_codes
+        )
+        text_codes, texts = pd.factorize(
+            np.array(
+                build_texts(
+                    merchant_uniques[pairs // len(memo_uniques)],
+                    memo_uniques[pairs % len(memo_uniques)],
+                ),
+                dtype=object,
+            )
+        )
+        codes = text_codes[pair_codes]
+
+        categories = np.empty(len(texts), dtype=object)
+        confidences = np.empty(len(texts), dtype=np.float64)
+        misses = []
+        for index, text in enumerate(texts):
+            cached = self._cache.get(text, self.version)
+            if cached is None:
+                misses.append(index)
+            else:
+                categories[index], confidences[index] = cached
+
+        if misses:
+            features = self._vectorizer.transform(texts[misses])
+            logits = np.asarray(features @ self.coef, dtype=np.float64) + self.intercept
+            logits -= logits.max(axis=1, keepdims=True)
+            probabilities = np.exp(logits)
+            probabilities /= probabilities.sum(axis=1, keepdims=True)
+
+            best = probabilities.argmax(axis=1)
+            categories[misses] = self.classes[best]
+            confidences[misses] = probabilities[np.arange(len(best)), best]
+            for index in misses:
+                self._cache.put(texts[index], (categories[index], confidences[index]), self.version)
+
+        return categories[codes], confidences[codes]
+
+
+def train_ngram_model(
+    merchants: Sequence[str],
+    memos: Sequence[str],
+    labels: Sequence[str],
+    out_dir: Path,
+    n_features: int = DEFAULT_N_FEATURES,
+    ngram_range: tuple[int, int] = DEFAULT_NGRAM_RANGE,
+) -> dict:
+    """
+    모델 학습 후 아티팩트 저장
+
+    Args:
+        merchants: 가맹점명 목록
+        memos: 메모 목록
+        labels: 카테고리 목록
+        out_dir: 아티팩트 디렉터리
+        n_features: 해싱 특징 수
+        ngram_range: 문자 n-gram 범위
+
+    Returns:
+        meta.json 내용
+    """
+    classes = sorted(set(labels))
+    if len(classes) < 2:
+        raise ValueError("학습에는 2개 이상의 카테고리가 필요합니다.")
+
+    vectorizer = build_vectorizer(n_features, ngram_range)
+    features = vectorizer.transform(build_texts(merchants, memos))
+
+    model = LogisticRegression(C=10.0, max_iter=1000)
+    model.fit(features, list(labels))
+
+    # (n_features, n_classes) 로 저장. 이진 분류는 [0, w] 로지트로 바꿔 softmax와 맞춤
+    coef = model.coef_.T.astype(np.float32)
+    intercept = model.intercept_.astype(np.float64)
+    if len(model.classes_) == 2:
+        coef = np.hstack([np.zeros_like(coef), coef])
+        intercept = np.array([0.0, intercept[0]])
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    meta = {
+        "version": datetime.utcnow().strftime("%Y%m%d%H%M%S"),
+        "classes": [str(category) for category in model.classes_],
+        "n_features": n_features,
+        "ngram_range": list(ngram_range),
+        "samples": len(labels),
+    }
+    np.save(out_dir / "coef.npy", np.ascontiguousarray(coef))
+    np.save(out_dir / "intercept.npy", intercept)
+    (out_dir / "meta.json").write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    logger.info(f"n-gram 모델 학습 완료: {len(labels)}건, 카테고리 {len(classes)}개 → {out_dir}")
+    return meta
+
+
+def load_training_data(session: Session) -> tuple[list[str], list[str], list[str]]:
+    """
+    학습 데이터 조회 (카테고리가 있고 검토가 필요 없는 거래 중 출처가 NGRAM_TRAINING_SOURCES인 것)
+
+    출처를 모르는 거래(category_source가 NULL)는 모델이 정했을 수 있으므로 쓰지 않는다.
+
+    Returns:
+        (merchants, memos, labels)
+    """
+    statement = select(Transaction.merchant, Transaction.memo, Transaction.category).where(
+        Transaction.category.is_not(None),
+        Transaction.needs_review.is_(False),
+        Transaction.category_source.in_(NGRAM_TRAINING_SOURCES),
+    )
+    merchants, memos, labels = [], [], []
+    for merchant, memo, category in session.exec(statement):
+        merchants.append(merchant)
+        memos.append(memo)
+        labels.append(category)
+    return merchants, memos, labels
+
+
+_ngram_model: NgramModel | None = None
+_ngram_model_loaded = False
+_ngram_model_lock = threading.Lock()
+
+
+def get_ngram_model() -> NgramModel | None:
+    """
+    프로세스 공용 모델 조회 (최초 호출 시 NGRAM_MODEL_PATH에서 로드)
+
+    Returns:
+        모델 (아티팩트가 없으면 None)
+    """
+    global _ngram_model, _ngram_model_loaded
+    if _ngram_model_loaded:
+        return _ngram_model
+
+    with _ngram_model_lock:
+        if not _ngram_model_loaded:
+            if (NGRAM_MODEL_PATH / "meta.json").exists():
+                _ngram_model = NgramModel.load(NGRAM_MODEL_PATH)
+                logger.info(f"n-gram 모델 로드: {NGRAM_MODEL_PATH} (version {_ngram_model.version})")
+            _ngram_model_loaded = True
+    return _ngram_model
+
+
+def set_ngram_model(model: NgramModel | None) -> None:
+    """공용 모델 교체 (테스트/재학습 후 반영용)"""
+    global _ngram_model, _ngram_model_loaded
+    with _ngram_model_lock:
+        _ngram_model = model
+        _ngram_model_loaded = True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="문자 n-gram 분류 모델 학습")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    train = subcommands.add_parser("train", help="로컬 DB의 검토 완료 거래로 학습")
+    train.add_argument("--out", type=Path, default=NGRAM_MODEL_PATH, help="아티팩트 디렉터리")
+    train.add_argument("--n-features", type=int, default=DEFAULT_N_FEATURES)
+
+    bench = subcommands.add_parser("bench", help="저장된 모델의 배치 예측 지연 측정")
+    bench.add_argument("--path", type=Path, default=NGRAM_MODEL_PATH)
+    bench.add_argument("--rows", type=int, default=10_000)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == "train":
+        from db import engine
+
+        with Session(engine) as session:
+            merchants, memos, labels = load_training_data(session)
+        meta = train_ngram_model(merchants, memos, labels, args.out, n_features=args.n_features)
+        print(json.dumps(meta, ensure_ascii=False, indent=2))
+        return
+
+    from benchmarks.workload import generate_transactions
+
+    model = NgramModel.load(args.path)
+    merchants, memos = generate_transactions(args.rows)
+    model.predict(merchants[:100], memos[:100])  # 페이지 워밍업
+
+    started = time.perf_counter()
+    model.predict(merchants, memos)
+    elapsed = time.perf_counter() - started
+    print(f"{args.rows}건 예측: {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
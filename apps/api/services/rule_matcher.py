@@ -0,0 +1,251 @@
+"""
+규칙 매칭 인덱스
+
+가맹점/키워드 규칙 테이블을 한 번만 컴파일해서 거래마다 규칙 전체를
+순회하지 않도록 한다.
+
+- 정확 매칭: 정규화된 키 → 규칙 번호 해시
+- 부분 매칭 (키 ⊂ 가맹점명): Aho-Corasick 오토마톤
+- 부분 매칭 (가맹점명 ⊂ 키): 일반화 접미사 오토마톤 (generalized suffix automaton)
+
+여러 규칙이 동시에 매칭되면 기존 순차 탐색과 같도록 규칙 테이블에서
+먼저 선언된 규칙(가장 작은 번호)을 돌려준다.
+"""
+
+import hashlib
+import json
+from collections.abc import Callable, Mapping, Sequence
+
+NO_MATCH = -1
+
+_INF = float("inf")
+
+
+class AhoCorasick:
+    """
+    다중 패턴 부분 문자열 탐색기
+
+    텍스트 안에 포함된 패턴 중 가장 작은 번호를 한 번의 스캔으로 찾는다.
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        goto: list[dict[str, int]] = [{}]
+        best: list[float] = [_INF]
+
+        for index, pattern in enumerate(patterns):
+            node = 0
+            for char in pattern:
+                next_node = goto[node].get(char)
+                if next_node is None:
+                    next_node = len(goto)
+                    goto[node][char] = next_node
+                    goto.append({})
+                    best.append(_INF)
+                node = next_node
+            if index < best[node]:
+                best[node] = index
+
+        # BFS로 실패 링크를 만들면서 실패 체인의 최소 번호를 전파
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for child in queue:
+            best[child] = min(best[child], best[0])
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for char, child in goto[node].items():
+                state = fail[node]
+                while char not in goto[state] and state != 0:
+                    state = fail[state]
+                fallback = goto[state].get(char, 0)
+                fail[child] = fallback if fallback != child else 0
+                best[child] = min(best[child], best[fail[child]])
+                queue.append(child)
+
+        self._goto = goto
+        self._fail = fail
+        self._best = best
+
+    def first_match(self, text: str) -> int:
+        """
+        텍스트에 포함된 패턴 중 가장 작은 번호 (없으면 NO_MATCH)
+        """
+        goto = self._goto
+        fail = self._fail
+        best = self._best
+
+        found = best[0]
+        node = 0
+        for char in text:
+            while char not in goto[node] and node != 0:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if best[node] < found:
+                found = best[node]
+                if found == 0:
+                    break
+
+        return NO_MATCH if found == _INF else int(found)
+
+
+class SubstringIndex:
+    """
+    "쿼리가 어떤 패턴의 부분 문자열인가" 질의용 인덱스
+
+    모든 패턴으로 일반화 접미사 오토마톤을 만들고, 상태마다 그 부분 문자열을
+    포함하는 패턴 중 가장 작은 번호를 저장한다. 질의 비용은 쿼리 길이에만 비례한다.
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        self._next: list[dict[str, int]] = [{}]
+        self._link: list[int] = [-1]
+        self._length: list[int] = [0]
+        best: list[float] = [_INF]
+
+        for index, pattern in enumerate(patterns):
+            last = 0
+            for char in pattern:
+                last = self._extend(last, char)
+                while len(best) < len(self._next):
+                    best.append(_INF)
+                if index < best[last]:
+                    best[last] = index
+            if index < best[0]:
+                best[0] = index
+
+        # 접미사 링크를 따라 최소 번호 전파 (긴 상태부터)
+        for state in sorted(range(1, len(self._next)), key=self._length.__getitem__, reverse=True):
+            parent = self._link[state]
+            if best[state] < best[parent]:
+                best[parent] = best[state]
+
+        self._best = best
+
+    def _new_state(self, length: int, transitions: dict[str, int], link: int) -> int:
+        self._next.append(transitions)
+        self._link.append(link)
+        self._length.append(length)
+        return len(self._next) - 1
+
+    def _extend(self, last: int, char: str) -> int:
+        next_, link, length = self._next, self._link, self._length
+
+        if char in next_[last]:
+            q = next_[last][char]
+            if length[last] + 1 == length[q]:
+                return q
+            clone = self._new_state(length[last] + 1, dict(next_[q]), link[q])
+            p = last
+            while p != -1 and next_[p].get(char) == q:
+                next_[p][char] = clone
+                p = link[p]
+            link[q] = clone
+            return clone
+
+        cur = self._new_state(length[last] + 1, {}, 0)
+        p = last
+        while p != -1 and char not in next_[p]:
+            next_[p][char] = cur
+            p = link[p]
+        if p == -1:
+            return cur
+
+        q = next_[p][char]
+        if length[p] + 1 == length[q]:
+            link[cur] = q
+            return cur
+
+        clone = self._new_state(length[p] + 1, dict(next_[q]), link[q])
+        while p != -1 and next_[p].get(char) == q:
+            next_[p][char] = clone
+            p = link[p]
+        link[q] = clone
+        link[cur] = clone
+        return cur
+
+    def first_container(self, query: str) -> int:
+        """
+        쿼리를 부분 문자열로 포함하는 패턴 중 가장 작은 번호 (없으면 NO_MATCH)
+        """
+        state = 0
+        for char in query:
+            state = self._next[state].get(char, -1)
+            if state == -1:
+                return NO_MATCH
+
+        found = self._best[state]
+        return NO_MATCH if found == _INF else int(found)
+
+
+def rule_table_version(merchant_rules: Mapping[str, str], keyword_rules: Mapping[str, str]) -> str:
+    """
+    규칙 테이블 버전 (선언 순서를 포함한 내용 해시)
+
+    Args:
+        merchant_rules: 가맹점 → 카테고리
+        keyword_rules: 키워드 → 카테고리
+
+    Returns:
+        16자리 16진수 문자열
+    """
+    payload = json.dumps(
+        [list(merchant_rules.items()), list(keyword_rules.items())], ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class RuleMatcher:
+    """
+    컴파일된 규칙 매처
+
+    한 번 만들어지면 변경되지 않는다. 규칙이 바뀌면 새 매처를 만든다.
+    version은 규칙 테이블 내용의 해시로, 같은 규칙이면 같은 값이다.
+    """
+
+    def __init__(
+        self,
+        merchant_rules: Mapping[str, str],
+        keyword_rules: Mapping[str, str],
+        normalize: Callable[[str], str],
+    ):
+        self.version = rule_table_version(merchant_rules, keyword_rules)
+
+        merchant_keys = [normalize(key) for key in merchant_rules]
+        self._merchant_categories = list(merchant_rules.values())
+
+        # 같은 정규화 키가 여러 번 나오면 먼저 선언된 규칙 우선
+        self._exact: dict[str, int] = {}
+        for index, key in enumerate(merchant_keys):
+            self._exact.setdefault(key, index)
+
+        self._merchant_in_text = AhoCorasick(merchant_keys)
+        self._text_in_merchant = SubstringIndex(merchant_keys)
+
+        self._keyword_categories = list(keyword_rules.values())
+        self._keywords = AhoCorasick([keyword.lower() for keyword in keyword_rules])
+
+    @property
+    def rule_count(self) -> int:
+        """컴파일된 규칙 수 (가맹점 + 키워드)"""
+        return len(self._merchant_categories) + len(self._keyword_categories)
+
+    def match_merchant_exact(self, normalized: str) -> str | None:
+        """정규화된 가맹점명과 정확히 일치하는 규칙의 카테고리"""
+        index = self._exact.get(normalized)
+        return None if index is None else self._merchant_categories[index]
+
+    def match_merchant_partial(self, normalized: str) -> str | None:
+        """양방향 부분 문자열 매칭 중 가장 먼저 선언된 규칙의 카테고리"""
+        forward = self._merchant_in_text.first_match(normalized)
+        backward = self._text_in_merchant.first_container(normalized)
+
+        candidates = [index for index in (forward, backward) if index != NO_MATCH]
+        if not candidates:
+            return None
+        return self._merchant_categories[min(candidates)]
+
+    def match_keyword(self, memo_lower: str) -> str | None:
+        """메모(소문자)에 포함된 키워드 중 가장 먼저 선언된 규칙의 카테고리"""
+        index = self._keywords.first_match(memo_lower)
+        return None if index == NO_MATCH else self._keyword_categories[index]
@@ -0,0 +1,257 @@
+"""
+분류 규칙 저장소
+
+규칙 테이블을 외부 소스(JSON/YAML 파일 또는 DB 테이블)에서 읽어 변경 불가능한
+스냅샷(RuleMatcher)으로 컴파일하고, 소스가 바뀌면 새 스냅샷으로 원자적으로 교체한다.
+
+- 변경 감지: 파일은 mtime/크기, DB는 rule_set_version 행 (없으면 규칙 내용 해시)
+- 감지/컴파일은 백그라운드 감시 스레드에서 수행하므로 분류 경로에는 지연이 없다
+- 분류 도중 스냅샷이 바뀌어도 이미 받아 간 스냅샷은 그대로 유지된다
+
+규칙 파일 형식 (JSON, PyYAML이 설치되어 있으면 YAML도 가능):
+    {"merchants": {"스타벅스": "식비/카페", ...}, "keywords": {"라면": "생활/편의점", ...}}
+
+기본 규칙을 파일로 내보내기 (apps/api에서):
+    python -m services.rule_store export > rules.json
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from collections.abc import Callable, Hashable, Mapping
+from datetime import datetime
+from pathlib import Path
+from typing import NamedTuple, Protocol
+
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, select
+
+from models.category_rule import CategoryRule, RuleSetVersion
+from services.rule_matcher import RuleMatcher
+
+logger = logging.getLogger(__name__)
+
+RuleTables = tuple[dict[str, str], dict[str, str]]
+
+
+class RuleSnapshot(NamedTuple):
+    """컴파일된 규칙 스냅샷"""
+
+    matcher: RuleMatcher
+    source: str
+    loaded_at: datetime
+
+
+class RuleSource(Protocol):
+    """규칙 소스 인터페이스"""
+
+    name: str
+
+    def fingerprint(self) -> Hashable:
+        """변경 감지용 값 (바뀌었을 때만 load)"""
+        ...
+
+    def load(self) -> RuleTables:
+        """(가맹점 규칙, 키워드 규칙)"""
+        ...
+
+
+class FileRuleSource:
+    """JSON/YAML 파일 규칙 소스 (mtime 기준 변경 감지)"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.name = f"file:{self.path}"
+
+    def fingerprint(self) -> Hashable:
+        stat = self.path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def load(self) -> RuleTables:
+        text = self.path.read_text(encoding="utf-8")
+        if self.path.suffix in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError as e:
+                raise RuntimeError("YAML 규칙 파일을 읽으려면 PyYAML이 필요합니다.") from e
+            data = yaml.safe_load(text)
+        else:
+            data = json.loads(text)
+
+        return _validate_tables(data.get("merchants", {}), data.get("keywords", {}))
+
+
+class DatabaseRuleSource:
+    """DB 규칙 소스 (rule_set_version 행 기준 변경 감지, 행이 없으면 규칙 내용 기준)"""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.name = "db:category_rules"
+
+    def fingerprint(self) -> Hashable:
+        with Session(self.engine) as session:
+            row = session.get(RuleSetVersion, 1)
+            if row is not None:
+                return row.version
+            # 버전 행이 없으면 규칙 내용 자체로 변경 감지 (규칙 테이블은 작다)
+            rules = session.exec(
+                select(
+                    CategoryRule.id,
+                    CategoryRule.kind,
+                    CategoryRule.pattern,
+                    CategoryRule.category,
+                    CategoryRule.priority,
+                ).order_by(CategoryRule.id)
+            ).all()
+        content = json.dumps([list(rule) for rule in rules], ensure_ascii=False)
+        return ("content", hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest())
+
+    def load(self) -> RuleTables:
+        with Session(self.engine) as session:
+            rules = session.exec(
+                select(CategoryRule).order_by(CategoryRule.priority, CategoryRule.id)
+            ).all()
+
+        merchants: dict[str, str] = {}
+        keywords: dict[str, str] = {}
+        for rule in rules:
+            target = merchants if rule.kind == "merchant" else keywords
+            target.setdefault(rule.pattern, rule.category)
+        return _validate_tables(merchants, keywords)
+
+
+def _validate_tables(merchants: Mapping, keywords: Mapping) -> RuleTables:
+    for table in (merchants, keywords):
+        if not isinstance(table, Mapping) or not all(
+            isinstance(key, str) and isinstance(value, str) for key, value in table.items()
+        ):
+            raise ValueError("규칙은 {문자열: 카테고리} 형식이어야 합니다.")
+    return dict(merchants), dict(keywords)
+
+
+class RuleStore:
+    """
+    현재 규칙 스냅샷 보관소
+
+    current()는 참조 하나를 읽을 뿐이라 분류 경로에서 매번 호출해도 된다.
+    """
+
+    def __init__(self, normalize: Callable[[str], str]):
+        self._normalize = normalize
+        self._snapshot: RuleSnapshot | None = None
+        self._source: RuleSource | None = None
+        self._fingerprint: Hashable = None
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher: threading.Thread | None = None
+
+    def current(self) -> RuleSnapshot | None:
+        """현재 스냅샷 (아직 없으면 None)"""
+        return self._snapshot
+
+    @property
+    def source(self) -> RuleSource | None:
+        return self._source
+
+    def install(self, merchants: Mapping[str, str], keywords: Mapping[str, str], source: str) -> RuleSnapshot:
+        """
+        규칙 테이블을 컴파일해 현재 스냅샷으로 교체
+
+        Returns:
+            새 스냅샷
+        """
+        snapshot = RuleSnapshot(
+            matcher=RuleMatcher(merchants, keywords, self._normalize),
+            source=source,
+            loaded_at=datetime.utcnow(),
+        )
+        # 참조 대입 한 번으로 교체 (이미 받아 간 스냅샷은 영향 없음)
+        self._snapshot = snapshot
+        return snapshot
+
+    def set_source(self, source: RuleSource | None) -> None:
+        """
+        규칙 소스 지정 후 즉시 한 번 읽기
+
+        None이면 외부 소스 없이 install()로 넣은 규칙만 사용한다.
+        """
+        with self._refresh_lock:
+            self._source = source
+            self._fingerprint = None
+        if source is not None:
+            self.refresh()
+
+    def refresh(self) -> bool:
+        """
+        소스가 바뀌었으면 다시 읽어 스냅샷 교체
+
+        읽기/컴파일에 실패하면 기존 스냅샷을 유지한다.
+
+        Returns:
+            교체 여부
+        """
+        with self._refresh_lock:
+            source = self._source
+            if source is None:
+                return False
+            try:
+                fingerprint = source.fingerprint()
+                if fingerprint == self._fingerprint and self._snapshot is not None:
+                    return False
+                merchants, keywords = source.load()
+                snapshot = self.install(merchants, keywords, source.name)
+            except Exception as e:
+                logger.error(f"규칙 다시 읽기 실패 ({source.name}), 기존 규칙 유지: {e}")
+                return False
+
+            self._fingerprint = fingerprint
+            logger.info(
+                f"규칙 스냅샷 교체: version {snapshot.matcher.version} "
+                f"({snapshot.matcher.rule_count}개 규칙, {source.name})"
+            )
+            return True
+
+    def start_watching(self, interval: float) -> None:
+        """백그라운드에서 interval초마다 refresh()"""
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._stop.clear()
+
+        def watch() -> None:
+            while not self._stop.wait(interval):
+                self.refresh()
+
+        self._watcher = threading.Thread(target=watch, name="rule-store-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        """백그라운드 감시 중지"""
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=5)
+            self._watcher = None
+
+
+def main() -> None:
+    import argparse
+    import sys
+
+    from services.category_rules import KEYWORD_CATEGORY_MAP, MERCHANT_CATEGORY_MAP
+
+    parser = argparse.ArgumentParser(description="분류 규칙 도구")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    subcommands.add_parser("export", help="기본 규칙을 JSON으로 출력")
+    parser.parse_args()
+
+    json.dump(
+        {"merchants": MERCHANT_CATEGORY_MAP, "keywords": KEYWORD_CATEGORY_MAP},
+        sys.stdout,
+        ensure_ascii=False,
+        indent=2,
+    )
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,469 @@
+"""
+지출 분포 스케치 (분위수/히스토그램)
+
+(사용자, 월, 카테고리)와 (사용자, 월, 가맹점)별로 금액 분포 스케치를 spend_sketch 테이블에 두고,
+거래 저장/재분류 때 일별 롤업(services.daily_rollup)과 같은 트랜잭션에서 증분 갱신한다.
+조회는 기간 내 스케치만 합치므로 비용이 거래 수와 무관하다.
+
+스케치는 DDSketch 방식의 로그 버킷 카운트다. 값 v를 ceil(log_γ v) 버킷에 세기만 하므로
+- 합치기와 빼기(음수 건수)가 정확하다 (재분류로 거래가 미분류 → 카테고리로 옮겨갈 때 필요,
+  t-digest/KLL은 빼기를 지원하지 않음)
+- 분위수 상대 오차 ≤ SKETCH_RELATIVE_ACCURACY, 크기는 금액 범위의 로그에 비례 (수백 버킷 이하)
+"""
+
+import logging
+import math
+import os
+import struct
+from collections.abc import Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import delete, false, func, insert, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, select
+
+from models.daily_spend import UNCLASSIFIED
+from models.spend_sketch import SpendSketch
+from models.transaction import Transaction
+
+logger = logging.getLogger(__name__)
+
+# 분위수 상대 오차 (0.01 = ±1%)
+SKETCH_RELATIVE_ACCURACY = float(os.getenv("SKETCH_RELATIVE_ACCURACY", "0.01"))
+
+# 기본 히스토그램 구간 경계 (원): [0, 5천), [5천, 1만), ..., [30만, ∞)
+DEFAULT_HISTOGRAM_EDGES = (0, 5_000, 10_000, 20_000, 50_000, 100_000, 300_000)
+
+# 스케치 갱신 직렬화용 advisory lock 네임스페이스 (PostgreSQL, (네임스페이스, user_id) 쌍으로 잠금)
+SKETCH_LOCK_NAMESPACE = 5_180_001
+
+SKETCH_FORMAT = 1
+SKETCH_KINDS = ("category", "merchant")
+
+SketchKey = tuple[int, str, str, str]  # (user_id, month, kind, key)
+
+# build_sketches에서 0 이하 값을 표시하는 버킷 번호 (실제 버킷 번호는 이보다 훨씬 큼)
+ZERO_BUCKET = np.iinfo(np.int64).min
+
+
+class QuantileSketch:
+    """로그 버킷 분위수 스케치 (건수는 음수도 허용 - 빼기용 증분)"""
+
+    def __init__(self, relative_accuracy: float = SKETCH_RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins: dict[int, int] = {}
+        self.zero_count = 0  # 0 이하 값
+
+    @property
+    def count(self) -> int:
+        return self.zero_count + sum(self.bins.values())
+
+    def _bump(self, index: int, count: int) -> None:
+        total = self.bins.get(index, 0) + count
+        if total:
+            self.bins[index] = total
+        else:
+            self.bins.pop(index, None)
+
+    def add(self, value: float, count: int = 1) -> None:
+        """값 추가 (count가 음수면 빼기)"""
+        if value <= 0:
+            self.zero_count += count
+        else:
+            self._bump(math.ceil(math.log(value) / self._log_gamma), count)
+
+    def bucket_indexes(self, values: np.ndarray) -> np.ndarray:
+        """양수 값 배열의 버킷 번호"""
+        return np.ceil(np.log(values) / self._log_gamma).astype(np.int64)
+
+    def add_many(self, values: np.ndarray) -> None:
+        """값 배열 추가"""
+        values = np.asarray(values, dtype=np.float64)
+        positive = values[values > 0]
+        self.zero_count += len(values) - len(positive)
+        indexes, counts = np.unique(self.bucket_indexes(positive), return_counts=True)
+        for index, count in zip(indexes.tolist(), counts.tolist(), strict=True):
+            self._bump(index, count)
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """다른 스케치 합치기 (같은 정확도여야 함)"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("정확도가 다른 스케치는 합칠 수 없습니다.")
+        self.zero_count += other.zero_count
+        for index, count in other.bins.items():
+            self._bump(index, count)
+
+    def _value(self, index: int) -> float:
+        # 버킷 (γ^(i-1), γ^i]의 대표값 (상대 오차가 양쪽 끝에서 같도록)
+        return 2 * self.gamma**index / (self.gamma + 1)
+
+    def _positive_bins(self) -> list[tuple[int, int]]:
+        return sorted((index, count) for index, count in self.bins.items() if count > 0)
+
+    def quantiles(self, qs: Sequence[float]) -> list[float | None]:
+        """
+        분위수 (q는 0~1, 비어 있으면 None)
+        """
+        bins = self._positive_bins()
+        zero_count = max(self.zero_count, 0)
+        total = zero_count + sum(count for _, count in bins)
+        if total <= 0:
+            return [None] * len(qs)
+
+        values = []
+        for q in qs:
+            rank = q * (total - 1)
+            cumulative = zero_count
+            value = 0.0
+            if rank >= cumulative:
+                for index, count in bins:
+                    cumulative += count
+                    value = self._value(index)
+                    if cumulative > rank:
+                        break
+            values.append(value)
+        return values
+
+    def rank(self, value: float) -> float | None:
+        """value 이하인 값의 비율 (0~1, 비어 있으면 None)"""
+        bins = self._positive_bins()
+        zero_count = max(self.zero_count, 0)
+        total = zero_count + sum(count for _, count in bins)
+        if total <= 0:
+            return None
+        if value <= 0:
+            return zero_count / total
+        limit = math.ceil(math.log(value) / self._log_gamma)
+        return (zero_count + sum(count for index, count in bins if index <= limit)) / total
+
+    def histogram(self, edges: Sequence[float]) -> list[int]:
+        """
+        구간별 건수 [edges[0], edges[1]), ..., [edges[-1], ∞) (edges[0] 미만은 제외)
+
+        버킷 대표값으로 구간을 정하므로 경계 근처 값은 상대 오차만큼 옆 구간에 들어갈 수 있다.
+        """
+        counts = [0] * len(edges)
+        edges_array = np.asarray(edges, dtype=np.float64)
+        if self.zero_count > 0 and edges_array[0] <= 0:
+            counts[int(np.searchsorted(edges_array, 0.0, side="right")) - 1] += self.zero_count
+        for index, count in self._positive_bins():
+            position = int(np.searchsorted(edges_array, self._value(index), side="right")) - 1
+            if position >= 0:
+                counts[position] += count
+        return counts
+
+    def to_bytes(self) -> bytes:
+        """직렬화: 헤더(형식, 정확도) + 0 이하 건수 + (버킷 번호 차이, 건수) varint 목록"""
+        out = bytearray(struct.pack("<Bd", SKETCH_FORMAT, self.relative_accuracy))
+        _write_varint(out, _zigzag(self.zero_count))
+        bins = sorted(self.bins.items())
+        _write_varint(out, len(bins))
+        previous = 0
+        for index, count in bins:
+            _write_varint(out, _zigzag(index - previous))
+            _write_varint(out, _zigzag(count))
+            previous = index
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "QuantileSketch":
+        """to_bytes() 결과 읽기"""
+        version, relative_accuracy = struct.unpack_from("<Bd", data)
+        if version != SKETCH_FORMAT:
+            raise ValueError(f"지원하지 않는 스케치 형식입니다: {version}")
+        sketch = cls(relative_accuracy)
+        position = struct.calcsize("<Bd")
+        zero_count, position = _read_varint(data, position)
+        sketch.zero_count = _unzigzag(zero_count)
+        size, position = _read_varint(data, position)
+        index = 0
+        for _ in range(size):
+            delta, position = _read_varint(data, position)
+            count, position = _read_varint(data, position)
+            index += _unzigzag(delta)
+            sketch.bins[index] = _unzigzag(count)
+        return sketch
+
+
+def _zigzag(value: int) -> int:
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _unzigzag(value: int) -> int:
+    return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, position: int) -> tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+def sketch_keys(user_id: int, date: str, category: str | None, merchant: str) -> list[SketchKey]:
+    """거래 하나가 속하는 스케치 키 (카테고리, 가맹점)"""
+    month = date[:7]
+    return [
+        (user_id, month, "category", category or UNCLASSIFIED),
+        (user_id, month, "merchant", merchant),
+    ]
+
+
+def apply_sketch_deltas(session: Session, deltas: dict[SketchKey, QuantileSketch]) -> None:
+    """
+    스케치 증분을 현재 세션의 트랜잭션 안에서 반영 (커밋은 호출자가)
+
+    사용자별로 잠근 뒤 기존 스케치를 읽어 합치고 키당 한 번씩 upsert한다.
+    건수가 0이 된 스케치는 삭제한다.
+    """
+    if not deltas:
+        return
+
+    table = SpendSketch.__table__
+    primary_key = (table.c.user_id, table.c.month, table.c.kind, table.c.key)
+    connection = session.connection()
+    _lock_users(connection, {key[0] for key in deltas})
+    existing = {
+        (row.user_id, row.month, row.kind, row.key): row.sketch
+        for row in connection.execute(
+            select(*primary_key, table.c.sketch)
+            .where(
+                table.c.user_id.in_({key[0] for key in deltas}),
+                table.c.month.in_({key[1] for key in deltas}),
+                table.c.key.in_({key[3] for key in deltas}),
+            )
+            .with_for_update()
+        )
+    }
+
+    upserts = []
+    removed = []
+    for key, delta in deltas.items():
+        data = existing.get(key)
+        sketch = QuantileSketch.from_bytes(data) if data is not None else QuantileSketch()
+        sketch.merge(delta)
+        if sketch.count <= 0:
+            if data is not None:
+                removed.append(key)
+            continue
+        user_id, month, kind, name = key
+        upserts.append(
+            {
+                "user_id": user_id,
+                "month": month,
+                "kind": kind,
+                "key": name,
+                "txn_count": sketch.count,
+                "sketch": sketch.to_bytes(),
+            }
+        )
+
+    if upserts:
+        dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+        statement = dialect.insert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=list(primary_key),
+            set_={"txn_count": statement.excluded.txn_count, "sketch": statement.excluded.sketch},
+        )
+        connection.execute(statement, upserts)
+    if removed:
+        connection.execute(delete(table).where(tuple_(*primary_key).in_(removed)))
+
+
+def _lock_users(connection, user_ids: set[int]) -> None:
+    """
+    트랜잭션이 끝날 때까지 사용자별 스케치 갱신을 직렬화
+
+    읽고 합쳐서 덮어쓰는 방식이라, 아직 없는 키를 두 업로드가 동시에 만들면 FOR UPDATE로는
+    막을 수 없어(잠글 행이 없음) 한쪽 증분이 사라진다. 그래서 기존 스케치를 읽기 전에 잠근다.
+    - PostgreSQL: pg_advisory_xact_lock (교착을 피하려고 user_id 순서대로)
+    - SQLite: 빈 DELETE로 DB 쓰기 잠금을 먼저 잡는다 (쓰기 문장이 시작될 때 잠금을 잡음)
+    """
+    if connection.dialect.name == "postgresql":
+        for user_id in sorted(user_ids):
+            connection.execute(select(func.pg_advisory_xact_lock(SKETCH_LOCK_NAMESPACE, user_id)))
+    else:
+        connection.execute(delete(SpendSketch.__table__).where(false()))
+
+
+def rebuild_spend_sketches(session: Session, user_id: int | None = None) -> int:
+    """
+    원본 거래에서 스케치 다시 계산 (커밋은 호출자가)
+
+    Returns:
+        생성된 스케치 수
+    """
+    statement = select(
+        Transaction.user_id,
+        Transaction.date,
+        Transaction.category,
+        Transaction.merchant,
+        Transaction.amount_krw,
+    )
+    clear = delete(SpendSketch)
+    if user_id is not None:
+        statement = statement.where(Transaction.user_id == user_id)
+        clear = clear.where(SpendSketch.user_id == user_id)
+    session.exec(clear)
+
+    frame = pd.DataFrame(
+        session.exec(statement).all(), columns=["user_id", "date", "category", "merchant", "amount"]
+    )
+    rows = [
+        {
+            "user_id": owner,
+            "month": month,
+            "kind": kind,
+            "key": name,
+            "txn_count": sketch.count,
+            "sketch": sketch.to_bytes(),
+        }
+        for (owner, month, kind, name), sketch in build_sketches(frame).items()
+    ]
+    if rows:
+        session.connection().execute(insert(SpendSketch.__table__), rows)
+    return len(rows)
+
+
+def build_sketches(frame: pd.DataFrame) -> dict[SketchKey, QuantileSketch]:
+    """
+    거래 프레임에서 스케치 키별 스케치 만들기 (sketch_keys와 같은 키)
+
+    버킷 번호를 전체 거래에 대해 한 번에 계산한 뒤 (키, 버킷)별 건수만 센다.
+
+    Args:
+        frame: user_id, date (YYYY-MM-DD), category (미분류는 None), merchant, amount 컬럼
+
+    Returns:
+        {(user_id, month, kind, key): 스케치}
+    """
+    sketches: dict[SketchKey, QuantileSketch] = {}
+    if frame.empty:
+        return sketches
+
+    amounts = frame["amount"].to_numpy(dtype=np.float64)
+    positive = amounts > 0
+    buckets = np.full(len(amounts), ZERO_BUCKET, dtype=np.int64)
+    buckets[positive] = QuantileSketch().bucket_indexes(amounts[positive])
+    keyed = frame.assign(
+        month=frame["date"].str[:7],
+        category=frame["category"].fillna(UNCLASSIFIED),
+        bucket=buckets,
+    )
+
+    for kind in SKETCH_KINDS:
+        counts = keyed.groupby(["user_id", "month", kind, "bucket"], sort=False).size().reset_index()
+        for owner, month, name, bucket, count in zip(
+            *(counts[column].tolist() for column in counts.columns)
+        ):
+            key = (owner, month, kind, name)
+            sketch = sketches.get(key)
+            if sketch is None:
+                sketch = sketches[key] = QuantileSketch()
+            if bucket == ZERO_BUCKET:
+                sketch.zero_count += count
+            else:
+                sketch.bins[bucket] = count
+    return sketches
+
+
+def _quantile_name(q: float) -> str:
+    return f"p{q * 100:g}"
+
+
+def _summary(sketch: QuantileSketch, quantiles: Sequence[float], edges: Sequence[int]) -> dict:
+    return {
+        "transaction_count": sketch.count,
+        "quantiles": dict(
+            zip((_quantile_name(q) for q in quantiles), sketch.quantiles(quantiles), strict=True)
+        ),
+        "histogram": [
+            {"lower": lower, "upper": upper, "count": count}
+            for lower, upper, count in zip(
+                edges, [*edges[1:], None], sketch.histogram(edges), strict=True
+            )
+        ],
+    }
+
+
+def spend_distribution(
+    session: Session,
+    user_id: int,
+    start_month: str,
+    end_month: str,
+    by: str = "category",
+    quantiles: Iterable[float] = (0.5, 0.9),
+    edges: Sequence[int] = DEFAULT_HISTOGRAM_EDGES,
+    limit: int = 20,
+) -> dict:
+    """
+    기간 내 금액 분포 (분위수, 히스토그램)
+
+    Args:
+        session: DB 세션
+        user_id: 사용자 ID
+        start_month: 시작 월 (YYYY-MM)
+        end_month: 종료 월 (YYYY-MM)
+        by: 묶음 기준 (category | merchant)
+        quantiles: 분위수 목록 (0~1)
+        edges: 히스토그램 구간 경계 (오름차순)
+        limit: 거래 건수 상위 몇 개 묶음까지 반환할지
+
+    Returns:
+        {
+            "by": by,
+            "overall": {transaction_count, quantiles: {"p50": 금액, ...}, histogram: [...]},
+            "groups": [{key, transaction_count, quantiles, histogram}] - 건수 내림차순
+        }
+    """
+    if by not in SKETCH_KINDS:
+        raise ValueError(f"지원하지 않는 묶음 기준입니다: {by}")
+    quantiles = list(quantiles)
+    edges = list(edges)
+
+    rows = session.exec(
+        select(SpendSketch.key, SpendSketch.sketch).where(
+            SpendSketch.user_id == user_id,
+            SpendSketch.kind == by,
+            SpendSketch.month >= start_month,
+            SpendSketch.month <= end_month,
+        )
+    )
+    overall = QuantileSketch()
+    groups: dict[str, QuantileSketch] = {}
+    for key, data in rows:
+        sketch = QuantileSketch.from_bytes(data)
+        overall.merge(sketch)
+        if key in groups:
+            groups[key].merge(sketch)
+        else:
+            groups[key] = sketch
+
+    ranked = sorted(groups.items(), key=lambda item: (-item[1].count, item[0]))[:limit]
+    logger.info(f"분포 조회 완료: {len(groups)}개 {by} (user_id: {user_id})")
+    return {
+        "by": by,
+        "overall": _summary(overall, quantiles, edges),
+        "groups": [
+            {
+                "key": (key or "미분류") if by == "category" else key,
+                **_summary(sketch, quantiles, edges),
+            }
+            for key, sketch in ranked
+        ],
+    }
@@ -0,0 +1,116 @@
+"""
+거래 내보내기 (CSV / NDJSON 스트리밍)
+
+행 목록을 만들지 않고 서버 측 커서(stream_results)에서 EXPORT_BATCH_SIZE건씩 읽어
+바로 인코딩해 내보내므로, 내보내는 행 수와 무관하게 메모리 사용량이 일정하다.
+"""
+
+import csv
+import io
+import json
+import logging
+import os
+import zlib
+from collections.abc import Iterator
+from datetime import datetime
+from typing import Literal
+
+from sqlalchemy import ColumnElement
+from sqlalchemy.engine import Engine
+from sqlmodel import select
+
+from models.transaction import Transaction
+
+logger = logging.getLogger(__name__)
+
+# 한 번에 DB에서 읽어 인코딩하는 행 수
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+ExportFormat = Literal["csv", "ndjson"]
+
+EXPORT_COLUMNS = (
+    "id",
+    "date",
+    "time",
+    "merchant",
+    "memo",
+    "amount_krw",
+    "payment_type",
+    "city",
+    "channel",
+    "category",
+    "confidence",
+    "needs_review",
+    "created_at",
+    "updated_at",
+)
+
+MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+
+def _json_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _encode_batch(rows, export_format: ExportFormat) -> str:
+    if export_format == "ndjson":
+        return "".join(
+            json.dumps(
+                {name: _json_value(value) for name, value in zip(EXPORT_COLUMNS, row, strict=True)},
+                ensure_ascii=False,
+            )
+            + "\n"
+            for row in rows
+        )
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+def export_transactions(
+    engine: Engine,
+    conditions: list[ColumnElement[bool]],
+    export_format: ExportFormat = "csv",
+    compress: bool = False,
+    batch_size: int | None = None,
+) -> Iterator[bytes]:
+    """
+    거래를 CSV/NDJSON 바이트 조각으로 내보내기 (StreamingResponse 본문용)
+
+    요청 세션은 응답을 보내기 전에 닫히므로 스트리밍 중에는 engine으로 직접 연결한다.
+
+    Args:
+        engine: DB 엔진
+        conditions: WHERE 조건 (사용자, 기간 등)
+        export_format: csv | ndjson
+        compress: gzip 압축 여부
+        batch_size: 한 번에 읽는 행 수 (기본 EXPORT_BATCH_SIZE)
+    """
+    batch_size = batch_size or EXPORT_BATCH_SIZE
+    table = Transaction.__table__
+    statement = (
+        select(*(table.c[name] for name in EXPORT_COLUMNS))
+        .where(*conditions)
+        .order_by(table.c.date, table.c.time, table.c.id)
+    )
+    compressor = zlib.compressobj(wbits=31) if compress else None  # wbits=31: gzip 형식
+
+    def emit(text: str) -> bytes:
+        data = text.encode("utf-8")
+        return compressor.compress(data) if compressor is not None else data
+
+    rows = 0
+    with engine.connect() as connection:
+        result = connection.execution_options(stream_results=True, yield_per=batch_size).execute(
+            statement
+        )
+        if export_format == "csv":
+            yield emit(_encode_batch([EXPORT_COLUMNS], "csv"))
+        for partition in result.partitions():
+            rows += len(partition)
+            chunk = emit(_encode_batch(partition, export_format))
+            if chunk:
+                yield chunk
+    if compressor is not None:
+        yield compressor.flush()
+    logger.info(f"거래 내보내기 완료: {rows}건 ({export_format}{', gzip' if compress else ''})")
@@ -0,0 +1,264 @@
+"""
+거래 대량 저장 (업로드)
+
+행마다 TransactionCreate와 ORM Transaction을 만들고 session.add로 쌓으면
+객체 생성/속성 계측과 행 단위 INSERT가 처리 시간의 대부분을 차지한다.
+여기서는 목록 전체를 dict(TransactionRow)로 한 번에 검증하고,
+Core INSERT를 INGEST_CHUNK_SIZE건씩 executemany로 실행한다 (psycopg면 COPY).
+
+이미 저장된 거래(같은 지문, transaction_fingerprint)는 DB의 UNIQUE 인덱스와
+ON CONFLICT DO NOTHING으로 건너뛰므로 겹치는 명세서를 다시 올려도 중복되지 않는다.
+"""
+
+import logging
+import os
+from collections.abc import Sequence
+from typing import Annotated, NamedTuple
+
+import numpy as np
+from pydantic import TypeAdapter, ValidationError, WrapValidator
+from sqlalchemy import bindparam, delete, false, func, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session
+
+from models.transaction import CategorySource, Transaction, TransactionRow, transaction_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# executemany 한 번에 보내는 행 수
+INGEST_CHUNK_SIZE = int(os.getenv("INGEST_CHUNK_SIZE", "5000"))
+
+INSERT_COLUMNS = (
+    "user_id",
+    "date",
+    "time",
+    "merchant",
+    "memo",
+    "amount_krw",
+    "payment_type",
+    "city",
+    "channel",
+    "category",
+    "confidence",
+    "needs_review",
+    "category_source",
+    "fingerprint",
+)
+
+
+class IngestedTransaction(NamedTuple):
+    """저장된 거래 (롤업, 컬럼 캐시 갱신에 필요한 속성만)"""
+
+    id: int
+    user_id: int
+    date: str
+    merchant: str
+    memo: str
+    amount_krw: int
+    category: str | None
+
+
+class _ClassifyInput(NamedTuple):
+    merchant: str
+    memo: str
+
+
+class _Rejected(NamedTuple):
+    reason: str
+
+
+def _capture_row_errors(value, handler):
+    """행 하나의 검증 실패를 예외 대신 _Rejected로 돌려줘 목록 검증이 끝까지 진행되게 함"""
+    try:
+        return handler(value)
+    except ValidationError as e:
+        # 행 자체가 dict가 아니면 loc가 비어 있다
+        return _Rejected(
+            "; ".join(f"{err['loc'][0]}: {err['msg']}" if err["loc"] else err["msg"] for err in e.errors())
+        )
+    except Exception as e:
+        # 검증 함수가 ValueError 외의 예외를 던진 경우 (예: 무한대 금액)
+        return _Rejected(f"예상치 못한 에러: {str(e)}")
+
+
+_rows_adapter = TypeAdapter(list[Annotated[TransactionRow, WrapValidator(_capture_row_errors)]])
+
+
+def validate_transactions(rows: list[dict]) -> tuple[list[TransactionRow], list[tuple[int, str]]]:
+    """
+    업로드 행 일괄 검증 (목록 전체를 TypeAdapter로 한 번에)
+
+    Args:
+        rows: 업로드된 거래 dict 목록
+
+    Returns:
+        (검증된 행 목록 (입력 순서), [(행 번호(1부터), 거부 사유)])
+    """
+    validated = []
+    rejected = []
+    for index, result in enumerate(_rows_adapter.validate_python(rows)):
+        if isinstance(result, _Rejected):
+            rejected.append((index + 1, result.reason))
+        else:
+            validated.append(result)
+    return validated, rejected
+
+
+def _insert_rows(session: Session, rows: list[dict]) -> dict[str, int]:
+    """Core INSERT ... ON CONFLICT (fingerprint) DO NOTHING executemany, 실제로 들어간 행의 {지문: id}"""
+    table = Transaction.__table__
+    connection = session.connection()
+    dialect = connection.dialect
+    if dialect.name == "postgresql":
+        statement = (
+            postgresql.insert(table)
+            .on_conflict_do_nothing(index_elements=[table.c.fingerprint])
+            .returning(table.c.fingerprint, table.c.id)
+        )
+        inserted: dict[str, int] = {}
+        for start in range(0, len(rows), INGEST_CHUNK_SIZE):
+            inserted.update(connection.execute(statement, rows[start:start + INGEST_CHUNK_SIZE]).tuples())
+        return inserted
+
+    # SQLite는 executemany에 RETURNING을 쓰면 한 행씩 INSERT한다.
+    # 대신 문장을 한 번 컴파일하고 컬럼 단위로 바인드 변환(IsoDate 등)을 적용해 드라이버
+    # executemany로 넣는다 (행마다 파라미터를 처리하는 Core executemany보다 빠름).
+    compiled = (
+        sqlite.insert(table)
+        .values({name: bindparam(name) for name in INSERT_COLUMNS})
+        .on_conflict_do_nothing(index_elements=[table.c.fingerprint])
+        .compile(dialect=dialect)
+    )
+    processors = [
+        table.c[name].type.dialect_impl(dialect).bind_processor(dialect)
+        for name in compiled.positiontup
+    ]
+    # 빈 DELETE로 DB 쓰기 잠금을 먼저 잡는다 (SQLite는 쓰기 문장이 시작될 때 잠금을 잡음).
+    # 그러면 커밋 전까지 다른 쓰기가 끼어들 수 없고 rowid는 늘어나기만 하므로 INSERT 전 최대 id
+    # 이후가 방금 넣은 행이다 (잠금 없이 읽으면 그 사이 다른 업로드가 넣은 행까지 세게 됨)
+    connection.execute(delete(table).where(false()))
+    last_id = connection.execute(select(func.max(table.c.id))).scalar() or 0
+    inserted = {}
+    for start in range(0, len(rows), INGEST_CHUNK_SIZE):
+        chunk = rows[start:start + INGEST_CHUNK_SIZE]
+        columns = []
+        for name, processor in zip(compiled.positiontup, processors):
+            values = [row[name] for row in chunk]
+            columns.append(list(map(processor, values)) if processor is not None else values)
+        connection.exec_driver_sql(compiled.string, list(zip(*columns)))
+        for fingerprint, txn_id in connection.execute(
+            select(table.c.fingerprint, table.c.id).where(table.c.id > last_id).order_by(table.c.id)
+        ):
+            inserted[fingerprint] = last_id = txn_id
+    return inserted
+
+
+def _copy_rows(session: Session, rows: list[dict]) -> dict[str, int]:
+    """
+    PostgreSQL(psycopg) COPY, 실제로 들어간 행의 {지문: id}
+
+    COPY는 ON CONFLICT를 쓸 수 없어 임시 테이블에 COPY한 뒤 INSERT ... SELECT로 옮긴다.
+    """
+    columns = ", ".join(INSERT_COLUMNS)
+    session.execute(
+        text(
+            "CREATE TEMP TABLE IF NOT EXISTS transactions_ingest ON COMMIT DROP AS"
+            f" SELECT {columns} FROM transactions WITH NO DATA"
+        )
+    )
+    session.execute(text("TRUNCATE transactions_ingest"))
+    # 세션과 같은 DB 트랜잭션에서 실행
+    connection = session.connection().connection.driver_connection
+    with connection.cursor() as cursor:
+        with cursor.copy(f"COPY transactions_ingest ({columns}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(tuple(row[name] for name in INSERT_COLUMNS))
+    return dict(
+        session.execute(
+            text(
+                f"INSERT INTO transactions ({columns}) SELECT {columns} FROM transactions_ingest"
+                " ON CONFLICT (fingerprint) DO NOTHING RETURNING fingerprint, id"
+            )
+        ).tuples()
+    )
+
+
+def insert_transactions(
+    session: Session,
+    user_id: int,
+    rows: Sequence[TransactionRow],
+    classification: dict[str, np.ndarray] | None = None,
+) -> list[IngestedTransaction]:
+    """
+    검증된 거래 일괄 INSERT (커밋은 호출자가)
+
+    지문이 같은 거래가 이미 있거나 rows 안에서 앞에 나왔으면 저장하지 않는다.
+
+    Args:
+        session: DB 세션
+        user_id: 사용자 ID
+        rows: validate_transactions로 검증된 행
+        classification: classify_transactions_batch 결과 (rows와 같은 순서)
+
+    Returns:
+        실제로 저장된 거래 목록 (rows와 같은 순서, 중복은 빠짐)
+    """
+    if not rows:
+        return []
+    values = [
+        {
+            "user_id": user_id,
+            "date": row["date"],
+            "time": row["time"],
+            "merchant": row["merchant"],
+            "memo": row.get("memo", ""),
+            "amount_krw": row["amount_krw"],
+            "payment_type": row["payment_type"],
+            "city": row["city"],
+            "channel": row["channel"],
+            "category": None,
+            "confidence": None,
+            "needs_review": False,
+            "category_source": None,
+            "fingerprint": transaction_fingerprint(
+                user_id, row["date"], row["time"], row["merchant"], row["amount_krw"]
+            ),
+        }
+        for row in rows
+    ]
+    if classification is not None:
+        for value, category, confidence, needs_review, method in zip(
+            values,
+            classification["category"].tolist(),
+            classification["confidence"].tolist(),
+            classification["needs_review"].tolist(),
+            classification["method"].tolist(),
+        ):
+            value["category"] = str(category)
+            value["confidence"] = float(confidence)
+            value["needs_review"] = bool(needs_review)
+            value["category_source"] = CategorySource.from_method(method).value
+
+    dialect = session.get_bind().dialect
+    if dialect.name == "postgresql" and dialect.driver == "psycopg":
+        inserted = _copy_rows(session, values)
+    else:
+        inserted = _insert_rows(session, values)
+
+    transactions = []
+    for value in values:
+        # 같은 지문이 rows에 여러 번 있으면 처음 것만 저장된 것으로
+        txn_id = inserted.pop(value["fingerprint"], None)
+        if txn_id is not None:
+            transactions.append(
+                IngestedTransaction(
+                    txn_id, user_id, value["date"], value["merchant"], value["memo"],
+                    value["amount_krw"], value["category"],
+                )
+            )
+    return transactions
+
+
+def classify_input(rows: Sequence[TransactionRow]) -> list[_ClassifyInput]:
+    """classify_transactions_batch에 넘길 (merchant, memo) 목록"""
+    return [_ClassifyInput(row["merchant"], row.get("memo", "")) for row in rows]
@@ -0,0 +1,197 @@
+"""
+업로드 본문 점진 파싱 (NDJSON / JSON 배열)
+
+UploadRequest(list[dict])는 본문 전체를 메모리에 올리고 모든 dict를 만든 뒤에야 검증을 시작한다.
+여기서는 요청 스트림에서 받은 만큼만 파싱해 행을 내보내므로, 호출자가 chunk_size건씩 저장하면
+메모리 사용량이 본문 크기가 아니라 청크 크기(+ 아직 끝나지 않은 행 하나)에 비례한다.
+
+- NDJSON: 한 줄에 거래 하나. 파싱할 수 없는 줄은 그 행만 거부한다.
+- JSON 배열: [{...}, {...}]. 문법 오류가 나면 이후를 읽을 수 없으므로 ValueError.
+"""
+
+import codecs
+import json
+import os
+import re
+from collections.abc import AsyncIterable, AsyncIterator
+from typing import NamedTuple
+
+from models.transaction import TransactionRow
+from services.transaction_ingest import validate_transactions
+
+# 행 하나(파싱 전 버퍼)의 최대 크기, 넘으면 잘못된 본문으로 본다
+STREAM_UPLOAD_MAX_ROW_BYTES = int(os.getenv("STREAM_UPLOAD_MAX_ROW_BYTES", str(1024 * 1024)))
+
+# 응답에 담는 거부 사유 최대 건수 (거부 건수는 전부 센다)
+STREAM_UPLOAD_MAX_REASONS = int(os.getenv("STREAM_UPLOAD_MAX_REASONS", "1000"))
+
+_WHITESPACE = re.compile(r"[ \t\r\n]*")
+
+
+class RowParseError(NamedTuple):
+    """파싱할 수 없는 행 (NDJSON 줄)"""
+
+    reason: str
+
+
+class NdjsonParser:
+    """NDJSON 점진 파서 (빈 줄은 무시)"""
+
+    def __init__(self):
+        self._buffer = b""
+
+    def feed(self, data: bytes, final: bool = False) -> list:
+        """
+        받은 바이트를 넣고 완성된 행 반환
+
+        Args:
+            data: 이어서 받은 본문 조각
+            final: 본문 끝 여부 (마지막 줄에 줄바꿈이 없어도 행으로 처리)
+
+        Returns:
+            행 목록 (파싱할 수 없는 줄은 RowParseError)
+        """
+        lines = (self._buffer + data).split(b"\n")
+        self._buffer = b"" if final else lines.pop()
+        if len(self._buffer) > STREAM_UPLOAD_MAX_ROW_BYTES:
+            raise ValueError(f"한 행이 너무 큽니다 (최대 {STREAM_UPLOAD_MAX_ROW_BYTES}바이트)")
+
+        rows = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                rows.append(json.loads(line))
+            except ValueError as e:  # JSONDecodeError, UnicodeDecodeError
+                rows.append(RowParseError(f"JSON 파싱 실패: {e}"))
+        return rows
+
+
+class JsonArrayParser:
+    """JSON 배열 점진 파서 (최상위 배열의 원소를 하나씩)"""
+
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._emitted = 0  # 지금까지 내보낸 원소 수 (오류 위치 표시용)
+        self._state = "start"  # start → first → (item ↔ separator) → done
+
+    def feed(self, data: bytes, final: bool = False) -> list:
+        """
+        받은 바이트를 넣고 완성된 원소 반환
+
+        Args:
+            data: 이어서 받은 본문 조각
+            final: 본문 끝 여부
+
+        Returns:
+            원소 목록
+
+        Raises:
+            ValueError: 배열이 아니거나 문법 오류, 본문이 배열 중간에 끝난 경우
+        """
+        try:
+            buffer = self._buffer + self._decoder.decode(data, final)
+        except UnicodeDecodeError as e:
+            raise ValueError(f"UTF-8이 아닌 본문: {e}") from e
+
+        rows = []
+        position = 0
+        while True:
+            position = _WHITESPACE.match(buffer, position).end()
+            if position == len(buffer):
+                break
+            char = buffer[position]
+            if self._state == "start":
+                if char != "[":
+                    raise ValueError("본문이 JSON 배열이 아닙니다")
+                self._state = "first"
+                position += 1
+            elif self._state == "first" and char == "]":
+                self._state = "done"
+                position += 1
+            elif self._state in ("first", "item"):
+                try:
+                    value, end = self._json.raw_decode(buffer, position)
+                except json.JSONDecodeError as e:
+                    if final:
+                        raise ValueError(f"JSON 파싱 실패: {e.msg} (원소 {self._emitted + len(rows) + 1})") from e
+                    break  # 원소가 아직 다 오지 않음
+                if end == len(buffer) and not final:
+                    break  # 숫자 등은 뒤가 잘렸을 수 있음
+                rows.append(value)
+                self._state = "separator"
+                position = end
+            elif self._state == "separator" and char in ",]":
+                self._state = "item" if char == "," else "done"
+                position += 1
+            else:
+                raise ValueError(f"JSON 파싱 실패: 예상치 못한 문자 {char!r} (원소 {self._emitted + len(rows) + 1} 근처)")
+
+        self._buffer = buffer[position:]
+        if len(self._buffer) > STREAM_UPLOAD_MAX_ROW_BYTES:
+            raise ValueError(f"한 행이 너무 크거나 JSON 문법 오류입니다 (최대 {STREAM_UPLOAD_MAX_ROW_BYTES}바이트)")
+        if final and self._state != "done":
+            raise ValueError("본문이 JSON 배열 중간에 끝났습니다")
+        self._emitted += len(rows)
+        return rows
+
+
+async def iter_row_chunks(
+    stream: AsyncIterable[bytes],
+    parser: NdjsonParser | JsonArrayParser,
+    chunk_size: int,
+) -> AsyncIterator[list[tuple[int, object]]]:
+    """
+    본문 스트림을 파싱해 chunk_size건씩 묶어 내보내기
+
+    Args:
+        stream: 요청 본문 조각 (Request.stream())
+        parser: NdjsonParser | JsonArrayParser
+        chunk_size: 묶음 크기
+
+    Yields:
+        [(행 번호(1부터), 행)] (마지막 묶음은 chunk_size보다 작을 수 있음)
+    """
+    pending: list[tuple[int, object]] = []
+    count = 0
+
+    def take(rows: list) -> None:
+        nonlocal count
+        for row in rows:
+            count += 1
+            pending.append((count, row))
+
+    async for data in stream:
+        take(parser.feed(data))
+        while len(pending) >= chunk_size:
+            yield pending[:chunk_size]
+            del pending[:chunk_size]
+    take(parser.feed(b"", final=True))
+    for start in range(0, len(pending), chunk_size):
+        yield pending[start:start + chunk_size]
+
+
+def validate_row_chunk(
+    chunk: list[tuple[int, object]],
+) -> tuple[list[TransactionRow], list[tuple[int, str]]]:
+    """
+    iter_row_chunks 묶음 하나 검증 (validate_transactions와 같지만 행 번호는 본문 기준)
+
+    Returns:
+        (검증된 행 목록, [(행 번호, 거부 사유)] (행 번호 순))
+    """
+    numbers = []
+    values = []
+    rejections = []
+    for number, value in chunk:
+        if isinstance(value, RowParseError):
+            rejections.append((number, value.reason))
+        else:
+            numbers.append(number)
+            values.append(value)
+    rows, rejected = validate_transactions(values)
+    rejections.extend((numbers[index - 1], reason) for index, reason in rejected)
+    rejections.sort()
+    return rows, rejections
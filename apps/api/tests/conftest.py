@@ -0,0 +1,76 @@
+"""
+공용 테스트 픽스처
+"""
+
+import pytest
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from models.category_rule import CategoryRule, RuleSetVersion  # noqa: F401 (테이블 등록)
+from models.cohort_stat import CohortStat  # noqa: F401 (테이블 등록)
+from models.daily_spend import DailySpend  # noqa: F401 (테이블 등록)
+from models.llm_cache import LLMCacheEntry  # noqa: F401 (테이블 등록)
+from models.spend_sketch import SpendSketch  # noqa: F401 (테이블 등록)
+from models.transaction import Transaction
+from models.user import User
+
+
+@pytest.fixture
+def engine():
+    """테스트마다 새로 만드는 인메모리 SQLite 엔진"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def user(session) -> User:
+    user = User(username="tester", email="tester@example.com", hashed_password="x")
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+def make_transaction(user_id: int, merchant: str, memo: str = "", **overrides) -> Transaction:
+    """테스트용 거래 생성"""
+    values = {
+        "date": "2025-01-15",
+        "time": "12:00",
+        "amount_krw": 1000.0,
+        "payment_type": "credit_card",
+        "city": "서울",
+        "channel": "offline",
+    }
+    values.update(overrides)
+    return Transaction(user_id=user_id, merchant=merchant, memo=memo, **values)
+
+
+@pytest.fixture
+def client(session, user):
+    """인증/세션 의존성을 테스트 DB와 사용자로 바꾼 API 클라이언트"""
+    from fastapi.testclient import TestClient
+
+    from db import get_session
+    from main import app
+    from routers.auth import get_current_user_dependency
+
+    from services.aggregate_cache import AggregateCache, set_aggregate_cache
+
+    set_aggregate_cache(AggregateCache())
+    app.dependency_overrides[get_session] = lambda: session
+    app.dependency_overrides[get_current_user_dependency] = lambda: user
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    set_aggregate_cache(None)
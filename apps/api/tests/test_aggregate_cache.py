@@ -0,0 +1,140 @@
+"""
+집계 결과 캐시 테스트
+"""
+
+from services.aggregate_cache import AggregateCache
+
+
+class FakeSharedBackend:
+    """Redis 대신 쓰는 딕셔너리 백엔드"""
+
+    def __init__(self):
+        self.data: dict[str, str] = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return {"total_amount": 1000.0 * self.calls}
+
+
+def test_hit_until_user_version_bumped():
+    cache = AggregateCache(maxsize=8)
+    compute = Counter()
+
+    assert cache.get_or_compute(1, ("2025-01-01", "2025-01-31", "month"), compute) == {"total_amount": 1000.0}
+    assert cache.get_or_compute(1, ("2025-01-01", "2025-01-31", "month"), compute) == {"total_amount": 1000.0}
+    assert compute.calls == 1
+
+    # 다른 사용자 변경은 영향 없음
+    cache.bump(2)
+    cache.get_or_compute(1, ("2025-01-01", "2025-01-31", "month"), compute)
+    assert compute.calls == 1
+
+    cache.bump(1)
+    assert cache.get_or_compute(1, ("2025-01-01", "2025-01-31", "month"), compute) == {"total_amount": 2000.0}
+
+    cache.bump(None)
+    cache.get_or_compute(1, ("2025-01-01", "2025-01-31", "month"), compute)
+    assert compute.calls == 3
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 3
+
+
+def test_lru_eviction():
+    cache = AggregateCache(maxsize=2)
+    compute = Counter()
+    for params in [("a",), ("b",), ("a",), ("c",), ("b",)]:
+        cache.get_or_compute(1, params, compute)
+
+    # a, b, (a 적중), c → b 축출, b 다시 계산 → a 축출
+    assert compute.calls == 4
+    assert cache.stats()["evictions"] == 2
+
+
+def test_ttl_expiry(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr("services.aggregate_cache.time.monotonic", lambda: clock[0])
+    cache = AggregateCache(maxsize=8, ttl=10)
+    compute = Counter()
+
+    cache.get_or_compute(1, ("a",), compute)
+    clock[0] += 5
+    cache.get_or_compute(1, ("a",), compute)
+    clock[0] += 10
+    cache.get_or_compute(1, ("a",), compute)
+
+    assert compute.calls == 2
+    assert cache.stats()["expirations"] == 1
+
+
+def test_shared_backend_across_processes():
+    backend = FakeSharedBackend()
+    first = AggregateCache(maxsize=8, backend=backend)
+    second = AggregateCache(maxsize=8, backend=backend)
+    compute = Counter()
+
+    first.get_or_compute(1, ("a",), compute)
+    assert second.get_or_compute(1, ("a",), compute) == {"total_amount": 1000.0}
+    assert second.stats()["shared_hits"] == 1
+
+    # 다른 프로세스에서 올린 버전도 보인다
+    first.bump(1)
+    second.get_or_compute(1, ("a",), compute)
+    assert compute.calls == 2
+
+
+def test_broken_backend_falls_back_to_local():
+    class BrokenBackend:
+        def get(self, key):
+            raise ConnectionError("down")
+
+        set = incr = get
+
+    cache = AggregateCache(maxsize=8, backend=BrokenBackend())
+    compute = Counter()
+    cache.get_or_compute(1, ("a",), compute)
+    cache.get_or_compute(1, ("a",), compute)
+    assert compute.calls == 1
+
+
+def test_disabled():
+    cache = AggregateCache(maxsize=0)
+    compute = Counter()
+    cache.get_or_compute(1, ("a",), compute)
+    cache.get_or_compute(1, ("a",), compute)
+    assert compute.calls == 2
+
+
+def test_endpoint_invalidated_by_upload(client):
+    row = {
+        "date": "2025-01-15",
+        "time": "12:00",
+        "merchant": "스타벅스",
+        "amount_krw": 4500,
+        "payment_type": "credit_card",
+        "city": "서울",
+        "channel": "offline",
+    }
+    params = {"start": "2025-01-01", "end": "2025-01-31"}
+
+    client.post("/api/transactions/upload", json={"transactions": [row]})
+    assert client.get("/api/aggregate", params=params).json()["total_amount"] == 4500
+    assert client.get("/api/aggregate", params=params).json()["total_amount"] == 4500
+    assert client.get("/api/aggregate/cache").json()["hits"] == 1
+
+    client.post("/api/transactions/upload", json={"transactions": [{**row, "time": "12:30"}]})
+    assert client.get("/api/aggregate", params=params).json()["total_amount"] == 9000
@@ -0,0 +1,161 @@
+"""
+거래 집계 테스트
+"""
+
+import random
+
+import pytest
+
+from services.aggregator import aggregate_transactions
+from services.daily_rollup import RollupDelta, apply_rollup_delta
+from tests.conftest import make_transaction
+
+
+def save(session, transactions) -> None:
+    """업로드와 같은 방식으로 거래 저장 + 롤업 갱신"""
+    session.add_all(transactions)
+    session.flush()
+    rollup = RollupDelta()
+    rollup.add_transactions(transactions)
+    apply_rollup_delta(session, rollup)
+    session.commit()
+
+
+def reference_aggregate(transactions, start_date, end_date) -> dict:
+    """ORM 행을 파이썬에서 직접 집계하던 이전 구현 (비교 기준)"""
+    transactions = [txn for txn in transactions if start_date <= txn.date <= end_date]
+
+    by_category = {}
+    merchant_totals = {}
+    daily_totals = {}
+    for txn in transactions:
+        category = txn.category or "미분류"
+        by_category[category] = by_category.get(category, 0.0) + txn.amount_krw
+        merchant_totals[txn.merchant] = merchant_totals.get(txn.merchant, 0.0) + txn.amount_krw
+        daily_totals[txn.date] = daily_totals.get(txn.date, 0.0) + txn.amount_krw
+
+    return {
+        "total_amount": sum(txn.amount_krw for txn in transactions),
+        "by_category": by_category,
+        "top_merchants": sorted(
+            [{"merchant": k, "amount": v} for k, v in merchant_totals.items()],
+            key=lambda x: x["amount"],
+            reverse=True,
+        )[:3],
+        "daily_totals": sorted(
+            [{"date": k, "amount": v} for k, v in daily_totals.items()],
+            key=lambda x: x["date"],
+        ),
+    }
+
+
+@pytest.fixture
+def transactions(session, user):
+    rng = random.Random(0)
+    rows = [
+        make_transaction(
+            user.id,
+            rng.choice(["스타벅스", "GS25", "CU", "카카오T", "동네 분식"]),
+            date=f"2025-01-{rng.randint(1, 28):02d}",
+            amount_krw=float(rng.choice([1000, 2500, 4500, 12000])),
+            category=rng.choice([None, "식비/카페", "생활/편의점", "교통"]),
+        )
+        for _ in range(300)
+    ]
+    # 다른 사용자 거래는 집계에서 빠져야 한다
+    save(session, rows + [make_transaction(user.id + 1, "스타벅스", amount_krw=99999.0)])
+    return rows
+
+
+@pytest.mark.parametrize(
+    "start_date, end_date",
+    [("2025-01-01", "2025-01-31"), ("2025-01-10", "2025-01-12"), ("2025-01-05", "2025-01-05")],
+)
+def test_matches_reference(session, user, transactions, start_date, end_date):
+    result = aggregate_transactions(session, user.id, start_date, end_date)
+    expected = reference_aggregate(transactions, start_date, end_date)
+
+    assert {key: result[key] for key in expected} == expected
+    assert list(result["by_category"]) == list(expected["by_category"])
+
+
+def test_top_merchant_ties_keep_first_seen_order(session, user):
+    save(
+        session,
+        [make_transaction(user.id, merchant, amount_krw=1000.0) for merchant in ["가", "나", "다", "라"]],
+    )
+
+    result = aggregate_transactions(session, user.id, "2025-01-01", "2025-01-31")
+    assert [item["merchant"] for item in result["top_merchants"]] == ["가", "나", "다"]
+
+
+def test_empty_range(session, user):
+    assert aggregate_transactions(session, user.id, "2030-01-01", "2030-01-31") == {
+        "total_amount": 0,
+        "by_category": {},
+        "top_merchants": [],
+        "daily_totals": [],
+        "active_days": 0,
+        "series": [],
+    }
+
+
+@pytest.fixture
+def year_boundary(session, user):
+    # 2024-12-30(월)~2025-01-05(일)은 ISO 2025-W01
+    rows = [
+        ("2024-12-28", "식비/카페", 1000.0),
+        ("2024-12-30", "식비/카페", 2000.0),
+        ("2024-12-31", "교통", 3000.0),
+        ("2025-01-05", "식비/카페", 4000.0),
+        ("2025-01-06", None, 5000.0),
+        ("2025-02-01", "교통", 6000.0),
+    ]
+    save(
+        session,
+        [
+            make_transaction(user.id, "가게", date=date, category=category, amount_krw=amount)
+            for date, category, amount in rows
+        ],
+    )
+
+
+@pytest.mark.parametrize(
+    "range_type, expected",
+    [
+        (
+            "day",
+            [("2024-12-28", 1000.0), ("2024-12-30", 2000.0), ("2024-12-31", 3000.0),
+             ("2025-01-05", 4000.0), ("2025-01-06", 5000.0), ("2025-02-01", 6000.0)],
+        ),
+        ("week", [("2024-W52", 1000.0), ("2025-W01", 9000.0), ("2025-W02", 5000.0), ("2025-W05", 6000.0)]),
+        ("month", [("2024-12", 6000.0), ("2025-01", 9000.0), ("2025-02", 6000.0)]),
+    ],
+)
+def test_series_buckets(session, user, year_boundary, range_type, expected):
+    result = aggregate_transactions(session, user.id, "2024-12-01", "2025-02-28", range_type=range_type)
+
+    assert [(item["bucket"], item["amount"]) for item in result["series"]] == expected
+    assert sum(item["amount"] for item in result["series"]) == result["total_amount"]
+    assert result["active_days"] == 6
+
+
+def test_series_by_category(session, user, year_boundary):
+    result = aggregate_transactions(
+        session,
+        user.id,
+        "2024-12-01",
+        "2025-02-28",
+        range_type="week",
+        series_by_category=True,
+        include_daily_totals=False,
+    )
+
+    assert result["daily_totals"] == []
+    assert result["series"][1] == {
+        "bucket": "2025-W01",
+        "start": "2024-12-30",
+        "amount": 9000.0,
+        "by_category": {"식비/카페": 6000.0, "교통": 3000.0},
+    }
+    assert result["series"][2]["by_category"] == {"미분류": 5000.0}
@@ -2,8 +2,11 @@
 카테고리 규칙 테스트
 """
 
+import numpy as np
+import pandas as pd
 import pytest
 from services.category_rules import (
+    classify_batch,
     classify_transaction,
     get_category_by_merchant,
     get_category_by_keyword,
@@ -130,6 +133,52 @@ class TestClassifyTransaction:
         assert result["method"] == "merchant"
 
 
+class TestClassifyBatch:
+    """일괄 분류 테스트"""
+
+    SAMPLES = [
+        ("스타벅스", ""),
+        ("스타벅스 강남점", ""),
+        ("스타벅스", "택시"),
+        ("GS25", "라면"),
+        ("알 수 없는 가게", "삼각김밥 샀음"),
+        ("알 수 없는 가맹점", "특별한 메모 없음"),
+        ("알 수 없는 가맹점", "특별한 메모 없음"),
+        ("Kakao T", ""),
+    ]
+
+    def test_matches_classify_transaction(self):
+        merchants = [merchant for merchant, _ in self.SAMPLES]
+        memos = [memo for _, memo in self.SAMPLES]
+        result = classify_batch(merchants, memos)
+
+        for index, (merchant, memo) in enumerate(self.SAMPLES):
+            expected = classify_transaction(merchant, memo)
+            assert result["category"][index] == expected["category"]
+            assert result["confidence"][index] == expected["confidence"]
+            assert result["method"][index] == expected["method"]
+            assert result["needs_review"][index] == expected["needs_review"]
+
+    def test_accepts_numpy_and_pandas_columns(self):
+        merchants = np.array(["스타벅스", "알 수 없는 가게"], dtype=object)
+        memos = pd.Series(["", "택시"], index=[10, 20])
+        result = classify_batch(merchants, memos)
+        assert list(result["category"]) == ["식비/카페", "교통"]
+        assert result["needs_review"].dtype == bool
+
+    def test_memos_optional(self):
+        result = classify_batch(["버거킹", "모르는 곳"])
+        assert list(result["method"]) == ["merchant", "default"]
+
+    def test_empty_batch(self):
+        result = classify_batch([], [])
+        assert len(result["category"]) == 0
+
+    def test_length_mismatch(self):
+        with pytest.raises(ValueError):
+            classify_batch(["스타벅스"], [])
+
+
 class TestCoverageRequirement:
     """≥90% 커버리지 요구사항 테스트"""
 
@@ -0,0 +1,116 @@
+"""
+분류 결과 캐시 테스트
+"""
+
+import pytest
+
+from services.category_rules import (
+    MERCHANT_CATEGORY_MAP,
+    classify_batch,
+    classify_transaction,
+    clear_classification_cache,
+    get_classification_cache_stats,
+    rebuild_rule_matcher,
+)
+from services.classification_cache import ClassificationCache
+
+
+class TestClassificationCache:
+    """LRU 캐시 단위 테스트"""
+
+    def test_hit_and_miss_counters(self):
+        cache = ClassificationCache(maxsize=4)
+        assert cache.get("a", "v1") is None
+        cache.put("a", 1, "v1")
+        assert cache.get("a", "v1") == 1
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_lru_eviction(self):
+        cache = ClassificationCache(maxsize=2)
+        cache.put("a", 1, "v1")
+        cache.put("b", 2, "v1")
+        cache.get("a", "v1")
+        cache.put("c", 3, "v1")
+
+        assert cache.get("b", "v1") is None
+        assert cache.get("a", "v1") == 1
+        assert cache.get("c", "v1") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_version_change_invalidates(self):
+        cache = ClassificationCache(maxsize=2)
+        cache.put("a", 1, "v1")
+
+        assert cache.get("a", "v2") is None
+        assert cache.stats()["invalidations"] == 1
+        assert cache.version == "v2"
+
+    def test_alternating_versions_keep_each_others_entries(self):
+        # 이전 스냅샷에 고정된 작업과 새 버전 요청이 번갈아 조회하는 경우
+        cache = ClassificationCache(maxsize=4)
+        cache.put("a", "old", "v1")
+        cache.put("a", "new", "v2")
+
+        for _ in range(3):
+            assert cache.get("a", "v1") == "old"
+            assert cache.get("a", "v2") == "new"
+        assert cache.stats()["invalidations"] == 1
+        assert cache.stats()["size"] == 2
+
+    def test_zero_size_disables_cache(self):
+        cache = ClassificationCache(maxsize=0)
+        cache.put("a", 1, "v1")
+        assert cache.get("a", "v1") is None
+
+    def test_negative_size(self):
+        with pytest.raises(ValueError):
+            ClassificationCache(maxsize=-1)
+
+
+class TestCachedClassification:
+    """classify_transaction / classify_batch 캐시 연동 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def fresh_cache(self):
+        clear_classification_cache()
+        yield
+        clear_classification_cache()
+
+    def test_normalized_key_is_shared(self):
+        classify_transaction("스타벅스 강남점", "")
+        classify_transaction("  스타벅스 강남점 ", "")
+        classify_transaction("스타벅스 강남점", "   ")
+
+        stats = get_classification_cache_stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 2
+
+    def test_cached_result_is_not_shared_mutable(self):
+        first = classify_transaction("스타벅스", "")
+        first["category"] = "변경"
+        assert classify_transaction("스타벅스", "")["category"] == "식비/카페"
+
+    def test_batch_populates_cache(self):
+        classify_batch(["스타벅스", "스타벅스", "GS25"], ["", "", ""])
+        assert get_classification_cache_stats()["misses"] == 2
+
+        classify_transaction("GS25", "")
+        assert get_classification_cache_stats()["hits"] == 1
+
+    def test_rule_change_invalidates(self, monkeypatch):
+        assert classify_transaction("새가게", "")["category"] == "기타"
+
+        monkeypatch.setitem(MERCHANT_CATEGORY_MAP, "새가게", "생활/편의점")
+        rebuild_rule_matcher()
+        try:
+            assert classify_transaction("새가게", "")["category"] == "생활/편의점"
+            assert get_classification_cache_stats()["invalidations"] == 1
+        finally:
+            monkeypatch.undo()
+            rebuild_rule_matcher()
+
+        assert classify_transaction("새가게", "")["category"] == "기타"
@@ -2,32 +2,49 @@
 분류기 테스트
 """
 
-import pytest
+from services.category_rules import RULE_CONFIDENCE
+from services.classifier import classify_single_transaction, classify_transactions_batch
+from tests.conftest import make_transaction
 
-from services.classifier import TransactionClassifier
 
-
-@pytest.fixture
-def classifier():
-    return TransactionClassifier()
-
-
-def test_classify_food(classifier):
+def test_classify_food(user):
     """식비 카테고리 분류 테스트"""
-    category, confidence = classifier.classify("스타벅스 커피")
-    assert category == "식비"
-    assert confidence > 0
+    result = classify_single_transaction(make_transaction(user.id, "스타벅스 커피"))
+    assert result["category"] == "식비/카페"
+    assert result["confidence"] > 0
 
 
-def test_classify_transport(classifier):
+def test_classify_transport(user):
     """교통비 카테고리 분류 테스트"""
-    category, confidence = classifier.classify("지하철 요금")
-    assert category == "교통비"
-    assert confidence > 0
+    result = classify_single_transaction(make_transaction(user.id, "지하철 요금"))
+    assert result["category"] == "교통"
+    assert result["confidence"] > 0
 
 
-def test_classify_unknown(classifier):
+def test_classify_unknown(user):
     """알 수 없는 항목은 기타로 분류"""
-    category, confidence = classifier.classify("알 수 없는 항목")
-    assert category == "기타"
-    assert confidence == 0.3
+    result = classify_single_transaction(make_transaction(user.id, "알 수 없는 항목"))
+    assert result["category"] == "기타"
+    assert result["confidence"] == RULE_CONFIDENCE["default"]
+    assert result["needs_review"]
+
+
+def test_batch_matches_single(user):
+    """일괄 분류 결과는 단건 분류와 같아야 한다"""
+    transactions = [
+        make_transaction(user.id, merchant, memo)
+        for merchant, memo in [
+            ("스타벅스 커피", ""),
+            ("지하철 요금", ""),
+            ("알 수 없는 항목", ""),
+            ("동네 가게", "라면"),
+        ]
+    ]
+
+    batch = classify_transactions_batch(transactions)
+
+    for index, transaction in enumerate(transactions):
+        single = classify_single_transaction(transaction)
+        assert batch["category"][index] == single["category"]
+        assert batch["confidence"][index] == single["confidence"]
+        assert batch["needs_review"][index] == single["needs_review"]
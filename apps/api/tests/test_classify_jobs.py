@@ -0,0 +1,150 @@
+"""
+백그라운드 분류 작업 테스트
+"""
+
+import threading
+import time
+
+import pytest
+from sqlmodel import select
+
+from models.transaction import Transaction
+from services.classifier import classify_all_unclassified
+from services.classify_jobs import ClassifyJobManager, set_job_manager
+from tests.conftest import make_transaction
+
+
+def wait_for(job, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while job.active and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not job.active
+
+
+@pytest.fixture
+def manager(engine):
+    manager = ClassifyJobManager(engine, max_workers=2)
+    set_job_manager(manager)
+    yield manager
+    set_job_manager(None)
+    manager.shutdown()
+
+
+@pytest.fixture
+def unclassified(session, user):
+    for merchant, memo in [("스타벅스", ""), ("GS25", ""), ("모르는 곳", "택시"), ("알 수 없는 가맹점", "")]:
+        session.add(make_transaction(user.id, merchant, memo))
+    session.commit()
+
+
+def test_job_reports_progress_and_result(session, user, unclassified, manager):
+    job, created = manager.submit(user.id, chunk_size=1)
+    assert created
+    wait_for(job)
+
+    assert job.status == "succeeded"
+    assert job.rows_done == job.rows_total == 4
+    assert job.throughput > 0
+    assert job.result["total_classified"] == 4
+    assert session.exec(select(Transaction).where(Transaction.category.is_(None))).all() == []
+
+
+def test_one_active_job_per_user(user, manager, monkeypatch):
+    release = threading.Event()
+
+    def blocking_classify(session, user_id, **kwargs):
+        release.wait(5)
+        return {"total_classified": 0, "by_category": {}, "needs_review_count": 0}
+
+    monkeypatch.setattr("services.classify_jobs.classify_all_unclassified", blocking_classify)
+
+    first, created = manager.submit(user.id)
+    second, created_again = manager.submit(user.id)
+    assert created and not created_again
+    assert second is first
+
+    release.set()
+    wait_for(first)
+    third, created = manager.submit(user.id)
+    assert created and third is not first
+    wait_for(third)
+
+
+def test_failed_job_records_error(user, manager, monkeypatch):
+    def failing_classify(session, user_id, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr("services.classify_jobs.classify_all_unclassified", failing_classify)
+
+    job, _ = manager.submit(user.id)
+    wait_for(job)
+    assert job.status == "failed"
+    assert job.error == "boom"
+    # 실패한 작업은 사용자 잠금을 풀어야 한다
+    assert manager.submit(user.id)[1]
+
+
+def test_job_endpoints(client, user, unclassified, manager):
+    response = client.post("/api/classify/jobs", params={"chunk_size": 2})
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    wait_for(manager.get(job_id))
+    body = client.get(f"/api/classify/jobs/{job_id}").json()
+    assert body["status"] == "succeeded"
+    assert body["rows_done"] == body["rows_total"] == 4
+    assert body["result"]["total_classified"] == 4
+
+    assert client.get("/api/classify/jobs/unknown").status_code == 404
+
+
+def test_job_endpoint_conflict(client, user, manager, monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(
+        "services.classify_jobs.classify_all_unclassified",
+        lambda session, user_id, **kwargs: release.wait(5) and {
+            "total_classified": 0, "by_category": {}, "needs_review_count": 0
+        },
+    )
+
+    first = client.post("/api/classify/jobs")
+    second = client.post("/api/classify/jobs")
+    release.set()
+
+    assert first.status_code == 202
+    assert second.status_code == 409
+    assert second.json()["detail"]["job_id"] == first.json()["job_id"]
+    wait_for(manager.get(first.json()["job_id"]))
+
+
+def test_sync_classify_shares_per_user_guard(client, session, user, unclassified, manager, monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking_classify(session, user_id, **kwargs):
+        started.set()
+        release.wait(5)
+        return classify_all_unclassified(session, user_id, **kwargs)
+
+    monkeypatch.setattr("services.classify_jobs.classify_all_unclassified", blocking_classify)
+
+    job, _ = manager.submit(user.id)
+    response = client.post("/api/classify")
+    assert response.status_code == 409
+    assert response.json()["detail"]["job_id"] == job.id
+    release.set()
+    wait_for(job)
+
+    # 동기 분류가 실행 중이면 작업 등록도 막힌다
+    started.clear()
+    release.clear()
+    sync = threading.Thread(target=manager.run, args=(session, user.id))
+    sync.start()
+    started.wait(5)
+    running, created = manager.submit(user.id)
+    release.set()
+    sync.join()
+
+    assert not created and running.status == "succeeded"
+    assert running.result == {"total_classified": 0, "by_category": {}, "needs_review_count": 0}
+    assert client.post("/api/classify").status_code == 200
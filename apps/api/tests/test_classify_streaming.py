@@ -0,0 +1,69 @@
+"""
+청크 단위 미분류 거래 분류 테스트
+"""
+
+import pytest
+from sqlmodel import select
+
+from models.transaction import Transaction
+from services.classifier import classify_all_unclassified
+from tests.conftest import make_transaction
+
+SAMPLES = [
+    ("스타벅스", ""),
+    ("GS25", ""),
+    ("알 수 없는 가게", "삼각김밥"),
+    ("알 수 없는 가맹점", ""),
+    ("스타벅스 강남점", ""),
+    ("Kakao T", ""),
+    ("모르는 곳", "택시"),
+]
+
+
+@pytest.fixture
+def unclassified(session, user):
+    for merchant, memo in SAMPLES:
+        session.add(make_transaction(user.id, merchant, memo))
+    session.commit()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1000])
+def test_totals_independent_of_chunk_size(session, user, unclassified, chunk_size):
+    result = classify_all_unclassified(session, user_id=user.id, chunk_size=chunk_size)
+
+    assert result == {
+        "total_classified": 7,
+        "by_category": {"식비/카페": 2, "생활/편의점": 2, "기타": 1, "교통": 2},
+        "needs_review_count": 1,
+    }
+
+
+def test_rows_updated_and_committed(session, user, unclassified):
+    classify_all_unclassified(session, user_id=user.id, chunk_size=2)
+
+    session.expire_all()
+    rows = session.exec(select(Transaction).order_by(Transaction.id)).all()
+    assert all(row.category is not None for row in rows)
+    assert rows[0].category == "식비/카페"
+    assert rows[0].confidence == 0.95
+    assert rows[3].needs_review is True
+    assert all(row.updated_at is not None for row in rows)
+    assert {row.category_source for row in rows} == {"rule"}
+
+
+def test_only_unclassified_rows_of_user(session, user, unclassified):
+    session.add(make_transaction(user.id, "스타벅스", category="직접입력"))
+    session.commit()
+
+    first = classify_all_unclassified(session, user_id=user.id, chunk_size=2)
+    second = classify_all_unclassified(session, user_id=user.id, chunk_size=2)
+    other_user = classify_all_unclassified(session, user_id=user.id + 1)
+
+    assert first["total_classified"] == len(SAMPLES)
+    assert second["total_classified"] == 0
+    assert other_user["total_classified"] == 0
+
+
+def test_invalid_chunk_size(session, user):
+    with pytest.raises(ValueError):
+        classify_all_unclassified(session, user_id=user.id, chunk_size=0)
@@ -0,0 +1,118 @@
+"""
+코호트 통계 배치 작업 테스트
+"""
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from models.cohort_stat import CohortStat
+from services.cohort_stats import (
+    cohort_comparison,
+    cohort_sketches,
+    compute_cohort_sketches,
+    write_cohort_stats,
+)
+from tests.conftest import make_transaction
+
+
+def cohort_transactions(first_user_id: int = 1):
+    """사용자 10명: 서울 6명(월 지출 1만, 2만, ..., 6만), 부산 4명"""
+    rows = []
+    for offset in range(10):
+        user_id = first_user_id + offset
+        city = "서울" if offset < 6 else "부산"
+        rows.append(
+            make_transaction(
+                user_id,
+                "스타벅스",
+                date="2025-03-02",
+                amount_krw=5000 * (offset + 1),
+                city=city,
+                category="식비/카페",
+            )
+        )
+        rows.append(
+            make_transaction(
+                user_id,
+                "카카오T",
+                date="2025-03-20",
+                amount_krw=5000 * (offset + 1),
+                city=city,
+                category="교통",
+                channel="app",
+            )
+        )
+    return rows
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    url = f"sqlite:///{tmp_path / 'cohort.db'}"
+    engine = create_engine(url)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all(cohort_transactions())
+        session.commit()
+    engine.dispose()
+    return url
+
+
+def test_process_pool_matches_single_process(database_url):
+    single, timing = compute_cohort_sketches(database_url, workers=1)
+    pooled, pooled_timing = compute_cohort_sketches(database_url, workers=2)
+
+    assert {key: sketch.bins for key, sketch in pooled.items()} == {
+        key: sketch.bins for key, sketch in single.items()
+    }
+    assert timing["rows"] == pooled_timing["rows"] == 20
+    assert pooled_timing["partitions"] == 8
+
+    seoul = single[("city", "서울", "2025-03", "*")]
+    assert seoul.count == 6
+    assert seoul.quantiles([0.5])[0] == pytest.approx(30000, rel=0.01)
+
+
+def write_stats(session, transactions) -> int:
+    session.add_all(transactions)
+    session.commit()
+    rows = [
+        (txn.user_id, txn.date, txn.category, txn.city, txn.channel, txn.payment_type, txn.amount_krw)
+        for txn in transactions
+    ]
+    written = write_cohort_stats(session, cohort_sketches(rows), min_users=5)
+    session.commit()
+    return written
+
+
+def test_write_and_compare(session):
+    written = write_stats(session, cohort_transactions(first_user_id=100))
+
+    stats = session.exec(select(CohortStat)).all()
+    assert written == len(stats)
+    # 부산(4명)은 최소 인원 미만이라 저장하지 않는다
+    assert {stat.value for stat in stats if stat.dimension == "city"} == {"서울"}
+
+    # 서울 사용자 6명 중 세 번째 (월 3만원)
+    result = cohort_comparison(session, 102, "2025-03", dimension="city")
+    assert result["value"] == "서울"
+    total = next(item for item in result["categories"] if item["category"] == "전체")
+    assert total["amount"] == 30000
+    assert total["user_count"] == 6
+    assert total["percentile"] == pytest.approx(50)
+    assert total["p50"] == pytest.approx(30000, rel=0.01)
+
+
+def test_cohort_endpoint(client, session, user):
+    write_stats(session, cohort_transactions(first_user_id=user.id))
+
+    response = client.get("/api/aggregate/cohort", params={"month": "2025-03", "dimension": "all"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["value"] == ""
+    assert {item["category"] for item in body["categories"]} == {"전체", "식비/카페", "교통"}
+
+
+@pytest.mark.parametrize("month", ["2025-13", "2025-00"])
+def test_cohort_endpoint_rejects_invalid_month(client, month):
+    response = client.get("/api/aggregate/cohort", params={"month": month, "dimension": "all"})
+    assert response.status_code == 422
@@ -0,0 +1,128 @@
+"""
+컬럼 저장소 집계 테스트
+"""
+
+import random
+
+import pytest
+
+from services.aggregate_cache import bump_user_data_version
+from services.aggregator import _aggregate_rollup, aggregate_columns, aggregate_transactions
+from services.classifier import classify_all_unclassified
+from services.columnar_store import ColumnarStore, set_columnar_store
+from tests.conftest import make_transaction
+from tests.test_aggregator import save
+
+WINDOWS = [("2024-11-01", "2025-03-31"), ("2024-12-29", "2025-01-06"), ("2025-02-10", "2025-02-10")]
+
+
+def random_transactions(user_id: int, count: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [
+        make_transaction(
+            user_id,
+            rng.choice(["스타벅스", "GS25", "CU", "카카오T", "동네 분식", "서점"]),
+            date=f"{rng.choice(['2024-12', '2025-01', '2025-02'])}-{rng.randint(1, 28):02d}",
+            amount_krw=float(rng.choice([1000, 2500, 4500, 12000, 30000])),
+            category=rng.choice([None, "식비/카페", "생활/편의점", "교통", "미분류"]),
+        )
+        for _ in range(count)
+    ]
+
+
+@pytest.fixture
+def store():
+    store = ColumnarStore(budget_bytes=64 * 1024 * 1024)
+    set_columnar_store(store)
+    yield store
+    set_columnar_store(None)
+
+
+@pytest.mark.parametrize("range_type", ["day", "week", "month"])
+@pytest.mark.parametrize("series_by_category", [False, True])
+def test_matches_rollup(session, user, range_type, series_by_category):
+    save(session, random_transactions(user.id, 500))
+    columns = ColumnarStore(budget_bytes=1 << 30).get(session, user.id)
+
+    for start, end in WINDOWS:
+        args = (start, end, range_type, series_by_category, True)
+        assert aggregate_columns(columns, *args) == _aggregate_rollup(session, user.id, *args)
+
+
+def test_empty_window(session, user):
+    save(session, random_transactions(user.id, 10))
+    columns = ColumnarStore(budget_bytes=1 << 30).get(session, user.id)
+    args = ("2030-01-01", "2030-01-31", "month", False, True)
+    assert aggregate_columns(columns, *args) == _aggregate_rollup(session, user.id, *args)
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_impossible_dates_rejected_on_both_paths(client, session, user, columnar):
+    save(session, random_transactions(user.id, 20))
+    set_columnar_store(ColumnarStore(budget_bytes=1 << 30) if columnar else None)
+    try:
+        response = client.get("/api/aggregate", params={"start": "2025-02-01", "end": "2025-02-30"})
+        assert response.status_code == 400
+        response = client.get("/api/aggregate", params={"start": "2025-02-01", "end": "2025-02-28"})
+        assert response.status_code == 200
+    finally:
+        set_columnar_store(None)
+
+
+def test_incremental_upload_and_classify(client, session, user, store):
+    rows = [
+        {
+            "date": f"2025-01-{day:02d}",
+            "time": "12:00",
+            "merchant": merchant,
+            "memo": "",
+            "amount_krw": 1000 * day,
+            "payment_type": "credit_card",
+            "city": "서울",
+            "channel": "offline",
+        }
+        for day, merchant in [(1, "스타벅스"), (2, "GS25"), (3, "모르는 곳"), (10, "카카오T")]
+    ]
+    client.post("/api/transactions/upload", json={"transactions": rows[:2]})
+    aggregate_transactions(session, user.id, "2025-01-01", "2025-01-31")
+    assert store.stats()["builds"] == 1
+
+    client.post("/api/transactions/upload", json={"transactions": rows[2:]})
+    classify_all_unclassified(session, user_id=user.id, chunk_size=1)
+
+    result = aggregate_transactions(session, user.id, "2025-01-01", "2025-01-31", range_type="week")
+    # 업로드/분류가 모두 증분 반영되어 다시 만들지 않았다
+    assert store.stats()["builds"] == 1
+    assert result == _aggregate_rollup(session, user.id, "2025-01-01", "2025-01-31", "week", False, True)[0]
+    assert "미분류" not in result["by_category"]
+
+    # 다른 프로세스의 변경처럼 버전만 바뀌면 다시 만든다
+    bump_user_data_version(user.id)
+    aggregate_transactions(session, user.id, "2025-01-01", "2025-01-31")
+    assert store.stats()["builds"] == 2
+
+
+def test_append_skips_rows_already_built(session, user, store):
+    transactions = random_transactions(user.id, 30)
+    save(session, transactions[:25])
+    # 업로드가 커밋했지만 버전을 올리기 전에 다른 요청이 DB에서 만든 경우 (20~24번이 이미 들어감)
+    previous = store.get(session, user.id).version
+    save(session, transactions[25:])
+
+    store.append(user.id, transactions[20:], previous, bump_user_data_version(user.id))
+
+    columns = store.get(session, user.id)
+    assert store.stats()["builds"] == 1
+    assert columns.ids.tolist() == sorted(txn.id for txn in transactions)
+
+
+def test_evicts_least_recently_used(session, user):
+    save(session, random_transactions(user.id, 200) + random_transactions(user.id + 1, 200, seed=1))
+    store = ColumnarStore(budget_bytes=0)
+
+    store.get(session, user.id)
+    store.get(session, user.id + 1)
+
+    stats = store.stats()
+    assert stats["users"] == 1
+    assert stats["evictions"] == 1
@@ -0,0 +1,90 @@
+"""
+여러 기간 비교 테스트
+"""
+
+import pytest
+
+from services.aggregator import aggregate_transactions, compare_windows
+from services.columnar_store import ColumnarStore, set_columnar_store
+from tests.conftest import make_transaction
+from tests.test_aggregator import save
+from tests.test_columnar_store import random_transactions
+
+WINDOWS = [
+    ("2025-01-01", "2025-01-31"),
+    ("2024-12-01", "2024-12-31"),
+    ("2024-12-20", "2025-01-10"),
+    ("2030-01-01", "2030-01-31"),
+]
+
+
+def test_matches_separate_aggregates(session, user):
+    save(session, random_transactions(user.id, 500))
+    result = compare_windows(session, user.id, WINDOWS)
+
+    for (start, end), summary in zip(WINDOWS, result["windows"], strict=True):
+        expected = aggregate_transactions(session, user.id, start, end)
+        assert summary["total_amount"] == expected["total_amount"]
+        assert list(summary["by_category"].items()) == list(expected["by_category"].items())
+
+
+def test_columnar_matches_rollup(session, user):
+    save(session, random_transactions(user.id, 500))
+    expected = compare_windows(session, user.id, WINDOWS)
+
+    # 기간 길이와 무관하게 범위 안 행만 묶는다 (일 × 카테고리 격자를 만들지 않음)
+    wide = [("0001-01-01", "9999-12-31"), ("2025-01-31", "2025-01-01")]
+    expected_wide = compare_windows(session, user.id, wide)
+
+    set_columnar_store(ColumnarStore(budget_bytes=1 << 30))
+    try:
+        assert compare_windows(session, user.id, WINDOWS) == expected
+        assert compare_windows(session, user.id, wide) == expected_wide
+    finally:
+        set_columnar_store(None)
+
+
+def test_deltas(session, user):
+    save(
+        session,
+        [
+            make_transaction(user.id, "스타벅스", date="2025-02-03", amount_krw=6000.0, category="식비/카페"),
+            make_transaction(user.id, "카카오T", date="2025-02-04", amount_krw=4000.0, category="교통"),
+            make_transaction(user.id, "스타벅스", date="2025-01-03", amount_krw=5000.0, category="식비/카페"),
+            make_transaction(user.id, "서점", date="2025-01-09", amount_krw=3000.0, category="문화"),
+        ],
+    )
+    result = compare_windows(
+        session, user.id, [("2025-02-01", "2025-02-28"), ("2025-01-01", "2025-01-31"), ("2024-02-01", "2024-02-29")]
+    )
+
+    assert [summary["transaction_count"] for summary in result["windows"]] == [2, 2, 0]
+    assert result["deltas"][0] == {
+        "start": "2025-01-01",
+        "end": "2025-01-31",
+        "total_amount": 2000.0,
+        "total_pct": 25.0,
+        "by_category": {"식비/카페": 1000.0, "교통": 4000.0, "문화": -3000.0},
+    }
+    assert result["deltas"][1]["total_pct"] is None
+
+
+def test_requires_window(session, user):
+    with pytest.raises(ValueError):
+        compare_windows(session, user.id, [])
+
+
+def test_compare_endpoint(client, session, user):
+    save(session, random_transactions(user.id, 50))
+    params = [("window", f"{start}..{end}") for start, end in WINDOWS[:2]]
+
+    response = client.get("/api/aggregate/compare", params=params)
+    assert response.status_code == 200
+    body = response.json()
+    assert body == compare_windows(session, user.id, WINDOWS[:2])
+
+    assert client.get("/api/aggregate/compare", params=[("window", "2025-01-01")]).status_code == 400
+    assert client.get("/api/aggregate/compare", params=params * 7).status_code == 400
+    # 없는 날짜, 너무 긴 기간
+    assert client.get("/api/aggregate/compare", params=[("window", "2025-02-01..2025-02-30")]).status_code == 400
+    assert client.get("/api/aggregate/compare", params=[("window", "0001-01-01..9999-12-31")]).status_code == 400
@@ -0,0 +1,125 @@
+"""
+일별 지출 롤업 테스트
+"""
+
+import random
+import threading
+
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from models.daily_spend import DailySpend
+from services import classifier
+from services.classifier import classify_all_unclassified
+from services.daily_rollup import ensure_daily_spend, rebuild_daily_spend
+from tests.conftest import make_transaction
+from tests.test_aggregator import save
+
+
+def rollup_snapshot(session) -> dict:
+    session.expire_all()
+    return {
+        (row.user_id, row.date, row.category, row.merchant): (row.amount_sum, row.txn_count)
+        for row in session.exec(select(DailySpend))
+    }
+
+
+def upload_rows(count: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "date": f"2025-02-{rng.randint(1, 5):02d}",
+            "time": f"{seed:02d}:{index // 60:02d}:{index % 60:02d}",  # 지문이 겹치지 않게
+            "merchant": rng.choice(["스타벅스", "GS25", "동네 가게", "모르는 곳"]),
+            "memo": rng.choice(["", "택시", "라면"]),
+            "amount_krw": rng.choice([1000, 4500, 12000]),
+            "payment_type": "credit_card",
+            "city": "서울",
+            "channel": "offline",
+        }
+        for index in range(count)
+    ]
+
+
+def test_upload_updates_rollup(client, session, user):
+    client.post("/api/transactions/upload", json={"transactions": upload_rows(50)})
+    client.post("/api/transactions/upload?classify=true", json={"transactions": upload_rows(30, 1)})
+
+    incremental = rollup_snapshot(session)
+    assert sum(count for _, count in incremental.values()) == 80
+
+    rebuild_daily_spend(session, user.id)
+    session.commit()
+    assert rollup_snapshot(session) == incremental
+
+
+def test_reclassification_moves_rollup(client, session, user):
+    client.post("/api/transactions/upload", json={"transactions": upload_rows(60)})
+    assert {category for _, _, category, _ in rollup_snapshot(session)} == {""}
+
+    classify_all_unclassified(session, user_id=user.id, chunk_size=7)
+
+    incremental = rollup_snapshot(session)
+    assert "" not in {category for _, _, category, _ in incremental}
+    rebuild_daily_spend(session, user.id)
+    session.commit()
+    assert rollup_snapshot(session) == incremental
+
+
+def test_concurrent_classification_moves_rows_once(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'classify.db'}", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        save(session, [make_transaction(1, "스타벅스", amount_krw=1000) for _ in range(5)])
+
+    # 두 작업이 같은 미분류 거래를 모두 읽은 뒤에 UPDATE하도록 맞춘다
+    barrier = threading.Barrier(2, timeout=5)
+    batch = classifier.classify_transactions_batch
+
+    def classify_after_both_read(*args, **kwargs):
+        barrier.wait()
+        return batch(*args, **kwargs)
+
+    monkeypatch.setattr(classifier, "classify_transactions_batch", classify_after_both_read)
+    results = []
+
+    def run():
+        with Session(engine) as session:
+            results.append(classify_all_unclassified(session, user_id=1))
+
+    threads = [threading.Thread(target=run) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(result["total_classified"] for result in results) == [0, 5]
+    with Session(engine) as session:
+        assert rollup_snapshot(session) == {(1, "2025-01-15", "식비/카페", "스타벅스"): (5000, 5)}
+    engine.dispose()
+
+
+def test_aggregate_reads_rollup(client, session, user):
+    client.post("/api/transactions/upload", json={"transactions": upload_rows(20)})
+
+    before = client.get("/api/aggregate", params={"start": "2025-02-01", "end": "2025-02-28"}).json()
+    classify_all_unclassified(session, user_id=user.id)
+    after = client.get("/api/aggregate", params={"start": "2025-02-01", "end": "2025-02-28"}).json()
+
+    assert before["by_category"] == {"미분류": before["total_amount"]}
+    assert "미분류" not in after["by_category"]
+    assert after["total_amount"] == before["total_amount"]
+    assert after["daily_totals"] == before["daily_totals"]
+
+
+def test_ensure_backfills_empty_rollup(engine, client, session, user):
+    client.post("/api/transactions/upload", json={"transactions": upload_rows(10)})
+    expected = rollup_snapshot(session)
+
+    with Session(engine) as other:
+        for row in other.exec(select(DailySpend)):
+            other.delete(row)
+        other.commit()
+    assert rollup_snapshot(session) == {}
+
+    ensure_daily_spend(engine)
+    assert rollup_snapshot(session) == expected
@@ -0,0 +1,113 @@
+"""
+LLM 분류 백엔드 테스트 (오프라인 가짜 백엔드/서버 사용)
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from services.classifier import classify_all_unclassified
+from services.llm_backend import (
+    HTTPLLMBackend,
+    LLMClassifier,
+    LLMResultStore,
+    StubLLMBackend,
+    create_stub_llm_app,
+    set_llm_classifier,
+)
+from tests.conftest import make_transaction
+
+
+def make_items(count: int) -> list[dict]:
+    return [{"merchant": f"OO대학교 {index}호관", "memo": ""} for index in range(count)]
+
+
+class SlowBackend:
+    """첫 호출만 타임아웃보다 오래 걸리는 백엔드"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def classify(self, items):
+        self.calls += 1
+        if self.calls == 1:
+            await asyncio.sleep(1)
+        return [{"category": "교육", "confidence": 0.8, "rationale": ""} for _ in items]
+
+
+async def test_micro_batching_and_concurrency_limit():
+    backend = StubLLMBackend(latency=0.01)
+    classifier = LLMClassifier(backend, batch_size=10, max_concurrency=3)
+
+    results = await classifier.classify_many(make_items(95))
+
+    assert backend.calls == 10
+    assert backend.max_in_flight == 3
+    assert all(result["category"] == "교육" for result in results)
+
+
+async def test_duplicate_merchants_requested_once():
+    backend = StubLLMBackend()
+    classifier = LLMClassifier(backend, batch_size=100)
+
+    items = [{"merchant": "CGV 강남점", "memo": ""}, {"merchant": "cgv 강남", "memo": "영화"}] * 50
+    results = await classifier.classify_many(items)
+
+    assert backend.calls == 1
+    assert len(results) == 100
+    assert results[-1]["category"] == "문화/여가"
+
+
+async def test_timeout_returns_none_for_failed_batch():
+    backend = SlowBackend()
+    classifier = LLMClassifier(backend, batch_size=2, max_concurrency=1, timeout=0.05)
+
+    results = await classifier.classify_many(make_items(4))
+
+    assert results[:2] == [None, None]
+    assert results[2]["category"] == "교육"
+
+
+async def test_persistent_cache_skips_backend(engine):
+    store = LLMResultStore(engine)
+    first = StubLLMBackend()
+    await LLMClassifier(first, store=store).classify_many(make_items(3))
+
+    second = StubLLMBackend()
+    results = await LLMClassifier(second, store=store).classify_many(make_items(3))
+
+    assert first.calls == 1
+    assert second.calls == 0
+    assert [result["category"] for result in results] == ["교육"] * 3
+
+
+async def test_http_backend_against_stub_server():
+    transport = httpx.ASGITransport(app=create_stub_llm_app())
+    backend = HTTPLLMBackend("http://llm.local/classify", transport=transport)
+
+    results = await LLMClassifier(backend, batch_size=2).classify_many(
+        [{"merchant": "서울대학교", "memo": ""}, {"merchant": "온누리약국", "memo": ""}, {"merchant": "???", "memo": ""}]
+    )
+
+    assert [result["category"] for result in results] == ["교육", "의료/건강", "기타"]
+
+
+@pytest.fixture
+def stub_llm(engine):
+    backend = StubLLMBackend()
+    set_llm_classifier(LLMClassifier(backend, store=LLMResultStore(engine)))
+    yield backend
+    set_llm_classifier(None)
+
+
+def test_classify_all_unclassified_with_llm(session, user, stub_llm):
+    for merchant in ["스타벅스", "OO대학교 학생식당", "OO대학교 학생식당", "CGV", "알 수 없는 가게"]:
+        session.add(make_transaction(user.id, merchant))
+    session.commit()
+
+    result = classify_all_unclassified(session, user_id=user.id, use_llm=True)
+
+    assert stub_llm.calls == 1
+    assert result["by_category"] == {"식비/카페": 1, "교육": 2, "문화/여가": 1, "기타": 1}
+    assert result["needs_review_count"] == 1
@@ -0,0 +1,173 @@
+"""
+스키마 마이그레이션 테스트
+"""
+
+import pytest
+from sqlalchemy import BigInteger, Date, Time, inspect, text
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, create_engine, select
+
+from migrations import applied_versions, discover_migrations, migrate
+from models.transaction import Transaction, transaction_fingerprint
+from services.aggregator import aggregate_transactions
+from services.daily_rollup import ensure_daily_spend
+from services.transaction_ingest import insert_transactions, validate_transactions
+
+LEGACY_SCHEMA = """
+CREATE TABLE users (id INTEGER NOT NULL PRIMARY KEY, email VARCHAR NOT NULL);
+CREATE TABLE transactions (
+    id INTEGER NOT NULL PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users (id),
+    date VARCHAR NOT NULL,
+    time VARCHAR NOT NULL,
+    merchant VARCHAR NOT NULL,
+    memo VARCHAR NOT NULL,
+    amount_krw FLOAT NOT NULL,
+    payment_type VARCHAR NOT NULL,
+    city VARCHAR NOT NULL,
+    channel VARCHAR NOT NULL,
+    category VARCHAR,
+    confidence FLOAT,
+    needs_review BOOLEAN NOT NULL,
+    created_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL,
+    updated_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL
+);
+CREATE INDEX ix_transactions_user_id ON transactions (user_id);
+INSERT INTO users (id, email) VALUES (1, 'legacy@example.com');
+"""
+
+
+@pytest.fixture
+def legacy_engine():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    with engine.begin() as connection:
+        for statement in LEGACY_SCHEMA.split(";"):
+            if statement.strip():
+                connection.execute(text(statement))
+        for index in range(7):
+            connection.execute(
+                text(
+                    "INSERT INTO transactions (user_id, date, time, merchant, memo, amount_krw,"
+                    " payment_type, city, channel, category, needs_review)"
+                    " VALUES (1, :date, :time, :merchant, '', :amount, 'credit_card', '서울',"
+                    " 'offline', :category, 0)"
+                ),
+                {
+                    "date": f"2025-01-{index + 1:02d}",
+                    "time": "08:30",
+                    "merchant": f"가맹점 {index}",
+                    "amount": 1000.4 + index,
+                    "category": "식비/카페" if index % 2 else None,
+                },
+            )
+    yield engine
+    engine.dispose()
+
+
+def test_upgrades_legacy_database(legacy_engine, monkeypatch):
+    migration = discover_migrations()[0]
+    monkeypatch.setattr(migration.module, "BATCH_SIZE", 3)
+
+    versions = [migration.version for migration in discover_migrations()]
+    assert migrate(legacy_engine) == versions
+
+    inspector = inspect(legacy_engine)
+    types = {column["name"]: column["type"] for column in inspector.get_columns("transactions")}
+    assert isinstance(types["date"], Date)
+    assert isinstance(types["time"], Time)
+    assert isinstance(types["amount_krw"], BigInteger)
+    indexes = {index["name"]: index["column_names"] for index in inspector.get_indexes("transactions")}
+    assert indexes == {
+        "ix_transactions_user_order": ["user_id", "date", "time", "id"],
+        "ix_transactions_user_category": ["user_id", "category"],
+        "ix_transactions_fingerprint": ["fingerprint"],
+    }
+
+    with Session(legacy_engine) as session:
+        rows = session.exec(select(Transaction).order_by(Transaction.id)).all()
+        assert [(row.date, row.time, row.amount_krw) for row in rows[:2]] == [
+            ("2025-01-01", "08:30", 1000),
+            ("2025-01-02", "08:30", 1001),
+        ]
+        # 문자열 날짜로 범위 조회
+        assert len(session.exec(select(Transaction).where(Transaction.date <= "2025-01-03")).all()) == 3
+
+    # 롤업이 새 타입에서 다시 만들어지는지
+    ensure_daily_spend(legacy_engine)
+    with Session(legacy_engine) as session:
+        result = aggregate_transactions(session, 1, "2025-01-01", "2025-01-31")
+    assert result["total_amount"] == sum(round(1000.4 + index) for index in range(7))
+
+    # 다시 실행하면 아무것도 하지 않는다
+    assert migrate(legacy_engine) == []
+    assert applied_versions(legacy_engine) == set(versions)
+
+
+def test_resumes_interrupted_backfill(legacy_engine):
+    migration = discover_migrations()[0]
+    migration.module._add_columns(legacy_engine)
+    with legacy_engine.begin() as connection:
+        migration.module._backfill(connection, limit=2)
+
+    migration.upgrade(legacy_engine)
+
+    with Session(legacy_engine) as session:
+        assert session.exec(select(Transaction.amount_krw).order_by(Transaction.id)).all() == [
+            round(1000.4 + index) for index in range(7)
+        ]
+
+
+def test_fingerprints_keep_first_of_existing_duplicates(legacy_engine, monkeypatch):
+    migration = next(m for m in discover_migrations() if m.name == "transaction_fingerprint")
+    monkeypatch.setattr(migration.module, "BATCH_SIZE", 3)
+    with legacy_engine.begin() as connection:
+        # id 8, 9는 id 1, 5와 같은 거래 (다른 배치)
+        connection.execute(
+            text(
+                "INSERT INTO transactions (user_id, date, time, merchant, memo, amount_krw,"
+                " payment_type, city, channel, needs_review)"
+                " SELECT user_id, date, time, merchant, '중복', amount_krw, payment_type, city,"
+                " channel, 0 FROM transactions WHERE id IN (1, 5)"
+            )
+        )
+
+    migrate(legacy_engine)
+
+    with Session(legacy_engine) as session:
+        rows = session.exec(select(Transaction).order_by(Transaction.id)).all()
+        assert [row.id for row in rows if row.fingerprint is None] == [8, 9]
+        assert rows[0].fingerprint == transaction_fingerprint(1, "2025-01-01", "08:30", "가맹점 0", 1000)
+        assert len({row.fingerprint for row in rows[:7]}) == 7
+
+        # 다시 올린 같은 거래는 건너뜀
+        upload, _ = validate_transactions(
+            [
+                {
+                    "date": "2025-01-01",
+                    "time": "08:30",
+                    "merchant": "가맹점 0",
+                    "amount_krw": 1000,
+                    "payment_type": "credit_card",
+                    "city": "서울",
+                    "channel": "offline",
+                }
+            ]
+        )
+        assert insert_transactions(session, 1, upload) == []
+
+
+def test_rejects_invalid_values(legacy_engine):
+    with legacy_engine.begin() as connection:
+        connection.execute(text("UPDATE transactions SET date = '2025-13-01' WHERE id = 4"))
+
+    with pytest.raises(ValueError, match="거래 4"):
+        migrate(legacy_engine)
+
+
+def test_new_database_is_stamped():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    assert migrate(engine) == []
+    assert applied_versions(engine) == {migration.version for migration in discover_migrations()}
+    engine.dispose()
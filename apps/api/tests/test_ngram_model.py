@@ -0,0 +1,114 @@
+"""
+문자 n-gram 분류 모델 테스트
+"""
+
+import numpy as np
+import pytest
+
+from services.classifier import classify_single_transaction, classify_transactions_batch
+from services.ngram_model import NgramModel, load_training_data, set_ngram_model, train_ngram_model
+from tests.conftest import make_transaction
+
+TRAINING = [
+    ("동네분식", "떡볶이", "식비/외식"),
+    ("엄마손분식", "김밥", "식비/외식"),
+    ("행복분식 2호점", "", "식비/외식"),
+    ("OO대학교 생협", "교재", "교육"),
+    ("XX대학교 서점", "전공책", "교육"),
+    ("대학문고", "", "교육"),
+    ("튼튼약국", "감기약", "의료/건강"),
+    ("온누리약국", "", "의료/건강"),
+    ("참약국", "밴드", "의료/건강"),
+]
+
+
+@pytest.fixture
+def model(tmp_path):
+    merchants, memos, labels = zip(*(TRAINING * 5))
+    train_ngram_model(merchants, memos, labels, tmp_path, n_features=2**12)
+    return NgramModel.load(tmp_path)
+
+
+def test_artifact_is_memory_mapped(model):
+    assert isinstance(model.coef, np.memmap)
+    assert model.coef.shape == (2**12, 3)
+
+
+def test_predict_batch(model):
+    categories, confidences = model.predict(["새마을분식", "새마을분식", "행복약국"], ["", "", ""])
+
+    assert list(categories) == ["식비/외식", "식비/외식", "의료/건강"]
+    assert confidences[0] == confidences[1]
+    assert np.all((confidences > 0) & (confidences <= 1))
+
+
+def test_predict_empty(model):
+    categories, confidences = model.predict([], [])
+    assert len(categories) == len(confidences) == 0
+
+
+def test_binary_training(tmp_path):
+    rows = [row for row in TRAINING if row[2] != "교육"] * 3
+    merchants, memos, labels = zip(*rows)
+    train_ngram_model(merchants, memos, labels, tmp_path, n_features=2**12)
+
+    categories, _ = NgramModel.load(tmp_path).predict(["새약국"])
+    assert list(categories) == ["의료/건강"]
+
+
+def test_single_class_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        train_ngram_model(["a", "b"], ["", ""], ["교육", "교육"], tmp_path)
+
+
+def test_model_tier_between_rules_and_llm(model, monkeypatch):
+    monkeypatch.setattr("services.classifier.NGRAM_MIN_CONFIDENCE", 0.6)
+    set_ngram_model(model)
+    try:
+        transactions = [
+            make_transaction(1, "스타벅스"),
+            make_transaction(1, "새마을분식"),
+            make_transaction(1, "zzz", "qqq"),
+        ]
+        result = classify_transactions_batch(transactions)
+    finally:
+        set_ngram_model(None)
+
+    # 신뢰도가 낮은 예측은 채택하지 않음
+    assert list(result["method"]) == ["merchant", "model", "default"]
+    assert result["category"][1] == "식비/외식"
+    assert result["needs_review"][1] == False  # noqa: E712
+
+
+def test_single_matches_batch_with_model(model, monkeypatch):
+    monkeypatch.setattr("services.classifier.NGRAM_MIN_CONFIDENCE", 0.6)
+    set_ngram_model(model)
+    try:
+        transactions = [make_transaction(1, merchant, memo) for merchant, memo in [
+            ("스타벅스", ""), ("새마을분식", ""), ("행복약국", ""), ("zzz", "qqq"),
+        ]]
+        batch = classify_transactions_batch(transactions)
+        singles = [classify_single_transaction(transaction) for transaction in transactions]
+    finally:
+        set_ngram_model(None)
+
+    assert [single["method"] for single in singles] == list(batch["method"])
+    assert [single["category"] for single in singles] == list(batch["category"])
+    assert [single["confidence"] for single in singles] == list(batch["confidence"])
+    assert [single["needs_review"] for single in singles] == list(batch["needs_review"])
+
+
+def test_load_training_data(session, user):
+    session.add(make_transaction(user.id, "동네분식", category="식비/외식", category_source="rule"))
+    session.add(make_transaction(user.id, "대학문고", category="교육", category_source="manual"))
+    session.add(make_transaction(user.id, "모름", category="기타", needs_review=True, category_source="rule"))
+    session.add(make_transaction(user.id, "미분류"))
+    # 모델/LLM이 정했거나 출처를 모르는 카테고리는 학습하지 않는다
+    session.add(make_transaction(user.id, "새마을분식", category="식비/외식", category_source="model"))
+    session.add(make_transaction(user.id, "참약국", category="의료/건강", category_source="llm"))
+    session.add(make_transaction(user.id, "옛날 거래", category="교통"))
+    session.commit()
+
+    merchants, memos, labels = load_training_data(session)
+    assert merchants == ["동네분식", "대학문고"]
+    assert labels == ["식비/외식", "교육"]
@@ -0,0 +1,113 @@
+"""
+규칙 매칭 인덱스 테스트
+"""
+
+import random
+
+from services.category_rules import (
+    KEYWORD_CATEGORY_MAP,
+    MERCHANT_CATEGORY_MAP,
+    RULE_CONFIDENCE,
+    get_category_by_keyword,
+    get_category_by_merchant,
+    normalize_merchant,
+)
+from services.rule_matcher import NO_MATCH, AhoCorasick, RuleMatcher, SubstringIndex
+
+
+def reference_merchant(merchant: str, rules: dict[str, str]) -> tuple[str | None, float]:
+    """컴파일 이전의 순차 탐색 구현"""
+    normalized = normalize_merchant(merchant)
+    for key, category in rules.items():
+        if normalize_merchant(key) == normalized:
+            return category, RULE_CONFIDENCE["merchant_exact_match"]
+    for key, category in rules.items():
+        if normalize_merchant(key) in normalized or normalized in normalize_merchant(key):
+            return category, RULE_CONFIDENCE["merchant_partial_match"]
+    return None, 0.0
+
+
+def reference_keyword(memo: str, rules: dict[str, str]) -> str | None:
+    memo_lower = memo.lower().strip()
+    for keyword, category in rules.items():
+        if keyword.lower() in memo_lower:
+            return category
+    return None
+
+
+class TestAutomata:
+    """오토마톤 단위 테스트"""
+
+    def test_aho_corasick_returns_smallest_index(self):
+        automaton = AhoCorasick(["버스", "스", "카페"])
+        assert automaton.first_match("시내버스") == 0
+        assert automaton.first_match("스벅") == 1
+        assert automaton.first_match("편의점") == NO_MATCH
+
+    def test_aho_corasick_follows_failure_links(self):
+        automaton = AhoCorasick(["abcd", "bc"])
+        assert automaton.first_match("xabcx") == 1
+
+    def test_substring_index(self):
+        index = SubstringIndex(["t-money transit", "투썸플레이스", "투썸"])
+        assert index.first_container("money") == 0
+        assert index.first_container("투썸") == 1
+        assert index.first_container("플레이") == 1
+        assert index.first_container("스타벅스") == NO_MATCH
+        assert index.first_container("") == 0
+
+    def test_empty_pattern_matches_everything(self):
+        assert AhoCorasick(["abc", ""]).first_match("zzz") == 1
+        assert SubstringIndex([]).first_container("") == NO_MATCH
+
+
+class TestEquivalence:
+    """기존 순차 탐색과 결과 동일성"""
+
+    def test_builtin_rules(self):
+        samples = list(MERCHANT_CATEGORY_MAP) + [
+            "스타벅스 강남점",
+            "GS25 역삼지점",
+            "투썸",
+            "썸",
+            "",
+            "점",
+            "알 수 없는 가맹점",
+            "CU편의점",
+            "kakao",
+            "시내버스",
+        ]
+        for merchant in samples:
+            assert get_category_by_merchant(merchant) == reference_merchant(
+                merchant, MERCHANT_CATEGORY_MAP
+            ), merchant
+
+        for memo in ["라면 샀음", "컵라면", "택시 탔음", "", "  ", "특별한 메모 없음", "피자 치킨"]:
+            expected = reference_keyword(memo, KEYWORD_CATEGORY_MAP) if memo else None
+            category, _ = get_category_by_keyword(memo)
+            assert category == expected, memo
+
+    def test_random_rules(self):
+        rng = random.Random(42)
+        alphabet = "abcab점지"
+
+        def word(max_len: int) -> str:
+            return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, max_len)))
+
+        for _ in range(30):
+            merchant_rules = {word(6): f"m{i}" for i in range(rng.randint(0, 25))}
+            keyword_rules = {word(4): f"k{i}" for i in range(rng.randint(0, 10))}
+            matcher = RuleMatcher(merchant_rules, keyword_rules, normalize_merchant)
+
+            for _ in range(50):
+                merchant = word(8)
+                normalized = normalize_merchant(merchant)
+                category = matcher.match_merchant_exact(normalized)
+                if category is None:
+                    category = matcher.match_merchant_partial(normalized)
+                assert category == reference_merchant(merchant, merchant_rules)[0], merchant
+
+                memo = word(8)
+                assert matcher.match_keyword(memo.lower().strip()) == reference_keyword(
+                    memo, keyword_rules
+                ), memo
@@ -0,0 +1,126 @@
+"""
+규칙 저장소 (외부 소스, 스냅샷 교체) 테스트
+"""
+
+import json
+import os
+
+import pytest
+
+from models.category_rule import CategoryRule, RuleSetVersion
+from services.category_rules import (
+    classify_batch,
+    get_rule_store,
+    normalize_merchant,
+    rebuild_rule_matcher,
+)
+from services.rule_store import DatabaseRuleSource, FileRuleSource, RuleStore
+
+
+def write_rules(path, merchants, keywords=None, bump_mtime=0):
+    path.write_text(
+        json.dumps({"merchants": merchants, "keywords": keywords or {}}, ensure_ascii=False),
+        encoding="utf-8",
+    )
+    if bump_mtime:
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + bump_mtime))
+
+
+@pytest.fixture
+def rules_file(tmp_path):
+    path = tmp_path / "rules.json"
+    write_rules(path, {"학생식당": "식비/외식"}, {"교재": "교육"})
+    return path
+
+
+def test_file_source_swaps_snapshot_on_change(rules_file):
+    store = RuleStore(normalize_merchant)
+    store.set_source(FileRuleSource(rules_file))
+    first = store.current()
+
+    assert first.source == f"file:{rules_file}"
+    assert first.matcher.match_merchant_exact("학생식당") == "식비/외식"
+    assert store.refresh() is False
+
+    write_rules(rules_file, {"학생식당": "식비/카페"}, bump_mtime=10**9)
+    assert store.refresh() is True
+
+    second = store.current()
+    assert second.matcher.version != first.matcher.version
+    assert second.matcher.match_merchant_exact("학생식당") == "식비/카페"
+    # 이전 스냅샷을 받아 간 쪽은 그대로
+    assert first.matcher.match_merchant_exact("학생식당") == "식비/외식"
+
+
+def test_broken_file_keeps_previous_snapshot(rules_file):
+    store = RuleStore(normalize_merchant)
+    store.set_source(FileRuleSource(rules_file))
+    version = store.current().matcher.version
+
+    rules_file.write_text("{not json", encoding="utf-8")
+    assert store.refresh() is False
+    assert store.current().matcher.version == version
+
+
+def test_database_source(engine, session):
+    session.add(CategoryRule(kind="merchant", pattern="학생식당", category="식비/외식", priority=1))
+    session.add(CategoryRule(kind="merchant", pattern="학생", category="교육", priority=2))
+    session.add(CategoryRule(kind="keyword", pattern="교재", category="교육"))
+    session.add(RuleSetVersion(id=1, version=1))
+    session.commit()
+
+    store = RuleStore(normalize_merchant)
+    store.set_source(DatabaseRuleSource(engine))
+    assert store.current().matcher.match_merchant_partial("제2학생식당") == "식비/외식"
+    assert store.refresh() is False
+
+    rule = session.get(CategoryRule, 1)
+    rule.priority = 3
+    session.get(RuleSetVersion, 1).version = 2
+    session.commit()
+
+    assert store.refresh() is True
+    assert store.current().matcher.match_merchant_partial("제2학생식당") == "교육"
+
+
+def test_database_source_without_version_row(engine, session):
+    session.add(CategoryRule(kind="merchant", pattern="학생식당", category="식비/외식"))
+    session.commit()
+
+    store = RuleStore(normalize_merchant)
+    store.set_source(DatabaseRuleSource(engine))
+    assert store.refresh() is False
+
+    session.get(CategoryRule, 1).category = "교육"
+    session.commit()
+
+    assert store.refresh() is True
+    assert store.current().matcher.match_merchant_partial("제2학생식당") == "교육"
+
+
+def test_pinned_matcher_in_batch(rules_file):
+    store = get_rule_store()
+    try:
+        store.set_source(FileRuleSource(rules_file))
+        pinned = store.current().matcher
+
+        write_rules(rules_file, {}, bump_mtime=10**9)
+        store.refresh()
+
+        assert classify_batch(["학생식당"], matcher=pinned)["category"][0] == "식비/외식"
+        assert classify_batch(["학생식당"])["category"][0] == "기타"
+    finally:
+        store.set_source(None)
+        rebuild_rule_matcher()
+
+
+def test_rule_set_info_endpoint(client):
+    rebuild_rule_matcher()
+    response = client.get("/api/classify/rules")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["source"] == "builtin"
+    assert len(body["version"]) == 16
+    assert "hit_rate" in body["cache"]
@@ -0,0 +1,160 @@
+"""
+지출 분포 스케치 테스트
+"""
+
+import threading
+
+import numpy as np
+import pytest
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from models.spend_sketch import SpendSketch
+from services.classifier import classify_all_unclassified
+from services.spend_sketch import (
+    QuantileSketch,
+    apply_sketch_deltas,
+    rebuild_spend_sketches,
+    spend_distribution,
+)
+from tests.conftest import make_transaction
+from tests.test_aggregator import save
+
+
+@pytest.fixture
+def amounts():
+    return np.round(np.random.default_rng(0).lognormal(mean=9, sigma=1.2, size=5000))
+
+
+def test_quantiles_within_relative_accuracy(amounts):
+    sketch = QuantileSketch(0.01)
+    sketch.add_many(amounts)
+
+    ordered = np.sort(amounts)
+    for q, value in zip([0.1, 0.5, 0.9, 0.99], sketch.quantiles([0.1, 0.5, 0.9, 0.99]), strict=True):
+        expected = ordered[int(q * (len(ordered) - 1))]
+        assert abs(value - expected) <= 0.01 * expected
+
+
+def test_serialization_merge_and_subtraction(amounts):
+    first, second = QuantileSketch(), QuantileSketch()
+    first.add_many(amounts[:3000])
+    second.add_many(amounts[3000:])
+
+    restored = QuantileSketch.from_bytes(first.to_bytes())
+    assert restored.bins == first.bins
+    assert len(first.to_bytes()) < 1000
+
+    restored.merge(second)
+    assert restored.count == len(amounts)
+
+    for value in amounts[3000:]:
+        restored.add(value, -1)
+    assert restored.bins == first.bins
+
+
+def test_histogram():
+    sketch = QuantileSketch()
+    for value in [1000, 4000, 6000, 12000, 400000]:
+        sketch.add(value)
+    assert sketch.histogram([0, 5000, 10000, 100000]) == [2, 1, 1, 1]
+    assert QuantileSketch().quantiles([0.5]) == [None]
+
+
+def stored_sketches(session, user_id):
+    return {
+        (row.month, row.kind, row.key): (row.txn_count, QuantileSketch.from_bytes(row.sketch).bins)
+        for row in session.exec(select(SpendSketch).where(SpendSketch.user_id == user_id))
+    }
+
+
+def test_incremental_updates_match_rebuild(session, user):
+    save(
+        session,
+        [
+            make_transaction(user.id, "스타벅스 강남점", date="2025-01-03", amount_krw=4500),
+            make_transaction(user.id, "스타벅스 강남점", date="2025-01-20", amount_krw=6100),
+            make_transaction(user.id, "GS25", date="2025-02-01", amount_krw=2300),
+            make_transaction(user.id, "알 수 없는 가게", date="2025-02-11", amount_krw=15000),
+        ],
+    )
+    classify_all_unclassified(session, user.id)
+    incremental = stored_sketches(session, user.id)
+
+    rebuild_spend_sketches(session, user.id)
+    session.commit()
+    assert incremental == stored_sketches(session, user.id)
+    # 분류된 거래는 미분류 스케치에서 빠진다
+    assert ("2025-01", "category", "") not in incremental
+    assert incremental[("2025-01", "merchant", "스타벅스 강남점")][0] == 2
+
+
+def test_concurrent_new_key_updates_are_not_lost(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'sketch.db'}", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    key = (1, "2025-01", "category", "교통")
+
+    def delta(amount):
+        sketch = QuantileSketch()
+        sketch.add(amount)
+        return {key: sketch}
+
+    with Session(engine) as first:
+        apply_sketch_deltas(first, delta(1000))
+        # 첫 트랜잭션이 커밋하기 전에 시작한 두 번째 갱신은 읽기 전에 기다려야 한다
+        second = threading.Thread(target=lambda: _apply_and_commit(engine, delta(2000)))
+        second.start()
+        second.join(timeout=0.2)
+        first.commit()
+    second.join()
+
+    with Session(engine) as session:
+        row = session.get(SpendSketch, key)
+        assert row.txn_count == 2
+    engine.dispose()
+
+
+def _apply_and_commit(engine, deltas):
+    with Session(engine) as session:
+        apply_sketch_deltas(session, deltas)
+        session.commit()
+
+
+def test_distribution(session, user):
+    save(
+        session,
+        [
+            make_transaction(
+                user.id,
+                "스타벅스",
+                date=f"2025-0{1 + index % 3}-10",
+                amount_krw=1000 * (index + 1),
+                category="식비/카페",
+            )
+            for index in range(9)
+        ]
+        + [make_transaction(user.id, "CU", date="2025-04-01", amount_krw=2000)],
+    )
+    result = spend_distribution(session, user.id, "2025-01", "2025-03", quantiles=[0.5], edges=[0, 4500])
+
+    assert result["overall"]["transaction_count"] == 9
+    [group] = result["groups"]
+    assert group["key"] == "식비/카페"
+    assert group["quantiles"]["p50"] == pytest.approx(5000, rel=0.01)
+    assert group["histogram"] == [
+        {"lower": 0, "upper": 4500, "count": 4},
+        {"lower": 4500, "upper": None, "count": 5},
+    ]
+
+
+def test_distribution_endpoint(client, session, user):
+    save(session, [make_transaction(user.id, "CU", date="2025-04-01", amount_krw=2000)])
+
+    response = client.get(
+        "/api/aggregate/distribution", params={"start": "2025-04", "end": "2025-04", "by": "merchant"}
+    )
+    assert response.status_code == 200
+    assert response.json()["groups"][0]["key"] == "CU"
+    assert response.json()["groups"][0]["quantiles"]["p90"] == pytest.approx(2000, rel=0.01)
+
+    bad_edges = [("start", "2025-04"), ("end", "2025-04"), ("edges", 100), ("edges", 10)]
+    assert client.get("/api/aggregate/distribution", params=bad_edges).status_code == 400
@@ -0,0 +1,171 @@
+"""
+거래 대량 저장 테스트
+"""
+
+import sqlite3
+
+import numpy as np
+from sqlalchemy import event
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from models.transaction import Transaction, transaction_fingerprint
+from models.user import User
+from services import transaction_ingest
+from services.spend_sketch import rebuild_spend_sketches
+from services.transaction_ingest import insert_transactions, validate_transactions
+from tests.conftest import make_transaction
+from tests.test_daily_rollup import upload_rows
+from tests.test_spend_sketch import stored_sketches
+
+VALID = {
+    "date": "2025-03-01",
+    "time": "09:05",
+    "merchant": "스타벅스",
+    "amount_krw": 4500,
+    "payment_type": "credit_card",
+    "city": "서울",
+    "channel": "offline",
+}
+
+
+def test_validate_reports_original_row_numbers():
+    rows = [
+        {**VALID, "extra": "무시"},
+        {**VALID, "date": "2025-02-30", "amount_krw": "많이"},
+        {**VALID, "time": "09:05:30", "memo": "아침", "amount_krw": 1234.5},
+        {**VALID, "amount_krw": float("inf")},
+        {"merchant": "필수 항목 누락"},
+    ]
+
+    validated, rejected = validate_transactions(rows)
+
+    assert validated == [
+        VALID,
+        {**VALID, "time": "09:05:30", "memo": "아침", "amount_krw": 1234},
+    ]
+    assert [row for row, _ in rejected] == [2, 4, 5]
+    assert rejected[0][1].startswith("date: ")
+    assert "; amount_krw: " in rejected[0][1]
+    assert rejected[1][1].startswith("예상치 못한 에러: ")
+    assert rejected[2][1].count("Field required") == 6
+
+
+def test_numeric_amount_strings_accepted():
+    amounts = ["1500", "1500.6", " 1234.4 ", "1.5e3", "abc", "nan", "inf"]
+
+    validated, rejected = validate_transactions([{**VALID, "amount_krw": amount} for amount in amounts])
+
+    assert [row["amount_krw"] for row in validated] == [1500, 1501, 1234, 1500]
+    assert [row for row, _ in rejected] == [5, 6, 7]
+    assert all(reason.startswith("amount_krw: ") for _, reason in rejected)
+
+
+def test_insert_in_chunks_returns_ids_in_input_order(session, user, monkeypatch):
+    monkeypatch.setattr(transaction_ingest, "INGEST_CHUNK_SIZE", 2)
+    session.add(make_transaction(user.id, "기존 거래"))
+    session.commit()
+
+    rows, _ = validate_transactions([{**VALID, "merchant": f"가맹점 {index}"} for index in range(5)])
+    classification = {
+        "category": np.array(["식비/카페"] * 5, dtype=object),
+        "confidence": np.full(5, 0.9),
+        "needs_review": np.array([False, True, False, False, False]),
+        "method": np.array(["merchant", "default", "keyword", "model", "llm"], dtype=object),
+    }
+    inserted = insert_transactions(session, user.id, rows, classification)
+    session.commit()
+
+    stored = {txn.id: txn for txn in session.exec(select(Transaction))}
+    assert len(stored) == 6
+    assert [txn.merchant for txn in inserted] == [f"가맹점 {index}" for index in range(5)]
+    for txn in inserted:
+        row = stored[txn.id]
+        assert (row.merchant, row.date, row.time, row.amount_krw) == (
+            txn.merchant, "2025-03-01", "09:05", 4500
+        )
+        assert (row.category, row.confidence, row.memo) == ("식비/카페", 0.9, "")
+    assert [stored[txn.id].needs_review for txn in inserted] == [False, True, False, False, False]
+    assert [stored[txn.id].category_source for txn in inserted] == ["rule", "rule", "rule", "model", "llm"]
+
+
+def test_chunked_upload_sketches_match_rebuild(client, session, user, monkeypatch):
+    monkeypatch.setattr(transaction_ingest, "INGEST_CHUNK_SIZE", 7)
+    client.post("/api/transactions/upload", json={"transactions": upload_rows(40)})
+    client.post("/api/transactions/upload?classify=true", json={"transactions": upload_rows(25, 1)})
+
+    incremental = stored_sketches(session, user.id)
+    assert sum(count for count, _ in incremental.values()) == 2 * 65
+
+    rebuild_spend_sketches(session, user.id)
+    session.commit()
+    assert stored_sketches(session, user.id) == incremental
+
+
+def test_reupload_skips_duplicates(client, session, user):
+    first = upload_rows(30)
+    response = client.post("/api/transactions/upload", json={"transactions": first})
+    assert (response.json()["accepted"], response.json()["duplicates"]) == (30, 0)
+
+    # 앞 10건은 이미 저장됨, 마지막 행은 같은 요청 안에서 중복
+    overlapping = first[20:] + upload_rows(5, 1) + [{**first[0], "memo": "메모만 다름"}]
+    overlapping.append(overlapping[-2])
+    response = client.post("/api/transactions/upload", json={"transactions": overlapping})
+    assert response.json()["accepted"] == 5
+    assert response.json()["duplicates"] == 12
+    assert response.json()["rejected"] == 0
+
+    assert len(session.exec(select(Transaction)).all()) == 35
+    incremental = stored_sketches(session, user.id)
+    assert sum(count for count, _ in incremental.values()) == 2 * 35
+    rebuild_spend_sketches(session, user.id)
+    session.commit()
+    assert stored_sketches(session, user.id) == incremental
+
+
+def test_fingerprint_is_per_user(session, user):
+    other = User(username="other", email="other@example.com", hashed_password="x")
+    session.add(other)
+    session.commit()
+    rows, _ = validate_transactions([VALID])
+
+    assert len(insert_transactions(session, user.id, rows)) == 1
+    assert len(insert_transactions(session, other.id, rows)) == 1
+    assert insert_transactions(session, user.id, rows) == []
+
+
+def test_concurrent_insert_not_counted_as_ours(tmp_path):
+    path = tmp_path / "ingest.db"
+    engine = create_engine(f"sqlite:///{path}")
+    SQLModel.metadata.create_all(engine)
+    rows, _ = validate_transactions([VALID])
+    competitor = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def insert_from_other_connection(conn, cursor, statement, parameters, context, executemany):
+        # 이 요청이 INSERT하기 직전에 다른 업로드가 같은 거래를 넣으려 한다
+        if not statement.startswith("INSERT INTO transactions") or competitor:
+            return
+        other = sqlite3.connect(path, timeout=0)
+        try:
+            with other:
+                other.execute(
+                    "INSERT INTO transactions (user_id, date, time, merchant, memo, amount_krw,"
+                    " payment_type, city, channel, needs_review, fingerprint) VALUES (?, ?, ?, ?, '', ?, ?, ?, ?, 0, ?)",
+                    (1, "2025-03-01", "09:05", "스타벅스", 4500, "credit_card", "서울", "offline",
+                     transaction_fingerprint(1, "2025-03-01", "09:05", "스타벅스", 4500)),
+                )
+            competitor.append(True)
+        except sqlite3.OperationalError:
+            competitor.append(False)  # 쓰기 잠금 때문에 기다려야 함
+        finally:
+            other.close()
+
+    with Session(engine) as session:
+        inserted = insert_transactions(session, 1, rows)
+        session.commit()
+        stored = session.exec(select(Transaction)).all()
+
+    # 저장된 행은 이 요청과 다른 업로드 중 한쪽에서만 센다
+    assert len(inserted) + competitor.count(True) == len(stored) == 1
+    assert competitor == [False]
+    engine.dispose()
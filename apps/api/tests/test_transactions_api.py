@@ -0,0 +1,224 @@
+"""
+거래 API 테스트
+"""
+
+import csv
+import gzip
+import io
+import json
+
+import pytest
+from sqlmodel import select
+
+from models.transaction import Transaction
+from services import transaction_export
+from tests.conftest import make_transaction
+
+ROWS = [
+    {
+        "date": "2025-01-15",
+        "time": "08:30",
+        "merchant": "스타벅스 강남점",
+        "memo": "",
+        "amount_krw": 4500,
+        "payment_type": "credit_card",
+        "city": "서울",
+        "channel": "offline",
+    },
+    {
+        "date": "2025-01-15",
+        "time": "12:10",
+        "merchant": "알 수 없는 가게",
+        "memo": "라면",
+        "amount_krw": 3000,
+        "payment_type": "debit_card",
+        "city": "서울",
+        "channel": "offline",
+    },
+    {"date": "2025-01-16", "merchant": "필수 항목 누락"},
+]
+
+
+def test_upload_without_classification(client, session):
+    response = client.post("/api/transactions/upload", json={"transactions": ROWS})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["accepted"] == 2
+    assert body["rejected"] == 1
+    assert body["reasons"][0]["row"] == 3
+
+    rows = session.exec(select(Transaction)).all()
+    assert [row.category for row in rows] == [None, None]
+
+
+def test_upload_with_classification(client, session):
+    response = client.post(
+        "/api/transactions/upload", params={"classify": True}, json={"transactions": ROWS}
+    )
+
+    assert response.status_code == 200
+    rows = session.exec(select(Transaction).order_by(Transaction.id)).all()
+    assert [row.category for row in rows] == ["식비/카페", "생활/편의점"]
+    assert [row.confidence for row in rows] == [0.85, 0.75]
+    assert not any(row.needs_review for row in rows)
+
+
+def test_upload_validates_date_time_and_rounds_amount(client, session):
+    rows = [
+        {**ROWS[0], "amount_krw": 1234.6},
+        {**ROWS[0], "date": "2025-02-30"},
+        {**ROWS[0], "time": "25:00"},
+    ]
+    response = client.post("/api/transactions/upload", json={"transactions": rows})
+
+    body = response.json()
+    assert body["accepted"] == 1
+    assert [reason["row"] for reason in body["reasons"]] == [2, 3]
+
+    row = session.exec(select(Transaction)).one()
+    session.refresh(row)
+    assert (row.date, row.time, row.amount_krw) == ("2025-01-15", "08:30", 1235)
+
+
+def collect_pages(client, **params):
+    items, cursor = [], None
+    while True:
+        response = client.get("/api/transactions", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        body = response.json()
+        items.extend(body["items"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return items
+
+
+def test_list_cursor_pagination(client, session, user):
+    # 같은 날짜/시간이 섞여 있어도 id로 순서가 정해진다
+    session.add_all(
+        make_transaction(
+            user.id,
+            f"가게 {index}",
+            date=f"2025-01-{1 + index % 4:02d}",
+            time=f"{9 + index % 3:02d}:00",
+            category="교통" if index % 5 == 0 else None,
+            needs_review=index % 2 == 0,
+        )
+        for index in range(25)
+    )
+    session.add(make_transaction(user.id + 1, "다른 사용자"))
+    session.commit()
+    rows = session.exec(select(Transaction).where(Transaction.user_id == user.id)).all()
+    expected = [row.id for row in sorted(rows, key=lambda row: (row.date, row.time, row.id))]
+
+    assert [item["id"] for item in collect_pages(client, limit=7, order="asc")] == expected
+    assert [item["id"] for item in collect_pages(client, limit=10)] == expected[::-1]
+
+    filtered = collect_pages(client, limit=2, start="2025-01-02", end="2025-01-04", needs_review=False)
+    assert len(filtered) == 12
+    assert all("2025-01-02" <= item["date"] <= "2025-01-04" and not item["needs_review"] for item in filtered)
+    assert [item["merchant"] for item in collect_pages(client, category="교통", order="asc")] == [
+        "가게 0", "가게 20", "가게 5", "가게 10", "가게 15",
+    ]
+
+
+def test_list_rejects_impossible_dates(client):
+    assert client.get("/api/transactions", params={"start": "2025-02-30"}).status_code == 400
+    assert client.get("/api/transactions", params={"end": "2025-13-01"}).status_code == 400
+    assert client.get("/api/transactions", params={"start": "2025-02-28"}).status_code == 200
+
+
+def test_list_cursor_is_stable_under_inserts(client, session, user):
+    session.add_all(make_transaction(user.id, f"가게 {index}", date="2025-01-10") for index in range(6))
+    session.commit()
+
+    first = client.get("/api/transactions", params={"limit": 3, "order": "asc"}).json()
+    # 이미 본 페이지 앞쪽 날짜에 새 거래가 들어와도 다음 페이지가 밀리지 않는다
+    session.add(make_transaction(user.id, "새 거래", date="2025-01-01"))
+    session.commit()
+    second = client.get(
+        "/api/transactions", params={"limit": 3, "order": "asc", "cursor": first["next_cursor"]}
+    ).json()
+
+    assert [item["merchant"] for item in first["items"] + second["items"]] == [
+        f"가게 {index}" for index in range(6)
+    ]
+
+
+def test_list_rejects_bad_cursor(client, session, user):
+    session.add_all(make_transaction(user.id, f"가게 {index}") for index in range(3))
+    session.commit()
+    cursor = client.get("/api/transactions", params={"limit": 1}).json()["next_cursor"]
+
+    assert client.get("/api/transactions", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/api/transactions", params={"cursor": cursor, "order": "asc"}).status_code == 400
+
+
+def test_stats(client, session, user):
+    session.add_all(
+        [
+            make_transaction(user.id, "A", date="2025-01-05", amount_krw=1000, category="교통"),
+            make_transaction(user.id, "B", date="2025-01-20", amount_krw=3000, needs_review=True),
+            make_transaction(user.id, "C", date="2025-02-01", amount_krw=8000, category="교통"),
+            make_transaction(user.id + 1, "다른 사용자", amount_krw=99999),
+        ]
+    )
+    session.commit()
+
+    body = client.get("/api/transactions/stats").json()
+    assert body == {
+        "total_count": 3,
+        "total_amount": 12000,
+        "avg_amount": 4000,
+        "min_amount": 1000,
+        "max_amount": 8000,
+        "needs_review_count": 1,
+        "needs_review_ratio": pytest.approx(1 / 3),
+        "by_month": [
+            {"month": "2025-01", "count": 2, "amount": 4000},
+            {"month": "2025-02", "count": 1, "amount": 8000},
+        ],
+    }
+
+    filtered = client.get("/api/transactions/stats", params={"category": "교통", "end": "2025-01-31"}).json()
+    assert (filtered["total_count"], filtered["total_amount"]) == (1, 1000)
+
+    empty = client.get("/api/transactions/stats", params={"start": "2030-01-01"}).json()
+    assert (empty["total_count"], empty["avg_amount"], empty["min_amount"], empty["by_month"]) == (0, 0, None, [])
+
+
+def test_stats_rejects_impossible_dates(client):
+    response = client.get("/api/transactions/stats", params={"start": "2025-02-30"})
+    assert response.status_code == 400
+    assert client.get("/api/transactions/stats", params={"end": "2024-02-29"}).status_code == 200
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_export(client, session, user, monkeypatch, compress):
+    monkeypatch.setattr(transaction_export, "EXPORT_BATCH_SIZE", 4)
+    session.add_all(
+        make_transaction(user.id, f"가게, {index}", date=f"2025-01-{10 - index % 10:02d}", category="교통")
+        for index in range(10)
+    )
+    session.add(make_transaction(user.id + 1, "다른 사용자"))
+    session.commit()
+
+    response = client.get("/api/transactions/export", params={"format": "csv", "gzip": compress})
+    assert response.status_code == 200
+    assert response.headers["content-disposition"].endswith('.csv.gz"' if compress else '.csv"')
+    body = gzip.decompress(response.content) if compress else response.content
+    rows = list(csv.DictReader(io.StringIO(body.decode("utf-8"))))
+    assert len(rows) == 10
+    assert [row["date"] for row in rows] == sorted(row["date"] for row in rows)
+    assert rows[-1]["merchant"] == "가게, 0"
+
+    response = client.get("/api/transactions/export", params={"format": "ndjson", "start": "2025-01-06"})
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["date"] for line in lines] == [f"2025-01-{day:02d}" for day in range(6, 11)]
+    assert lines[0]["amount_krw"] == 1000 and lines[0]["category"] == "교통"
+
+
+def test_export_rejects_impossible_dates_before_streaming(client):
+    response = client.get("/api/transactions/export", params={"format": "ndjson", "end": "2025-02-30"})
+    assert response.status_code == 400
+    assert response.headers["content-type"].startswith("application/json")
@@ -0,0 +1,142 @@
+"""
+스트리밍 업로드 (NDJSON / JSON 배열 점진 파싱) 테스트
+"""
+
+import asyncio
+import json
+
+import pytest
+from sqlmodel import select
+
+from models.transaction import Transaction
+from services.spend_sketch import rebuild_spend_sketches
+from services.upload_stream import JsonArrayParser, NdjsonParser, RowParseError, iter_row_chunks
+from tests.test_daily_rollup import upload_rows
+from tests.test_spend_sketch import stored_sketches
+
+NDJSON = {"Content-Type": "application/x-ndjson"}
+
+
+def feed_bytewise(parser, body: bytes) -> list:
+    rows = []
+    for index in range(len(body)):
+        rows.extend(parser.feed(body[index:index + 1]))
+    rows.extend(parser.feed(b"", final=True))
+    return rows
+
+
+def test_json_array_parsed_across_arbitrary_splits():
+    values = [{"merchant": "스타벅스 \"강남\"", "amount_krw": 4500, "tags": [1, {"a": None}]}, 12345, "끝"]
+    body = (" [\n" + " ,\n ".join(json.dumps(value, ensure_ascii=False) for value in values) + "\n] ").encode()
+
+    assert feed_bytewise(JsonArrayParser(), body) == values
+    assert feed_bytewise(JsonArrayParser(), b"[]") == []
+
+
+@pytest.mark.parametrize(
+    "body, message",
+    [
+        (b'{"merchant": "x"}', "배열이 아닙니다"),
+        (b'[{"merchant": "x"}, ', "중간에 끝났습니다"),
+        (b'[{"merchant": "x"} {"merchant": "y"}]', "예상치 못한 문자"),
+        (b'[{"merchant": "x"}] []', "예상치 못한 문자"),
+        (b'[{"merchant": x}]', "JSON 파싱 실패"),
+    ],
+)
+def test_json_array_errors(body, message):
+    with pytest.raises(ValueError, match=message):
+        feed_bytewise(JsonArrayParser(), body)
+
+
+def test_ndjson_rejects_only_bad_lines():
+    body = '{"merchant": "스타벅스"}\r\n\n{"merchant": \n[1, 2]\n{"merchant": "GS25"}'.encode()
+
+    rows = feed_bytewise(NdjsonParser(), body)
+
+    assert rows[0] == {"merchant": "스타벅스"}
+    assert isinstance(rows[1], RowParseError)
+    assert rows[2:] == [[1, 2], {"merchant": "GS25"}]
+
+
+def test_chunks_yielded_before_stream_ends():
+    consumed = []
+
+    async def stream():
+        for index in range(10):
+            consumed.append(index)
+            yield json.dumps({"row": index}).encode() + b"\n"
+
+    async def first_chunk():
+        async for chunk in iter_row_chunks(stream(), NdjsonParser(), chunk_size=3):
+            return chunk
+
+    assert asyncio.run(first_chunk()) == [(1, {"row": 0}), (2, {"row": 1}), (3, {"row": 2})]
+    assert consumed == [0, 1, 2]
+
+
+def test_ndjson_upload_in_chunks(client, session, user):
+    rows = upload_rows(20)
+    lines = [json.dumps(row, ensure_ascii=False) for row in rows]
+    lines[4] = "{깨진 줄"
+    lines[9] = json.dumps({**rows[9], "date": "2025-02-30"})
+    body = "\n".join(lines + lines[:3]).encode()  # 마지막 3줄은 앞 행과 중복
+
+    response = client.post(
+        "/api/transactions/upload/stream", params={"chunk_size": 3}, content=body, headers=NDJSON
+    )
+
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["accepted"], result["rejected"], result["duplicates"]) == (18, 2, 3)
+    assert [reason["row"] for reason in result["reasons"]] == [5, 10]
+    assert result["reasons"][0]["reason"].startswith("JSON 파싱 실패")
+    assert result["reasons"][1]["reason"].startswith("date: ")
+
+    assert len(session.exec(select(Transaction)).all()) == 18
+    incremental = stored_sketches(session, user.id)
+    rebuild_spend_sketches(session, user.id)
+    session.commit()
+    assert stored_sketches(session, user.id) == incremental
+
+
+def test_json_array_upload_with_classification(client, session):
+    response = client.post(
+        "/api/transactions/upload/stream?classify=true&chunk_size=4",
+        json=upload_rows(10) + ["거래 아님"],
+    )
+
+    assert response.json()["accepted"] == 10
+    assert response.json()["reasons"] == [{"row": 11, "reason": "Input should be a valid dictionary"}]
+    assert all(txn.category is not None for txn in session.exec(select(Transaction)))
+
+
+def test_reasons_truncated_but_all_counted(client, monkeypatch):
+    monkeypatch.setattr("routers.transactions.STREAM_UPLOAD_MAX_REASONS", 2)
+    body = b"\n".join([b"[]"] * 5)
+
+    response = client.post("/api/transactions/upload/stream", content=body, headers=NDJSON)
+
+    assert response.json()["rejected"] == 5
+    assert [reason["row"] for reason in response.json()["reasons"]] == [1, 2]
+
+
+def test_truncated_array_keeps_saved_chunks(client, session):
+    body = json.dumps(upload_rows(5)).encode()[:-20]
+
+    response = client.post(
+        "/api/transactions/upload/stream",
+        params={"chunk_size": 2},
+        content=body,
+        headers={"Content-Type": "application/json"},
+    )
+
+    assert response.status_code == 400
+    assert "4건 저장됨" in response.json()["detail"]
+    assert len(session.exec(select(Transaction)).all()) == 4
+
+
+def test_unsupported_content_type(client):
+    response = client.post(
+        "/api/transactions/upload/stream", content=b"a,b", headers={"Content-Type": "text/csv"}
+    )
+    assert response.status_code == 415
@@ -17,6 +17,7 @@ import {
 } from "recharts";
 
 const COLORS = ["#3B82F6", "#8B5CF6", "#EC4899", "#F59E0B", "#10B981", "#EF4444"];
+const RANGE_LABELS = { day: "일별", week: "주별", month: "월별" } as const;
 
 export default function StatsPage() {
   const [dateRange, setDateRange] = useState({
@@ -29,7 +30,8 @@ export default function StatsPage() {
     total_amount: number;
     by_category: Record<string, number>;
     top_merchants: Array<{ merchant: string; amount: number }>;
-    daily_totals: Array<{ date: string; amount: number }>;
+    active_days: number;
+    series: Array<{ bucket: string; start: string; amount: number }>;
   } | null>(null);
 
   const fetchStats = async () => {
@@ -37,7 +39,7 @@ export default function StatsPage() {
     try {
       const apiUrl = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
       const response = await fetch(
-        `${apiUrl}/api/aggregate?start=${dateRange.start}&end=${dateRange.end}&range=${rangeType}`
+        `${apiUrl}/api/aggregate?start=${dateRange.start}&end=${dateRange.end}&range=${rangeType}&daily=false`
       );
 
       if (!response.ok) {
@@ -173,7 +175,7 @@ export default function StatsPage() {
                 <p className="text-sm font-semibold uppercase tracking-wider opacity-90 mb-2">
                   거래 일수
                 </p>
-                <p className="text-5xl font-extrabold">{stats.daily_totals.length}일</p>
+                <p className="text-5xl font-extrabold">{stats.active_days}일</p>
               </div>
             </div>
 
@@ -229,13 +231,15 @@ export default function StatsPage() {
               </div>
             </div>
 
-            {/* 일별 추이 */}
+            {/* 구간별 추이 */}
             <div className="bg-white/90 backdrop-blur-sm rounded-3xl shadow-2xl p-8 border border-gray-200/50">
-              <h3 className="text-2xl font-bold text-gray-800 mb-6">일별 지출 추이</h3>
+              <h3 className="text-2xl font-bold text-gray-800 mb-6">
+                {RANGE_LABELS[rangeType]} 지출 추이
+              </h3>
               <ResponsiveContainer width="100%" height={300}>
-                <BarChart data={stats.daily_totals}>
+                <BarChart data={stats.series}>
                   <CartesianGrid strokeDasharray="3 3" />
-                  <XAxis dataKey="date" />
+                  <XAxis dataKey="bucket" />
                   <YAxis tickFormatter={(value) => `₩${(value / 1000).toFixed(0)}K`} />
                   <Tooltip formatter={(value: number) => `₩${value.toLocaleString()}`} />
                   <Legend />
@@ -10,6 +10,7 @@ export default function UploadPage() {
   const [uploadResult, setUploadResult] = useState<{
     accepted: number;
     rejected: number;
+    duplicates?: number;
     reasons: Array<{ row: number; reason: string }>;
   } | null>(null);
 
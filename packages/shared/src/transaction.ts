@@ -52,6 +52,7 @@ export type UploadRequest = z.infer<typeof UploadRequestSchema>;
 export const UploadResponseSchema = z.object({
   accepted: z.number(),
   rejected: z.number(),
+  duplicates: z.number().default(0),
   reasons: z.array(
     z.object({
       row: z.number(),